@@ -23,6 +23,11 @@ class MainWindow(QMainWindow):
         self._line_follower = LineFollower()
         self._init_ui()
 
+    def closeEvent(self, event: QCloseEvent) -> None:
+        """Stop receiving data before closing, so the queued log records are written and synced to disk."""
+        self.home_widget.stop()
+        event.accept()
+
     def _init_ui(self) -> None:
         """Initialize the UI components of the main window."""
         self._set_window()
@@ -27,6 +27,7 @@ class ControllerWidget(QWidget):
         self._line_follower.bluetooth.connection_change.connect(
             self._update_connection_button
         )
+        self._line_follower.bluetooth.ports_change.connect(self._update_ports)
         self._line_follower.state_changer.state_change.connect(
             self._update_start_button
         )
@@ -58,9 +59,9 @@ class ControllerWidget(QWidget):
     def _toggle_start(self) -> None:
         """Toggle the start button to start or stop the robot."""
         if self._line_follower.state == RobotStates.IDLE:
-            self._line_follower.bluetooth.write_data(Messages.START_SIGNAL)
+            self._line_follower.bluetooth.send_command(Messages.START_SIGNAL)
         elif self._line_follower.state == RobotStates.RUNNING:
-            self._line_follower.bluetooth.write_data(Messages.STOP_SIGNAL)
+            self._line_follower.bluetooth.send_command(Messages.STOP_SIGNAL)
 
     def _update_start_button(self) -> None:
         """Update the start button based on the robot's state."""
@@ -86,7 +87,7 @@ class ControllerWidget(QWidget):
         self.refresh_button = QPushButton("⟳")
         self.refresh_button.setFixedWidth(20)
         self.refresh_button.setToolTip("Refresh COM ports")
-        self.refresh_button.clicked.connect(lambda: self._update_ports(True))
+        self.refresh_button.clicked.connect(self._line_follower.bluetooth.refresh_ports)
 
     def _add_port_selector(self) -> None:
         """Add a selector for the available COM ports."""
@@ -102,25 +103,20 @@ class ControllerWidget(QWidget):
         if not port or not self._update_port or port == self._current_port:
             return
 
-        self._update_ports(False)
-
         if self._line_follower.bluetooth.set_com_port(port):
             self._current_port = port
 
         self.ports.setCurrentText(self._current_port)
 
-    def _update_ports(self, change_text: bool = True) -> None:
+    def _update_ports(self) -> None:
         """Update the list of available COM ports."""
         self._update_port = False
 
+        ports = self._line_follower.bluetooth.ports
         self.ports.clear()
-        self.ports.addItems(self._line_follower.bluetooth.ports)
+        self.ports.addItems(ports)
 
-        if not change_text:
-            self._update_port = True
-            return
-
-        if self._current_port not in self._line_follower.bluetooth.ports:
+        if self._current_port not in ports:
             self._current_port = self._line_follower.bluetooth.port
 
         self.ports.setCurrentText(self._current_port)
@@ -136,13 +132,12 @@ class ControllerWidget(QWidget):
         self._update_connection_button()
 
     def _toggle_connection(self) -> None:
-        """Toggle the Bluetooth connection."""
-        if self._line_follower.bluetooth.connected:
-            self._line_follower.bluetooth.disconnect_serial()
+        """Toggle the Bluetooth connection, cancelling a pending reconnection."""
+        bluetooth = self._line_follower.bluetooth
+        if bluetooth.connected or bluetooth.reconnecting:
+            bluetooth.disconnect_serial()
         else:
-            self._line_follower.bluetooth.connect_serial()
-
-        self._update_ports()
+            bluetooth.connect_serial()
 
     def _update_connection_button(self) -> None:
         """Update the connection button based on the Bluetooth connection status."""
@@ -151,6 +146,12 @@ class ControllerWidget(QWidget):
             self.connect_button.setStyleSheet(Styles.STOP_BUTTONS)
             self.ports.setEnabled(False)
             self.refresh_button.setEnabled(False)
+        elif self._line_follower.bluetooth.reconnecting:
+            self.connect_button.setText("Reconnecting...")
+            self.connect_button.setStyleSheet(Styles.STOP_BUTTONS)
+            self._disable_start_button()
+            self.ports.setEnabled(False)
+            self.refresh_button.setEnabled(False)
         else:
             self.connect_button.setText("Connect")
             self.connect_button.setStyleSheet(Styles.START_BUTTONS)
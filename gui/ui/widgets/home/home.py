@@ -18,6 +18,9 @@ class HomeWidget(QWidget):
     - `sender_widget (SenderWidget)`: The sender widget for sending commands to the robot.
     - `listener_widget (ListenerWidget)`: The listener widget for receiving data from the robot.
     - `connector_widget (ControllerWidget)`: The connector widget for managing the Bluetooth connection.
+
+    #### Methods:
+    - `stop() -> None`: Stops receiving data from the robot, writing and closing the log files.
     """
 
     def __init__(self):
@@ -26,6 +29,10 @@ class HomeWidget(QWidget):
 
         self._init_ui()
 
+    def stop(self) -> None:
+        """Stop receiving data from the robot, writing and closing the log files."""
+        self.listener_widget.stop()
+
     def _init_ui(self) -> None:
         """Initialize the UI components of the home widget."""
         self._add_widgets()
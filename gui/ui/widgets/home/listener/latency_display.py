@@ -0,0 +1,81 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QWidget
+
+from utils import Files, LatencyTracer, TraceConfig
+
+
+class LatencyDisplay(QWidget):
+    """
+    ### LatencyDisplay Widget
+
+    A widget that shows the p50, p99 and max latency of each stage of the telemetry pipeline while it is
+    visible, with a button to save the latency histograms to `Files.LATENCY_FILE`.
+
+    #### Parameters:
+    - `tracer (LatencyTracer)`: The latency histograms to display.
+    - `parent (QWidget | None)`: The parent widget of the LatencyDisplay widget.
+
+    #### Methods:
+    - `update_stats() -> None`: Updates the displayed latencies.
+    """
+
+    def __init__(self, tracer: LatencyTracer, parent: QWidget | None = None) -> None:
+        super().__init__(parent=parent)
+        self._tracer = tracer
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(TraceConfig.DISPLAY_INTERVAL)
+        self._timer.timeout.connect(self.update_stats)
+
+        self._init_ui()
+
+    def update_stats(self) -> None:
+        """Update the displayed latencies with the current statistics of the tracer."""
+        lines = [f"{'stage':<8}{'n':>8}{'p50':>10}{'p99':>10}{'max':>10}  ms"]
+        for stage, stats in self._tracer.stats().items():
+            lines.append(
+                f"{stage:<8}{stats['count']:>8}"
+                f"{stats['p50']:>10.3f}{stats['p99']:>10.3f}{stats['max']:>10.3f}"
+            )
+
+        self._stats_label.setText("\n".join(lines))
+
+    def showEvent(self, event) -> None:
+        """Start updating the latencies when the widget is shown."""
+        self.update_stats()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event) -> None:
+        """Stop updating the latencies when the widget is hidden."""
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def _init_ui(self) -> None:
+        """Initialize the UI components of the LatencyDisplay widget."""
+        self._add_widgets()
+        self._set_layout()
+
+    def _add_widgets(self) -> None:
+        """Add widgets to the LatencyDisplay widget."""
+        self._stats_label = QLabel()
+        self._stats_label.setFont(
+            QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+        )
+        self._stats_label.setToolTip(
+            "Latency from receiving the data to each stage of the telemetry pipeline"
+        )
+
+        self._dump_button = QPushButton("Dump")
+        self._dump_button.setToolTip(
+            f"Save the latency histograms to {Files.LATENCY_FILE}"
+        )
+        self._dump_button.setFixedSize(70, 30)
+        self._dump_button.clicked.connect(lambda: self._tracer.dump(Files.LATENCY_FILE))
+
+    def _set_layout(self) -> None:
+        """Set the layout for the LatencyDisplay widget."""
+        main_layout = QHBoxLayout(self)
+        main_layout.addWidget(self._stats_label)
+        main_layout.addWidget(self._dump_button)
@@ -1,13 +1,24 @@
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QHBoxLayout, QStackedLayout, QVBoxLayout, QWidget
 
-from gui.workers import BluetoothListenerWorker
+from gui.workers import (
+    BluetoothListenerWorker,
+    ParamUpdate,
+    SensorFormatter,
+    SensorSample,
+    TelemetryEvent,
+    TextLine,
+    TrackSegment,
+)
 from robot import LineFollower
-from utils import RobotStates, RunningModes, SerialInputs, StopModes
+from utils import TraceConfig, UIConstants
 
 from .byte_display import ByteDisplay
 from .debug_button import DebugButton
+from .latency_display import LatencyDisplay
 from .text_display import TextDisplay
+from .track_display import TrackDisplay
+from .waterfall_display import WaterfallDisplay
 
 
 class ListenerWidget(QWidget):
@@ -31,33 +42,37 @@ class ListenerWidget(QWidget):
     - `state_display (ByteDisplay)`: Display for the robot state.
     - `battery_display (ByteDisplay)`: Display for the battery voltage.
     - `output_display (TextDisplay)`: Display for the output text.
+    - `waterfall_display (WaterfallDisplay)`: Live view of the sensor data.
+    - `track_display (TrackDisplay)`: Track reconstructed from the sensor data while the robot runs.
     - `debug_button (DebugButton)`: Button to toggle debug mode.
+    - `latency_display (LatencyDisplay)`: Latencies of the telemetry pipeline, shown in debug mode.
+
+    #### Properties:
+    - `worker (BluetoothListenerWorker)`: Worker that reads, decodes and logs the incoming data.
+
+    #### Methods:
+    - `stop() -> None`: Stops the listener worker, writing and closing its log files.
     """
 
     def __init__(self):
         super().__init__()
         self._debug_prints = False
+        self._formatter = SensorFormatter()
 
         self._line_follower = LineFollower()
+        self._tracer = self._line_follower.bluetooth.tracer
         self._worker = BluetoothListenerWorker()
 
         self._init_ui()
         self._start_worker()
 
-        self._update_map = {
-            SerialInputs.BATTERY: self.battery_display.set_value,
-            SerialInputs.KP: self.kp_display.set_value,
-            SerialInputs.KI: self.ki_display.set_value,
-            SerialInputs.KD: self.kd_display.set_value,
-            SerialInputs.KFF: self.kff_display.set_value,
-            SerialInputs.KB: self.kb_display.set_value,
-            SerialInputs.BASE_PWM: self.base_pwm_display.set_value,
-            SerialInputs.LAPS: self.laps_display.set_value,
-            SerialInputs.STOP_TIME: self.stop_time_display.set_value,
-            SerialInputs.STATE: self.state_display.set_value,
-            SerialInputs.RUNNING_MODE: self.running_mode_display.set_value,
-            SerialInputs.STOP_MODE: self.stop_mode_display.set_value,
-            SerialInputs.LOG_DATA: self.log_data_display.set_value,
+        self._connect_displays()
+
+        self._event_lines = {
+            SensorSample: self._sample_line,
+            TextLine: self._text_line,
+            ParamUpdate: self._update_line,
+            TrackSegment: self._segment_line,
         }
 
     def _init_ui(self) -> None:
@@ -86,9 +101,39 @@ class ListenerWidget(QWidget):
         self.debug_button = DebugButton(self)
         self.debug_button.debug_state_changed.connect(self._update_debug_state)
 
+        self.waterfall_display = WaterfallDisplay(parent=self)
+        self.track_display = TrackDisplay(parent=self)
+
+        self.latency_display = LatencyDisplay(self._tracer, parent=self)
+        self.latency_display.setVisible(False)
+
+    def _connect_displays(self) -> None:
+        """Subscribe each display to the change signal of its field, showing the text formatted by the worker."""
+        changer = self._line_follower.state_changer
+        displays = (
+            (changer.battery_change, self.battery_display),
+            (changer.kp_change, self.kp_display),
+            (changer.ki_change, self.ki_display),
+            (changer.kd_change, self.kd_display),
+            (changer.kff_change, self.kff_display),
+            (changer.kb_change, self.kb_display),
+            (changer.base_pwm_change, self.base_pwm_display),
+            (changer.laps_change, self.laps_display),
+            (changer.stop_time_change, self.stop_time_display),
+            (changer.state_change, self.state_display),
+            (changer.running_mode_change, self.running_mode_display),
+            (changer.stop_mode_change, self.stop_mode_display),
+            (changer.log_data_change, self.log_data_display),
+        )
+
+        for signal, display in displays:
+            signal.connect(lambda _, text, display=display: display.set_value(text))
+
     def _update_debug_state(self, state: bool) -> None:
-        """Update the debug state based on the button click."""
+        """Update the debug state based on the button click, tracing latencies while in debug mode."""
         self._debug_prints = state
+        self._tracer.enabled = state or TraceConfig.ENABLED
+        self.latency_display.setVisible(state)
 
     def _set_layout(self) -> None:
         """Set the layout for the widget."""
@@ -118,50 +163,85 @@ class ListenerWidget(QWidget):
         text_display_layout = QVBoxLayout()
         text_display_layout.addLayout(state_layout)
         text_display_layout.addLayout(text_output_layout)
+        text_display_layout.addWidget(self.latency_display)
+
+        sensor_layout = QVBoxLayout()
+        sensor_layout.addWidget(
+            self.waterfall_display, alignment=Qt.AlignmentFlag.AlignHCenter
+        )
+        sensor_layout.addWidget(self.track_display)
 
         main_layout = QHBoxLayout(self)
         main_layout.addLayout(values_layout)
         main_layout.addLayout(text_display_layout)
+        main_layout.addLayout(sensor_layout)
+
+    @property
+    def worker(self) -> BluetoothListenerWorker:
+        """Worker that reads, decodes and logs the incoming data."""
+        return self._worker
+
+    def stop(self) -> None:
+        """Stop the listener worker and wait until its log files are written and closed."""
+        self._worker.stop()
+        self._worker.wait()
 
     def _start_worker(self) -> None:
         """Starts the Bluetooth listener worker."""
         self._worker.output.connect(self._handle_output)
         self._worker.start()
 
-    def _handle_output(self, data: str) -> None:
-        """Handle the output from the Bluetooth listener worker."""
-        if not self._handle_command(data) or self._debug_prints:
-            self.output_display.print_text(data)
-
-    def _handle_command(self, msg: str) -> bool:
-        """Handle incoming commands from the robot."""
-        for command in self._update_map.keys():
-            if not isinstance(command.value, str):
-                continue
-
-            if not msg.startswith(command.value):
-                continue
-
-            int_value = int(ord(msg[-1]))
-            str_value = str(int_value)
-
-            if command == SerialInputs.BATTERY:
-                str_value = str(LineFollower.get_battery_voltage(int_value)) + " V"
-            elif command == SerialInputs.STATE:
-                str_value = RobotStates(int_value).name
-            elif command == SerialInputs.RUNNING_MODE:
-                str_value = RunningModes(int_value).name
-            elif command == SerialInputs.STOP_MODE:
-                str_value = StopModes(int_value).name
-            elif command == SerialInputs.LOG_DATA:
-                str_value = "OFF" if int_value == 0 else "ON"
-            elif command == SerialInputs.KD:
-                if int_value == 255:
-                    int_value = 1000
-                    str_value = "1000"
-
-            self._update_map[command](str_value)
-            self._line_follower.update_config(command, int_value)
-            return True
-
-        return False
+    def _handle_output(self, batch: list[TelemetryEvent], trace: int) -> None:
+        """Handle a batch of events from the Bluetooth listener worker."""
+        self._tracer.record("slot", trace)
+
+        # Only the lines that stay on the display are formatted
+        lines = []
+        for event in reversed(batch):
+            if len(lines) == UIConstants.MAX_DISPLAY_LINES:
+                break
+
+            line = self._event_lines[type(event)](event)
+            if line is not None:
+                lines.append(line)
+
+        if lines:
+            self.output_display.print_lines(lines[::-1])
+        self._tracer.record("display", trace)
+
+        words = []
+        for event in batch:
+            event_type = type(event)
+            if event_type is SensorSample:
+                words.append(event.word)
+            elif event_type is ParamUpdate:
+                self._apply_update(event)
+            elif event_type is TrackSegment:
+                self.track_display.add_segment(event)
+
+        self.waterfall_display.add_words(words)
+
+    def _apply_update(self, update: ParamUpdate) -> None:
+        """Apply a configuration value received from the robot, which only updates its display if it changed."""
+        self._line_follower.update_config(
+            update.command, update.raw, update.t_ns, update.display
+        )
+
+    def _sample_line(self, sample: SensorSample) -> str:
+        """Format a sensor sample for the text display."""
+        return f"{sample.t_ms} ms:  {self._formatter.format(sample.word)}"
+
+    def _text_line(self, line: TextLine) -> str:
+        """Format a text message for the text display."""
+        return line.text
+
+    def _update_line(self, update: ParamUpdate) -> str | None:
+        """Format a configuration value for the text display, only shown in debug mode."""
+        if not self._debug_prints:
+            return None
+
+        return f"{update.command.value}{update.display}"
+
+    def _segment_line(self, _: TrackSegment) -> None:
+        """Track segments are drawn on the track display instead of the text display."""
+        return None
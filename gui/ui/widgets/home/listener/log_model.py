@@ -0,0 +1,262 @@
+from array import array
+from bisect import bisect_left
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt
+
+from utils import UIConstants
+
+
+class LogModel(QAbstractListModel):
+    """
+    ### LogModel Class
+
+    A list model of text lines kept in a ring buffer of fixed size. Appending costs O(1) per line and, once the
+    buffer is full, each new line replaces the oldest one, so the memory doesn't grow. The view only asks for
+    the rows it shows, so the number of lines kept doesn't affect the cost of displaying them.
+
+    A filter can be set to only show the lines that contain a text. Matching lines are kept as a list of their
+    sequence numbers, updated as lines are appended and removed, so filtering only scans the whole buffer when
+    the filter changes.
+
+    Searching scans at most `UIConstants.FIND_ROWS` rows per call, so it never blocks the GUI for long. A search
+    that stops at the limit continues where it stopped on the next call with the same text and row.
+
+    #### Parameters:
+    - `capacity (int)`: Number of lines kept.
+    - `parent (QObject | None)`: The parent object of the model.
+
+    #### Properties:
+    - `capacity (int)`: Number of lines kept.
+    - `filter_text (str)`: Text that the shown lines contain, empty to show all lines.
+
+    #### Methods:
+    - `append(lines: list[str]) -> int`: Appends lines, returning the number of rows removed from the top.
+    - `set_filter(text: str) -> None`: Only shows the lines that contain a text, ignoring case.
+    - `find(text: str, row: int, backward: bool = False) -> int | None`: Finds the next row that contains a text.
+    - `clear() -> None`: Removes all lines.
+    """
+
+    def __init__(
+        self,
+        capacity: int = UIConstants.MAX_DISPLAY_LINES,
+        parent: QObject | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._capacity = max(capacity, 1)
+        self._lines: list[str | None] = [None] * self._capacity
+        # Number of lines appended so far, line n is kept at n % capacity while it is in the buffer
+        self._total = 0
+        self._count = 0
+
+        self._filter = ""
+        self._matches = array("q")
+        self._match_start = 0
+
+        # Search stopped at the scan limit, and the number of rows it scanned
+        self._search: tuple[str, bool, int | None] | None = None
+        self._searched = 0
+
+    @property
+    def capacity(self) -> int:
+        """Number of lines kept."""
+        return self._capacity
+
+    @property
+    def filter_text(self) -> str:
+        """Text that the shown lines contain, empty to show all lines."""
+        return self._filter
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Get the number of rows shown."""
+        if parent.isValid():
+            return 0
+
+        if self._filter:
+            return len(self._matches) - self._match_start
+        return self._count
+
+    def data(
+        self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole
+    ) -> str | None:
+        """Get the line of a row."""
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+
+        return self._lines[self._line_number(index.row()) % self._capacity]
+
+    def append(self, lines: list[str]) -> int:
+        """
+        Append lines, removing the oldest lines once the buffer is full.
+
+        Args:
+            lines (list[str]): The lines to append.
+
+        Returns:
+            int: The number of rows removed from the top.
+        """
+        lines = lines[-self._capacity :]
+        if not lines:
+            return 0
+
+        removed = self._remove_oldest(self._count + len(lines) - self._capacity)
+
+        first = self._total
+        self._write(lines)
+        self._total += len(lines)
+
+        if not self._filter:
+            self.beginInsertRows(
+                QModelIndex(), self._count, self._count + len(lines) - 1
+            )
+            self._count += len(lines)
+            self.endInsertRows()
+            return removed
+
+        self._count += len(lines)
+        matches = [
+            first + offset
+            for offset, line in enumerate(lines)
+            if self._filter in line.lower()
+        ]
+        if matches:
+            rows = self.rowCount()
+            self.beginInsertRows(QModelIndex(), rows, rows + len(matches) - 1)
+            self._matches.extend(matches)
+            self.endInsertRows()
+
+        return removed
+
+    def set_filter(self, text: str) -> None:
+        """
+        Only show the lines that contain a text, ignoring case.
+
+        Args:
+            text (str): The text to look for, empty to show all lines.
+        """
+        text = text.lower()
+        if text == self._filter:
+            return
+
+        self.beginResetModel()
+        self._filter = text
+        self._match_start = 0
+        self._search = None
+
+        first = self._total - self._count
+        self._matches = array(
+            "q",
+            (
+                first + offset
+                for offset, line in enumerate(self._ordered_lines())
+                if text and text in line.lower()
+            ),
+        )
+        self.endResetModel()
+
+    def find(self, text: str, row: int, backward: bool = False) -> int | None:
+        """
+        Find the next row after a row that contains a text, ignoring case, wrapping around at the ends. At most
+        `UIConstants.FIND_ROWS` rows are scanned per call.
+
+        Args:
+            text (str): The text to look for.
+            row (int): The row to start after, -1 to start from the ends.
+            backward (bool): Search towards the top instead of the bottom.
+
+        Returns:
+            int | None: The row found, -1 if no row contains the text, or None if the scan limit was reached
+                first, in which case calling again with the same arguments continues the search.
+        """
+        text = text.lower()
+        rows = self.rowCount()
+        if not text or not rows:
+            self._search = None
+            return -1
+
+        # The start row is identified by its line, which doesn't change when older lines are removed
+        key = (text, backward, self._line_number(row) if 0 <= row < rows else None)
+        if row < 0 or row >= rows:
+            row = rows if backward else -1
+
+        first = self._searched + 1 if key == self._search else 1
+        last = min(first + UIConstants.FIND_ROWS, rows + 1)
+
+        step = -1 if backward else 1
+        for offset in range(first, last):
+            candidate = (row + step * offset) % rows
+            line = self._lines[self._line_number(candidate) % self._capacity]
+            if text in line.lower():
+                self._search = None
+                return candidate
+
+        if last > rows:
+            self._search = None
+            return -1
+
+        self._search = key
+        self._searched = last - 1
+        return None
+
+    def clear(self) -> None:
+        """Remove all lines."""
+        self.beginResetModel()
+        self._lines = [None] * self._capacity
+        self._total = 0
+        self._count = 0
+        self._matches = array("q")
+        self._match_start = 0
+        self._search = None
+        self.endResetModel()
+
+    def _line_number(self, row: int) -> int:
+        """Get the number of the line shown in a row."""
+        if self._filter:
+            return self._matches[self._match_start + row]
+        return self._total - self._count + row
+
+    def _remove_oldest(self, count: int) -> int:
+        """Remove the oldest lines from the buffer, returning the number of rows removed."""
+        if count <= 0:
+            return 0
+
+        if not self._filter:
+            self.beginRemoveRows(QModelIndex(), 0, count - 1)
+            self._count -= count
+            self.endRemoveRows()
+            return count
+
+        self._count -= count
+        first = self._total - self._count
+        end = bisect_left(self._matches, first, lo=self._match_start)
+        removed = end - self._match_start
+        if removed:
+            self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+            self._match_start = end
+            self.endRemoveRows()
+
+        # The matches of removed lines are only dropped once they make up half of the list
+        if self._match_start > len(self._matches) // 2:
+            del self._matches[: self._match_start]
+            self._match_start = 0
+
+        return removed
+
+    def _write(self, lines: list[str]) -> None:
+        """Write lines to the buffer after the last line, in at most two slices."""
+        start = self._total % self._capacity
+        end = start + len(lines)
+        if end <= self._capacity:
+            self._lines[start:end] = lines
+            return
+
+        split = self._capacity - start
+        self._lines[start:] = lines[:split]
+        self._lines[: end - self._capacity] = lines[split:]
+
+    def _ordered_lines(self) -> list[str]:
+        """Get the lines in the buffer, oldest first."""
+        start = (self._total - self._count) % self._capacity
+        end = start + self._count
+        if end <= self._capacity:
+            return self._lines[start:end]
+        return self._lines[start:] + self._lines[: end - self._capacity]
@@ -1,23 +1,40 @@
-import time
-
-from PyQt6.QtWidgets import QTextEdit, QWidget
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFontDatabase
+from PyQt6.QtWidgets import (
+    QAbstractItemView,
+    QHBoxLayout,
+    QHeaderView,
+    QLineEdit,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
 
 from utils import UIConstants
 
+from .log_model import LogModel
+
 
-class TextDisplay(QTextEdit):
+class TextDisplay(QWidget):
     """
     ### TextDisplay Widget
 
     A widget that displays text in a scrollable area. It is used to show the output of the robot's
     operations.
 
+    The lines are kept in a `LogModel` and shown in a view that only renders the visible rows, so printing costs
+    the same with a few lines or a full scrollback. The view follows new lines while it is scrolled to the
+    bottom and keeps its position otherwise. The lines can be filtered, and searched from the newest one up. A
+    search through a long scrollback continues in steps between events, so the GUI stays responsive.
+
     #### Parameters:
-    - `max_display_lines (int)`: The maximum number of lines to display in the text area.
+    - `max_display_lines (int)`: The maximum number of lines kept in the scrollback.
     - `parent (QWidget | None)`: The parent widget of the TextDisplay widget.
 
     #### Methods:
     - `print_text(text: str) -> None`: Prints the given text to the text area.
+    - `print_lines(lines: list[str]) -> None`: Prints several lines to the text area at once.
+    - `clear() -> None`: Removes all lines from the text area.
     """
 
     def __init__(
@@ -26,43 +43,133 @@ class TextDisplay(QTextEdit):
         parent: QWidget | None = None,
     ) -> None:
         super().__init__(parent=parent)
-        self.setReadOnly(True)
         self.setFixedWidth(450)
 
-        self._max_display_lines = max_display_lines
-        self._last_crop_time = time.time()
-        self._crop_interval = 0.034  # in seconds
+        self._model = LogModel(max_display_lines, parent=self)
+
+        # Filtering scans the whole scrollback, so it waits for a pause in typing
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(300)
+        self._filter_timer.timeout.connect(self._filter)
+
+        # Searching continues in steps from the event loop until a line is found
+        self._find_timer = QTimer(self)
+        self._find_timer.setSingleShot(True)
+        self._find_timer.setInterval(0)
+        self._find_timer.timeout.connect(self._find)
+
+        self._init_ui()
 
     def print_text(self, text: str) -> None:
         """
-        Print text to the QTextEdit widget displaying the text in a scrollable area.
+        Print text to the text area.
 
         Args:
             text (str): The text to be displayed.
         """
-        self._manage_display(text)
-
-    def _manage_display(self, text: str) -> None:
-        """Manage the display of text in the QTextEdit widget."""
-        self.append(text)
+        self.print_lines(text.split("\n"))
 
-        if self._last_crop_time + self._crop_interval < time.time():
-            self._last_crop_time = time.time()
-            self._crop_text()
-
-    def _crop_text(self) -> None:
-        """Crop the text in the QTextEdit widget to fit within the maximum display lines."""
-        current_text = self.toPlainText()
-        lines = current_text.splitlines()
+    def print_lines(self, lines: list[str]) -> None:
+        """
+        Print several lines to the text area at once, keeping the scroll position unless it is at the bottom.
 
-        if len(lines) <= self._max_display_lines:
+        Args:
+            lines (list[str]): The lines to be displayed.
+        """
+        scrollbar = self._view.verticalScrollBar()
+        position = scrollbar.value()
+        at_bottom = position >= scrollbar.maximum()
+
+        removed = self._model.append(lines)
+
+        if at_bottom:
+            self._view.scrollToBottom()
+        elif removed:
+            scrollbar.setValue(max(position - removed, 0))
+
+    def clear(self) -> None:
+        """Remove all lines from the text area."""
+        self._model.clear()
+
+    def _find(self) -> None:
+        """Select the next line above the current one that contains the search text."""
+        current = self._view.currentIndex()
+        row = self._model.find(
+            self._search_input.text(),
+            current.row() if current.isValid() else -1,
+            backward=True,
+        )
+        if row is None:
+            self._find_timer.start()
             return
-
-        vertical_scrollbar = self.verticalScrollBar()
-        if not vertical_scrollbar:
+        if row < 0:
             return
 
-        scroll_position = vertical_scrollbar.value()
-
-        self.setPlainText("\n".join(lines[-self._max_display_lines :]))
-        vertical_scrollbar.setValue(scroll_position)
+        self._view.selectRow(row)
+        self._view.scrollTo(
+            self._model.index(row), QAbstractItemView.ScrollHint.PositionAtCenter
+        )
+
+    def _filter(self) -> None:
+        """Only show the lines that contain the filter text, scrolling to the newest one."""
+        self._model.set_filter(self._filter_input.text())
+        self._view.scrollToBottom()
+
+    def _init_ui(self) -> None:
+        """Initialize the UI components of the TextDisplay widget."""
+        self._add_widgets()
+        self._set_layout()
+
+    def _add_widgets(self) -> None:
+        """Add widgets to the TextDisplay widget."""
+        self._add_view()
+        self._add_inputs()
+
+    def _add_view(self) -> None:
+        """Add the view of the lines, with a fixed row height so only the visible rows are laid out."""
+        self._view = QTableView()
+        self._view.setModel(self._model)
+        self._view.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self._view.setShowGrid(False)
+        self._view.setWordWrap(False)
+        self._view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self._view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self._view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+
+        horizontal_header = self._view.horizontalHeader()
+        horizontal_header.hide()
+        horizontal_header.setStretchLastSection(True)
+
+        vertical_header = self._view.verticalHeader()
+        vertical_header.hide()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self._view.fontMetrics().height() + 2)
+
+    def _add_inputs(self) -> None:
+        """Add the filter and search inputs."""
+        self._filter_input = QLineEdit()
+        self._filter_input.setPlaceholderText("Filter")
+        self._filter_input.setToolTip("Only show the lines that contain this text")
+        self._filter_input.setClearButtonEnabled(True)
+        self._filter_input.textChanged.connect(lambda: self._filter_timer.start())
+
+        self._search_input = QLineEdit()
+        self._search_input.setPlaceholderText("Search")
+        self._search_input.setToolTip(
+            "Press Enter to select the previous line that contains this text"
+        )
+        self._search_input.setClearButtonEnabled(True)
+        self._search_input.returnPressed.connect(self._find)
+        self._search_input.textChanged.connect(lambda: self._find_timer.stop())
+
+    def _set_layout(self) -> None:
+        """Set the layout for the TextDisplay widget."""
+        inputs_layout = QHBoxLayout()
+        inputs_layout.addWidget(self._filter_input)
+        inputs_layout.addWidget(self._search_input)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.addWidget(self._view)
+        main_layout.addLayout(inputs_layout)
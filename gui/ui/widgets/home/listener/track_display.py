@@ -0,0 +1,111 @@
+from PyQt6.QtCore import QPointF, QRectF, Qt
+from PyQt6.QtGui import QBrush, QColor, QPainter, QPainterPath, QPen
+from PyQt6.QtWidgets import QGraphicsItem, QGraphicsScene, QGraphicsView, QWidget
+
+from gui.workers import TrackSegment
+from utils import TrackConfig
+
+
+class TrackDisplay(QGraphicsView):
+    """
+    ### TrackDisplay Widget
+
+    A widget that draws the track reconstructed by the listener worker while the robot runs, with the left
+    markers in red and the right markers in blue like `scripts/line_drawing.py`. Each segment is appended to the
+    scene as a new path item continuing the previous one, so only the area of the new segment is repainted. The
+    view is only zoomed out when the track leaves it, with a margin, so it is rarely redrawn as a whole.
+
+    #### Parameters:
+    - `parent (QWidget | None)`: The parent widget of the TrackDisplay widget.
+
+    #### Methods:
+    - `add_segment(segment: TrackSegment) -> None`: Draws a segment of the track, clearing the previous track if it starts a new one.
+    - `clear() -> None`: Removes the track.
+    """
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent=parent)
+        self._scene = QGraphicsScene(self)
+        self.setScene(self._scene)
+
+        self.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setMinimumSize(TrackConfig.VIEW_SIZE, TrackConfig.VIEW_SIZE)
+        self.setToolTip(
+            "Track reconstructed from the sensor data\n"
+            "Red: left markers, blue: right markers"
+        )
+
+        self._track_pen = QPen(QColor(Qt.GlobalColor.darkCyan), 2)
+        self._track_pen.setCosmetic(True)
+        self._left_brush = QBrush(QColor(Qt.GlobalColor.red))
+        self._right_brush = QBrush(QColor(Qt.GlobalColor.blue))
+
+        self._last_point: QPointF | None = None
+        self._bounds = QRectF()
+        self._view_bounds = QRectF()
+
+    def add_segment(self, segment: TrackSegment) -> None:
+        """
+        Draw a segment of the track, continuing the previous segment unless it starts a new track.
+
+        Args:
+            segment (TrackSegment): The segment reconstructed by the listener worker.
+        """
+        if segment.new:
+            self.clear()
+
+        # The scene's y axis points down, so the track is flipped to match the plots of the scripts
+        points = [QPointF(x, -y) for x, y in segment.points]
+        if self._last_point is not None:
+            points.insert(0, self._last_point)
+        if not points:
+            return
+
+        path = QPainterPath(points[0])
+        for point in points[1:]:
+            path.lineTo(point)
+        self._last_point = points[-1]
+
+        item = self._scene.addPath(path, self._track_pen)
+        self._add_markers(segment.left_markers, self._left_brush)
+        self._add_markers(segment.right_markers, self._right_brush)
+        self._fit(item.boundingRect())
+
+    def clear(self) -> None:
+        """Remove the track."""
+        self._scene.clear()
+        self._last_point = None
+        self._bounds = QRectF()
+        self._view_bounds = QRectF()
+
+    def resizeEvent(self, event) -> None:
+        """Keep the track in view when the widget is resized."""
+        super().resizeEvent(event)
+        if not self._view_bounds.isNull():
+            self.fitInView(self._view_bounds, Qt.AspectRatioMode.KeepAspectRatio)
+
+    def _add_markers(self, markers: list[tuple[float, float]], brush: QBrush) -> None:
+        """Add the markers of a segment as dots of the same size at any zoom."""
+        radius = TrackConfig.MARKER_RADIUS
+        for x, y in markers:
+            marker = self._scene.addEllipse(
+                -radius, -radius, 2 * radius, 2 * radius, QPen(Qt.PenStyle.NoPen), brush
+            )
+            marker.setPos(x, -y)
+            marker.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIgnoresTransformations)
+
+    def _fit(self, area: QRectF) -> None:
+        """Zoom out to the track with a margin once it leaves the view."""
+        margin = 2 * TrackConfig.MARKER_OFFSET
+        area = area.adjusted(-margin, -margin, margin, margin)
+        self._bounds = self._bounds.united(area) if self._bounds.isValid() else area
+        if self._view_bounds.contains(self._bounds):
+            return
+
+        # The margin grows with the track, so the view is zoomed out less and less often
+        extra = max(self._bounds.width(), self._bounds.height()) / 2
+        self._view_bounds = self._bounds.adjusted(-extra, -extra, extra, extra)
+        self.setSceneRect(self._view_bounds)
+        self.fitInView(self._view_bounds, Qt.AspectRatioMode.KeepAspectRatio)
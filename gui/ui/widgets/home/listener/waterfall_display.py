@@ -0,0 +1,155 @@
+from collections.abc import Sequence
+
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter
+from PyQt6.QtWidgets import QWidget
+
+from utils import (
+    CENTRAL_SENSORS,
+    LEFT_MARKER,
+    RIGHT_MARKER,
+    SENSOR_COUNT,
+    WORD_SIZE,
+    WaterfallConfig,
+    decode_words,
+)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to draw the waterfall
+    np = None
+
+
+class WaterfallDisplay(QWidget):
+    """
+    ### WaterfallDisplay Widget
+
+    A widget that draws each sensor sample as a row of pixels, one column per sensor, with the marker and
+    central sensors in their own colors. The rows are kept in a NumPy array shared with a `QImage`, used as a
+    ring: new rows are written after the newest one, wrapping to the top, with a cursor line below them. Only
+    the rows written since the last frame are repainted, so the cost per sample stays the same at any rate.
+
+    The color of each sensor word is looked up in a table built once, so a batch of samples is converted to
+    pixels in a single NumPy operation. If NumPy is not installed, a message saying it is required is shown
+    instead.
+
+    #### Parameters:
+    - `rows (int)`: Number of samples shown.
+    - `parent (QWidget | None)`: The parent widget of the WaterfallDisplay widget.
+
+    #### Methods:
+    - `add_words(words: Sequence[int]) -> None`: Draws the rows of several sensor words.
+    - `clear() -> None`: Clears all rows.
+    """
+
+    def __init__(
+        self, rows: int = WaterfallConfig.ROWS, parent: QWidget | None = None
+    ) -> None:
+        super().__init__(parent=parent)
+        self._rows = max(rows, 1)
+        self._row = 0
+
+        self.setFixedSize(SENSOR_COUNT * WaterfallConfig.COLUMN_WIDTH, self._rows)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setToolTip(
+            "Live sensor data, newest sample above the line\n"
+            "Orange: marker sensors, green: central sensors"
+        )
+
+        if np is None:
+            self._colors = None
+            self._pixels = None
+            self._image = None
+            return
+
+        self._colors = self._color_table()
+        self._pixels = np.full(
+            (self._rows, SENSOR_COUNT), WaterfallConfig.OFF_COLOR, dtype=np.uint32
+        )
+        self._image = QImage(
+            self._pixels.data,
+            SENSOR_COUNT,
+            self._rows,
+            self._pixels.strides[0],
+            QImage.Format.Format_RGB32,
+        )
+
+    def add_words(self, words: Sequence[int]) -> None:
+        """
+        Draw the rows of several sensor words after the newest row, repainting only the rows written.
+
+        Args:
+            words (Sequence[int]): The 16-bit sensor words, oldest first.
+        """
+        if self._pixels is None or not len(words):
+            return
+
+        rows = self._colors[np.asarray(words[-self._rows :], dtype=np.uint16)]
+        start = self._row
+        end = start + len(rows)
+
+        if end <= self._rows:
+            self._pixels[start:end] = rows
+        else:
+            split = self._rows - start
+            self._pixels[start:] = rows[:split]
+            self._pixels[: end - self._rows] = rows[split:]
+
+        self._row = end % self._rows
+        self._update_rows(start, len(rows) + 1)
+
+    def clear(self) -> None:
+        """Clear all rows."""
+        if self._pixels is not None:
+            self._pixels.fill(WaterfallConfig.OFF_COLOR)
+        self._row = 0
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        """Paint the rows in the updated area, scaling each sensor to its column width."""
+        painter = QPainter(self)
+        area = event.rect()
+
+        if self._image is None:
+            painter.fillRect(self.rect(), QColor(WaterfallConfig.OFF_COLOR))
+            painter.setPen(QColor(WaterfallConfig.CURSOR_COLOR))
+            painter.drawText(
+                self.rect(),
+                Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap,
+                "NumPy required",
+            )
+            return
+
+        top, bottom = area.top(), area.bottom() + 1
+        painter.drawImage(
+            QRect(0, top, self.width(), bottom - top),
+            self._image,
+            QRect(0, top, SENSOR_COUNT, bottom - top),
+        )
+
+        if top <= self._row < bottom:
+            painter.fillRect(
+                0, self._row, self.width(), 1, QColor(WaterfallConfig.CURSOR_COLOR)
+            )
+
+    def _update_rows(self, start: int, count: int) -> None:
+        """Schedule a repaint of rows from a row, wrapping to the top."""
+        if count >= self._rows:
+            self.update()
+            return
+
+        end = start + count
+        self.update(0, start, self.width(), min(end, self._rows) - start)
+        if end > self._rows:
+            self.update(0, 0, self.width(), end - self._rows)
+
+    @staticmethod
+    def _color_table() -> "np.ndarray":
+        """Get the row of pixels of every 16-bit sensor word."""
+        on_colors = np.full(SENSOR_COUNT, WaterfallConfig.OTHER_COLOR, dtype=np.uint32)
+        on_colors[list(CENTRAL_SENSORS)] = WaterfallConfig.CENTRAL_COLOR
+        on_colors[[LEFT_MARKER, RIGHT_MARKER]] = WaterfallConfig.MARKER_COLOR
+
+        words = np.arange(1 << (8 * WORD_SIZE), dtype=">u2")
+        sensors = decode_words(words.tobytes())
+        return np.where(sensors, on_colors, np.uint32(WaterfallConfig.OFF_COLOR))
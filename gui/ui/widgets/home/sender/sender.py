@@ -102,7 +102,7 @@ class SenderWidget(QWidget):
     def _on_send(self, command: SerialOutputs, value: bytes) -> None:
         """Send the command and value to the robot via Bluetooth."""
         msg = Messages.COMMAND(command, value)
-        self._line_follower.bluetooth.write_data(msg)
+        self._line_follower.bluetooth.send_command(msg)
 
     def _set_layout(self) -> None:
         """Set the layout for the sender widget."""
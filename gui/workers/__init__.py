@@ -1,5 +1,16 @@
+from .commands import CommandParser
+from .events import ParamUpdate, SensorSample, TelemetryEvent, TextLine, TrackSegment
+from .formatter import SensorFormatter, format_sensors
 from .listener import BluetoothListenerWorker
 
 __all__ = [
     "BluetoothListenerWorker",
+    "CommandParser",
+    "ParamUpdate",
+    "SensorFormatter",
+    "SensorSample",
+    "TelemetryEvent",
+    "TextLine",
+    "TrackSegment",
+    "format_sensors",
 ]
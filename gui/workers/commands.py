@@ -0,0 +1,100 @@
+from collections.abc import Callable
+from enum import Enum
+
+from robot import LineFollower
+from utils import RobotStates, RunningModes, SerialInputs, StopModes
+
+from .events import ParamUpdate
+
+# Value sent by the robot for a KD of 1000, which doesn't fit in a byte
+KD_MAX_BYTE = 255
+KD_MAX = 1000
+
+
+def _byte_value(value: int) -> tuple[int, str]:
+    """Convert a plain byte value."""
+    return value, str(value)
+
+
+def _battery_value(value: int) -> tuple[int, str]:
+    """Convert a battery byte to volts for display."""
+    return value, f"{LineFollower.get_battery_voltage(value)} V"
+
+
+def _kd_value(value: int) -> tuple[int, str]:
+    """Convert a KD byte, whose maximum stands for a KD of 1000."""
+    if value == KD_MAX_BYTE:
+        value = KD_MAX
+    return value, str(value)
+
+
+def _log_data_value(value: int) -> tuple[int, str]:
+    """Convert a log data flag."""
+    return value, "OFF" if value == 0 else "ON"
+
+
+def _enum_value(enum: type[Enum]) -> Callable[[int], tuple[int, str]]:
+    """Create a converter showing a value by its name in an enum."""
+    return lambda value: (value, enum(value).name)
+
+
+# Converter of each command sent by the robot with a configuration value
+_CONVERTERS: dict[SerialInputs, Callable[[int], tuple[int, str]]] = {
+    SerialInputs.BATTERY: _battery_value,
+    SerialInputs.KP: _byte_value,
+    SerialInputs.KI: _byte_value,
+    SerialInputs.KD: _kd_value,
+    SerialInputs.KFF: _byte_value,
+    SerialInputs.KB: _byte_value,
+    SerialInputs.BASE_PWM: _byte_value,
+    SerialInputs.LAPS: _byte_value,
+    SerialInputs.STOP_TIME: _byte_value,
+    SerialInputs.STATE: _enum_value(RobotStates),
+    SerialInputs.RUNNING_MODE: _enum_value(RunningModes),
+    SerialInputs.STOP_MODE: _enum_value(StopModes),
+    SerialInputs.LOG_DATA: _log_data_value,
+}
+
+
+class CommandParser:
+    """
+    ### CommandParser Class
+
+    Parses the configuration values sent by the robot as `<prefix>:<byte>` text lines. Each line is split once
+    at the first `:` and its prefix looked up in a table built once, so the cost doesn't grow with the number
+    of commands. The value is converted for display right away, so applying it only costs setting the text.
+
+    #### Methods:
+    - `parse(line: str, t_ns: int) -> ParamUpdate | None`: Parses a text line into a configuration update.
+    """
+
+    def __init__(self) -> None:
+        self._table = {
+            command.value: (command, converter)
+            for command, converter in _CONVERTERS.items()
+        }
+
+    def parse(self, line: str, t_ns: int) -> ParamUpdate | None:
+        """
+        Parse a text line into a configuration update.
+
+        Args:
+            line (str): The text line received from the robot.
+            t_ns (int): Time the line was received, from `time.monotonic_ns`.
+
+        Returns:
+            ParamUpdate | None: The update, or None if the line is not a known command with a valid value.
+        """
+        prefix, separator, value = line.partition(":")
+        if not value:
+            return None
+
+        entry = self._table.get(prefix + separator)
+        if entry is None:
+            return None
+
+        command, converter = entry
+        try:
+            return ParamUpdate(command, *converter(ord(line[-1])), t_ns)
+        except ValueError:
+            return None
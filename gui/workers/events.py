@@ -0,0 +1,72 @@
+from typing import NamedTuple
+
+from utils import SerialInputs
+
+
+class ParamUpdate(NamedTuple):
+    """
+    ### ParamUpdate Class
+
+    A configuration value received from the robot, ready to be applied.
+
+    #### Attributes:
+    - `command (SerialInputs)`: The command the value belongs to.
+    - `raw (int)`: The value as stored in the `LineFollower`.
+    - `display (str)`: The value formatted for display.
+    - `t_ns (int)`: Time the value was received, from `time.monotonic_ns`.
+    """
+
+    command: SerialInputs
+    raw: int
+    display: str
+    t_ns: int
+
+
+class SensorSample(NamedTuple):
+    """
+    ### SensorSample Class
+
+    A sensor word received from the robot while logging.
+
+    #### Attributes:
+    - `t_ms (int)`: Time in milliseconds since the logging session started.
+    - `word (int)`: The 16-bit sensor word.
+    """
+
+    t_ms: int
+    word: int
+
+
+class TextLine(NamedTuple):
+    """
+    ### TextLine Class
+
+    A text message received from the robot or reported by the listener.
+
+    #### Attributes:
+    - `text (str)`: The text of the message.
+    """
+
+    text: str
+
+
+class TrackSegment(NamedTuple):
+    """
+    ### TrackSegment Class
+
+    The part of the track reconstructed from the sensor samples since the previous segment.
+
+    #### Attributes:
+    - `points (list[tuple[float, float]])`: The points of the track, oldest first.
+    - `left_markers (list[tuple[float, float]])`: The positions of the markers seen on the left.
+    - `right_markers (list[tuple[float, float]])`: The positions of the markers seen on the right.
+    - `new (bool)`: Indicates if the segment starts a new track.
+    """
+
+    points: list[tuple[float, float]]
+    left_markers: list[tuple[float, float]]
+    right_markers: list[tuple[float, float]]
+    new: bool
+
+
+TelemetryEvent = ParamUpdate | SensorSample | TextLine | TrackSegment
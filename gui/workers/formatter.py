@@ -0,0 +1,91 @@
+from collections.abc import Callable
+
+from utils import decode_word, robot_configs
+
+
+def format_sensors(bits: bytes) -> str:
+    """
+    Format the sensor values of a word for the text display, with the left marker, the central sensors, the
+    right marker and the special sensor.
+
+    Args:
+        bits (bytes): The sensor values in `BIT_POSITIONS` order.
+
+    Returns:
+        str: The formatted sensor values.
+    """
+    return "   ".join(
+        [
+            f"{bits[0] if bits[0] == 1 else '  '}",
+            "|",
+            "  ".join(str(bit if bit == 1 else "  ") for bit in bits[1:6]),
+            "  ".join(str(bit if bit == 1 else "  ") for bit in bits[7:11]),
+            "|",
+            f"{bits[11] if bits[11] == 1 else '  '}",
+            f"||  {bits[6] if bits[6] == 1 else '  '}",
+        ]
+    )
+
+
+class SensorFormatter:
+    """
+    ### SensorFormatter Class
+
+    Formats sensor words for the text display, memoizing the result for each sensor state. Only the bits in
+    `BIT_POSITIONS` are used, so there are at most 4096 different results and formatting a word costs a dict
+    lookup once its state has been seen. The memoized results are discarded when `BIT_POSITIONS` or the
+    layout changes.
+
+    #### Parameters:
+    - `layout (Callable[[bytes], str])`: Function that formats the sensor values of a word.
+
+    #### Properties:
+    - `layout (Callable[[bytes], str])`: Function that formats the sensor values of a word.
+
+    #### Methods:
+    - `format(word: int) -> str`: Formats a sensor word.
+    """
+
+    def __init__(self, layout: Callable[[bytes], str] = format_sensors) -> None:
+        self._layout = layout
+        self._positions: tuple[int, ...] | None = None
+        self._mask = 0
+        self._lines: dict[int, str] = {}
+
+    @property
+    def layout(self) -> Callable[[bytes], str]:
+        """Function that formats the sensor values of a word."""
+        return self._layout
+
+    @layout.setter
+    def layout(self, layout: Callable[[bytes], str]) -> None:
+        """Set the function that formats the sensor values of a word, discarding the memoized results."""
+        self._layout = layout
+        self._lines.clear()
+
+    def format(self, word: int) -> str:
+        """
+        Format a sensor word.
+
+        Args:
+            word (int): The 16-bit sensor word.
+
+        Returns:
+            str: The formatted sensor values.
+        """
+        if robot_configs.BIT_POSITIONS is not self._positions:
+            self._reset()
+
+        state = word & self._mask
+        line = self._lines.get(state)
+
+        if line is None:
+            line = self._lines[state] = self._layout(decode_word(state))
+
+        return line
+
+    def _reset(self) -> None:
+        """Discard the memoized results and compute the mask for the current `BIT_POSITIONS`."""
+        self._positions = robot_configs.BIT_POSITIONS
+        self._mask = sum(1 << position for position in self._positions)
+        self._lines.clear()
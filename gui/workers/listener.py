@@ -1,9 +1,33 @@
+import functools
+import os
+import threading
 import time
+from collections import deque
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
 from robot import LineFollower
-from utils import BIT_POSITIONS, Files, SerialInputs
+from robot.api import Frame, FrameTypes, RingBuffer
+from utils import (
+    SESSION_RECORD,
+    Files,
+    LogConfig,
+    SerialConfig,
+    TrackReconstructor,
+    UIConstants,
+    encode_session_header,
+    new_session_dir,
+    prune_sessions,
+    session_file,
+)
+
+from .commands import CommandParser
+from .events import SensorSample, TelemetryEvent, TextLine, TrackSegment
+from .log_writer import LogWriter
+
+TEXT_LOG = "text"
+SESSION_LOG = "session"
+SESSION_TEXT_LOG = "session_text"
 
 
 class BluetoothListenerWorker(QThread):
@@ -13,38 +37,136 @@ class BluetoothListenerWorker(QThread):
     This class is responsible for listening to the Bluetooth device and processing the received data.
     It inherits from QThread to run in a separate thread.
 
+    The serial port is read by a separate reader thread, which only moves the raw data into a preallocated
+    `RingBuffer`. This thread parses the data, writes the log files and emits the output, so slow disk writes
+    don't stall the serial reads. The log files are written by a `LogWriter` in a third thread,
+    so disk writes don't stall the processing either. Connection gaps and buffer overflows are passed along with
+    their position in the buffer, so partial frames from before them are discarded at the right point.
+
+    While the Bluetooth API's `tracer` is enabled, the time each chunk is received is passed along the same way.
+    The first sensor word processed from each batch of chunks records the latency of the "decode" stage, and its
+    receive time is marked in the log writer for the "write" stage and emitted with the output for the GUI stages.
+
+    The output is made of typed events instead of display strings: `ParamUpdate`s with the configuration values
+    sent by the robot, parsed and converted here by a `CommandParser`, `SensorSample`s with the sensor words
+    received while logging and `TextLine`s with every other message. Consumers format only what they show.
+
+    Each `ParamUpdate` is stamped with the `time.monotonic_ns` time its data was read from the buffer. The session
+    records count from a start time on the same clock, saved in the session header, so the configuration history
+    can be lined up with the sensor data.
+
+    The track followed by the robot is reconstructed here from each sensor word as it is received, by a
+    `TrackReconstructor`, and its points since the previous emission are added to each output as a `TrackSegment`.
+
     #### Signals:
-    - `output (str)`: Signal emitted when new data is received from the Bluetooth device.
+    - `output (list[TelemetryEvent], int)`: Signal emitted with the events received from the Bluetooth device
+    since the last emission, in order, at most `UIConstants.OUTPUT_RATE` times per second, and the receive time
+    of the oldest traced sensor word among them, or 0 if none was traced.
 
     #### Properties:
     - `listening (bool)`: Indicates if the listener is currently active.
+    - `buffer (RingBuffer)`: Buffer between the reader thread and the processing, with its fill level and
+    overflow counts.
+    - `log_writer (LogWriter)`: Writer of the log files, with its queue depth and write latency.
+    - `session_dir (str)`: Directory of the current or last logging session.
 
     #### Methods:
     - `run()`: Starts the listener thread.
     - `stop()`: Stops the listener thread.
     """
 
-    output = pyqtSignal(str)
+    output = pyqtSignal(list, object)
 
     def __init__(self):
         super().__init__()
         self._line_follower = LineFollower()
         self._listening = False
 
+        self._buffer = RingBuffer(SerialConfig.RX_BUFFER_SIZE)
+        self._reader: threading.Thread | None = None
+        self._markers: deque[tuple[int, list[Frame]]] = deque()
+        self._overflows = 0
+
+        self._tracer = self._line_follower.bluetooth.tracer
+        self._arrivals: deque[tuple[int, int]] = deque()
+        self._trace = 0
+        self._output_trace = 0
+
+        self._output: list[TelemetryEvent] = []
+        self._commands = CommandParser()
+        self._track = TrackReconstructor()
+        self._new_track = False
+        self._output_interval = 1 / UIConstants.OUTPUT_RATE
+        self._last_output = 0.0
+
+        self._log_writer = LogWriter(tracer=self._tracer)
+        self._logging_session = False
+        self._session_dir = ""
+        self._start_time = 0.0
+        self._start_ns = 0
+        self._arrival_ns = 0
+        self._lost_frames = 0
+        self._corrupt_frames = 0
+
+        self._frame_handlers = {
+            FrameTypes.TEXT: self._handle_text,
+            FrameTypes.START: self._handle_start,
+            FrameTypes.WORD: self._handle_word,
+            FrameTypes.STOP: self._handle_stop,
+            FrameTypes.GAP: self._handle_gap,
+            FrameTypes.LOST: self._handle_lost,
+            FrameTypes.CORRUPT: self._handle_corrupt,
+        }
+
     @property
     def listening(self) -> bool:
         """Check if the listener is currently active."""
         return self._listening
 
+    @property
+    def buffer(self) -> RingBuffer:
+        """Get the buffer between the reader thread and the processing."""
+        return self._buffer
+
+    @property
+    def log_writer(self) -> LogWriter:
+        """Get the writer of the log files."""
+        return self._log_writer
+
+    @property
+    def session_dir(self) -> str:
+        """Get the directory of the current or last logging session."""
+        return self._session_dir
+
     def run(self) -> None:
         """
         Starts the listener thread.
         """
         self._listening = True
+        self._reader = threading.Thread(
+            target=self._read, name="BluetoothReader", daemon=True
+        )
+        self._reader.start()
+
+        self._log_writer.start()
+        self._log_writer.open(
+            TEXT_LOG,
+            Files.TEXT_FILE,
+            max_size=LogConfig.MAX_FILE_SIZE,
+            max_files=LogConfig.MAX_TEXT_FILES,
+        )
 
         while self._listening:
-            self._listen_string()
-            self._listen_binary()
+            if self._buffer.wait(self._wait_time()) or self._markers:
+                self._process()
+            self._emit_output()
+
+        self._reader.join()
+        self._process()
+        self._emit_output(force=True)
+
+        self._close_session()
+        self._log_writer.stop()
 
     def stop(self) -> None:
         """
@@ -52,54 +174,211 @@ class BluetoothListenerWorker(QThread):
         """
         self._listening = False
 
-    def _listen_string(self) -> None:
-        """Listen for string data from the Bluetooth device and write it to a text file."""
-        with open(Files.TEXT_FILE, "a", encoding="latin-1") as f:
-            while self._listening:
-                data = self._line_follower.bluetooth.read_string()
+    def _read(self) -> None:
+        """Move the data received from the Bluetooth device into the buffer until the listener stops."""
+        bluetooth = self._line_follower.bluetooth
+
+        while self._listening:
+            data = bluetooth.read_data(wait=True)
+
+            if data and not self._buffer.write(data):
+                # Mark where the data was dropped so the partial frame before it is discarded
+                self._markers.append((self._buffer.written, []))
+            elif data and bluetooth.read_time:
+                self._arrivals.append((self._buffer.written, bluetooth.read_time))
+
+            gaps = bluetooth.take_gaps()
+            if gaps:
+                self._markers.append((self._buffer.written, gaps))
 
-                if not data:
-                    continue
+    def _process(self) -> None:
+        """Parse and handle the data in the buffer, up to the next gap or overflow."""
+        parser = self._line_follower.bluetooth.parser
+        self._process_markers()
 
-                if data == SerialInputs.START_SIGNAL.value:
-                    return
+        limit = None
+        if self._markers:
+            limit = self._markers[0][0] - self._buffer.read_position
 
-                f.write(f"{data}\n")
-                f.flush()
-                self.output.emit(data)
+        data = self._buffer.read(limit)
+        self._arrival_ns = time.monotonic_ns()
+        self._trace = self._take_arrival()
+
+        for frame in parser.feed(data):
+            self._frame_handlers[frame.type](frame)
+
+        self._process_markers()
+        self._report_overflows()
+
+    def _wait_time(self) -> float:
+        """Get the time to wait for data before the pending output is due."""
+        if not self._output:
+            return SerialConfig.READ_TIMEOUT
+
+        due = self._last_output + self._output_interval - time.perf_counter()
+        return min(SerialConfig.READ_TIMEOUT, max(due, 0))
+
+    def _emit_output(self, force: bool = False) -> None:
+        """Emit the pending output as a single batch if the output interval has passed."""
+        if not self._output:
+            return
+
+        now = time.perf_counter()
+        if not force and now - self._last_output < self._output_interval:
+            return
 
-    def _listen_binary(self) -> None:
-        """Listen for binary data from the Bluetooth device and write it to a binary file."""
-        buffer = b""
-        start_time = time.time()
+        self._last_output = now
+        self._add_track_segment()
+
+        output, self._output = self._output, []
+        trace, self._output_trace = self._output_trace, 0
+        self.output.emit(output, trace)
+
+    def _take_arrival(self) -> int:
+        """Get the receive time of the oldest chunk read from the buffer since the last call, 0 if not traced."""
+        start = 0
+        while self._arrivals and self._arrivals[0][0] <= self._buffer.read_position:
+            _, read_time = self._arrivals.popleft()
+            start = start or read_time
+
+        return start
+
+    def _process_markers(self) -> None:
+        """Handle the gaps and overflows reached by the processing."""
+        while self._markers and self._markers[0][0] <= self._buffer.read_position:
+            _, frames = self._markers.popleft()
+            self._line_follower.bluetooth.parser.discard()
+
+            for frame in frames:
+                self._frame_handlers[frame.type](frame)
+
+    def _report_overflows(self) -> None:
+        """Report data dropped because the buffer was full."""
+        overflows = self._buffer.overflows
+        if overflows == self._overflows:
+            return
+
+        self._overflows = overflows
+        self._write_text(
+            f"Receive buffer overflowed, {self._buffer.dropped} bytes dropped in total"
+        )
+
+    def _handle_text(self, frame: Frame) -> None:
+        """Write a text line to the text file and output it, as a configuration update if it holds one."""
+        text = frame.text
+        update = self._commands.parse(text, self._arrival_ns)
+
+        if update is None:
+            self._write_text(text)
+            return
+
+        self._log_text(text)
+        self._output.append(update)
+
+    def _handle_start(self, _: Frame) -> None:
+        """
+        Open a new session directory when the robot starts sending sensor data, with the sensor data and the
+        text messages received until it stops. Old sessions beyond the retention limits are deleted.
+        """
+        self._start_time = time.time()
+        self._start_ns = time.monotonic_ns()
+        self._session_dir = new_session_dir(self._start_time)
+        self._log_writer.open(
+            SESSION_LOG,
+            session_file(self._session_dir),
+            max_size=LogConfig.MAX_FILE_SIZE,
+            header=encode_session_header(
+                self._start_time,
+                self._line_follower.config_snapshot(),
+                start_ns=self._start_ns,
+            ),
+        )
+        self._log_writer.open(
+            SESSION_TEXT_LOG,
+            os.path.join(self._session_dir, Files.SESSION_TEXT_FILE),
+            max_size=LogConfig.MAX_FILE_SIZE,
+        )
+        self._log_writer.submit(
+            functools.partial(prune_sessions, keep=self._session_dir)
+        )
+        self._track.reset()
+        self._new_track = True
+        self._logging_session = True
+        self._lost_frames = 0
+        self._corrupt_frames = 0
+
+    def _handle_word(self, frame: Frame) -> None:
+        """Write a sensor word and its timestamp to the session file and output it."""
+        if not self._logging_session:
+            return
 
         # TODO: Offload file and binary processing operations to a faster C++ subprocess
-        with open(Files.BINARY_FILE, "ab") as binary_file, open(
-            Files.TIMESTAMP_FILE, "a"
-        ) as timestamp_file:
-            while self._listening:
-                data = self._line_follower.bluetooth.read_binary()
+        elapsed_time_ms = (time.monotonic_ns() - self._start_ns) // 1_000_000
+        self._log_writer.write(
+            SESSION_LOG, SESSION_RECORD.pack(elapsed_time_ms, frame.data)
+        )
 
-                if not data:
-                    continue
+        self._handle_binary(frame.data, elapsed_time_ms)
 
-                buffer += data
+        if self._trace:
+            self._trace_word()
 
-                if buffer == SerialInputs.STOP_SIGNAL.value:
-                    return
+    def _handle_stop(self, _: Frame) -> None:
+        """Close the session files when the robot stops sending sensor data."""
+        if self._lost_frames or self._corrupt_frames:
+            self._write_text(
+                f"Telemetry session ended with {self._lost_frames} lost and "
+                f"{self._corrupt_frames} corrupt frames"
+            )
+
+        self._close_session()
+
+    def _handle_gap(self, frame: Frame) -> None:
+        """
+        Record a connection gap in the text file and display it. The session files are kept open, so a
+        session interrupted by a reconnection continues in the same files.
+        """
+        self._write_text(f"Connection lost for {frame.text} ms")
 
-                if not self._check_buffer(buffer):
-                    continue
+    def _handle_lost(self, frame: Frame) -> None:
+        """Report telemetry frames skipped by the robot's sequence numbers."""
+        self._lost_frames += int(frame.data)
+        self._write_text(f"Lost {frame.text} telemetry frames")
 
-                elapsed_time_ms = int((time.time() - start_time) * 1000)
-                timestamp_file.write(f"{elapsed_time_ms}\n")
-                timestamp_file.flush()
+    def _handle_corrupt(self, _: Frame) -> None:
+        """Report a telemetry frame discarded because it failed its checksum."""
+        self._corrupt_frames += 1
+        self._write_text("Discarded a corrupt telemetry frame")
 
-                binary_file.write(buffer)
-                binary_file.flush()
+    def _write_text(self, data: str) -> None:
+        """Write a line to the text file and output it."""
+        self._log_text(data)
+        self._output.append(TextLine(data))
 
-                self._handle_binary(buffer, elapsed_time_ms)
-                buffer = b""
+    def _log_text(self, data: str) -> None:
+        """Write a line to the text file, and to the session's text file while logging."""
+        line = f"{data}\n".encode("latin-1")
+        self._log_writer.write(TEXT_LOG, line)
+        if self._logging_session:
+            self._log_writer.write(SESSION_TEXT_LOG, line)
+
+    def _close_session(self) -> None:
+        """Close the session files if they are open."""
+        if not self._logging_session:
+            return
+
+        self._log_writer.close(SESSION_LOG)
+        self._log_writer.close(SESSION_TEXT_LOG)
+        self._logging_session = False
+
+    def _trace_word(self) -> None:
+        """Record the latency of the first sensor word processed from the chunks read."""
+        self._tracer.record("decode", self._trace)
+        self._log_writer.mark(self._trace)
+
+        if not self._output_trace:
+            self._output_trace = self._trace
+        self._trace = 0
 
     def _handle_binary(self, buffer: bytes, timestamp: int) -> None:
         """Handle the binary data received from the Bluetooth device."""
@@ -108,21 +387,16 @@ class BluetoothListenerWorker(QThread):
         except IndexError:
             return
 
-        bits = [(word & (1 << i)) >> i for i in BIT_POSITIONS]
-        formatted_bits = "   ".join(
-            [
-                f"{bits[0] if bits[0] == 1 else '  '}",
-                "|",
-                "  ".join(str(bit if bit == 1 else "  ") for bit in bits[1:6]),
-                "  ".join(str(bit if bit == 1 else "  ") for bit in bits[7:11]),
-                "|",
-                f"{bits[11] if bits[11] == 1 else '  '}",
-                f"||  {bits[6] if bits[6] == 1 else '  '}",
-            ]
-        )
+        self._output.append(SensorSample(timestamp, word))
+        self._track.add_word(word)
 
-        self.output.emit(f"{timestamp} ms:  {formatted_bits}")
+    def _add_track_segment(self) -> None:
+        """Add the part of the track reconstructed since the last output to the output."""
+        points, left_markers, right_markers = self._track.take()
+        if not points:
+            return
 
-    def _check_buffer(self, buffer: bytes) -> bool:
-        """Check if the buffer is valid and not a stop signal."""
-        return buffer != SerialInputs.STOP_SIGNAL.value[: len(buffer)]
+        self._output.append(
+            TrackSegment(points, left_markers, right_markers, self._new_track)
+        )
+        self._new_track = False
@@ -0,0 +1,411 @@
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from enum import Enum
+from typing import BinaryIO
+
+from utils import LatencyTracer, LogConfig, log_part, log_part_indices
+
+
+class _Operations(Enum):
+    """Operations sent to the writer thread."""
+
+    OPEN = 0
+    WRITE = 1
+    CLOSE = 2
+    STOP = 3
+    MARK = 4
+    CALL = 5
+
+
+class _LogFile:
+    """An open log file with its rotation settings."""
+
+    def __init__(self, path: str, max_size: int, max_files: int, header: bytes) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.max_files = max_files
+        self.header = header
+        self.part = 0
+        self.size = 0
+        self.file: BinaryIO | None = None
+
+
+class LogWriter:
+    """
+    ### LogWriter Class
+
+    Writes log files from a background thread, so logging never blocks data acquisition. Records are sent
+    through a queue and the writer thread takes all queued records at once, grouping them into a single
+    write per file. Opening and closing files goes through the same queue, so records always end up in the
+    file that was open when they were written.
+
+    Files are flushed when `flush_interval` milliseconds have passed or `flush_records` records were written
+    since the last flush, whichever happens first, and synced to disk when closed if `fsync` is enabled.
+    Either flush condition can be disabled by setting it to 0.
+
+    Files opened with a maximum size continue in a new part named `<name>_<index><extension>` when they reach
+    it, with the given header written at the start of each part. Only the last `max_files` parts are kept.
+
+    Errors are reported and don't stop the writer thread: a failed function only loses its own work, and any
+    other failure loses the rest of its batch, so a single bad record or disk error doesn't stop logging.
+
+    With a `tracer`, marks queued after records record the latency of the "write" stage once the records
+    before them are written.
+
+    #### Parameters:
+    - `flush_interval (int)`: Maximum time in milliseconds between flushes.
+    - `flush_records (int)`: Maximum number of records written between flushes.
+    - `fsync (bool)`: Sync files to disk when they are closed.
+    - `tracer (LatencyTracer | None)`: Latency histograms to record the "write" stage in.
+
+    #### Properties:
+    - `queue_depth (int)`: Number of operations waiting to be written.
+    - `max_queue_depth (int)`: Largest queue depth seen by the writer thread.
+    - `write_latency (float)`: Time in seconds taken by the last batch of writes.
+    - `max_write_latency (float)`: Longest time in seconds taken by a batch of writes.
+    - `records (int)`: Number of records written.
+
+    #### Methods:
+    - `start() -> None`: Starts the writer thread.
+    - `open(name: str, path: str, max_size: int = 0, max_files: int = 0, header: bytes = b"") -> None`: Opens a
+    file in append mode under a name, continuing in new parts when it grows too large.
+    - `write(name: str, data: bytes) -> None`: Writes a record to the file with the given name.
+    - `close(name: str) -> None`: Closes the file with the given name.
+    - `mark(start: int) -> None`: Records the latency from a start stamp once the queued records are written.
+    - `submit(function: Callable[[], None]) -> None`: Runs a function in the writer thread.
+    - `stop() -> None`: Writes all queued records, closes all files and stops the writer thread.
+    """
+
+    def __init__(
+        self,
+        flush_interval: int = LogConfig.FLUSH_INTERVAL,
+        flush_records: int = LogConfig.FLUSH_RECORDS,
+        fsync: bool = LogConfig.FSYNC_ON_CLOSE,
+        tracer: LatencyTracer | None = None,
+    ) -> None:
+        self._flush_interval = flush_interval / 1000
+        self._flush_records = flush_records
+        self._fsync = fsync
+        self._tracer = tracer
+
+        self._queue: queue.SimpleQueue[tuple[_Operations, str, object]] = (
+            queue.SimpleQueue()
+        )
+        self._thread: threading.Thread | None = None
+        self._files: dict[str, _LogFile] = {}
+
+        self._unflushed = 0
+        self._last_flush = 0.0
+        self._max_queue_depth = 0
+        self._write_latency = 0.0
+        self._max_write_latency = 0.0
+        self._records = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of operations waiting to be written."""
+        return self._queue.qsize()
+
+    @property
+    def max_queue_depth(self) -> int:
+        """Largest queue depth seen by the writer thread."""
+        return self._max_queue_depth
+
+    @property
+    def write_latency(self) -> float:
+        """Time in seconds taken by the last batch of writes."""
+        return self._write_latency
+
+    @property
+    def max_write_latency(self) -> float:
+        """Longest time in seconds taken by a batch of writes."""
+        return self._max_write_latency
+
+    @property
+    def records(self) -> int:
+        """Number of records written."""
+        return self._records
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, name="LogWriter")
+        self._thread.start()
+
+    def open(
+        self,
+        name: str,
+        path: str,
+        max_size: int = 0,
+        max_files: int = 0,
+        header: bytes = b"",
+    ) -> None:
+        """
+        Open a file in append mode under a name, closing any file open under the same name. If the file was
+        already split in parts, its last part is opened.
+
+        Args:
+            name (str): The name used to write to the file.
+            path (str): The path of the file.
+            max_size (int, optional): Size in bytes at which the file continues in a new part, 0 to disable.
+                Defaults to 0.
+            max_files (int, optional): Number of parts kept, 0 to keep all. Defaults to 0.
+            header (bytes, optional): Data written at the start of each new part. Defaults to no header.
+        """
+        self._queue.put(
+            (_Operations.OPEN, name, _LogFile(path, max_size, max_files, header))
+        )
+
+    def write(self, name: str, data: bytes) -> None:
+        """
+        Write a record to the file with the given name. Records for files that are not open are discarded.
+
+        Args:
+            name (str): The name of the file.
+            data (bytes): The record to write.
+        """
+        self._queue.put((_Operations.WRITE, name, data))
+
+    def close(self, name: str) -> None:
+        """
+        Close the file with the given name, syncing it to disk if enabled.
+
+        Args:
+            name (str): The name of the file.
+        """
+        self._queue.put((_Operations.CLOSE, name, None))
+
+    def mark(self, start: int) -> None:
+        """
+        Record the latency of the "write" stage from a start stamp once the records queued before are written.
+
+        Args:
+            start (int): The start stamp, from `time.perf_counter_ns`.
+        """
+        if self._tracer is None or not start:
+            return
+
+        self._queue.put((_Operations.MARK, "", start))
+
+    def submit(self, function: Callable[[], None]) -> None:
+        """
+        Run a function in the writer thread, after the operations queued before it, such as deleting old log
+        files without blocking the caller.
+
+        Args:
+            function (Callable[[], None]): The function to run.
+        """
+        self._queue.put((_Operations.CALL, "", function))
+
+    def stop(self) -> None:
+        """Write all queued records, close all files and stop the writer thread."""
+        if self._thread is None:
+            return
+
+        self._queue.put((_Operations.STOP, "", None))
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        """Write the queued records in batches until stopped."""
+        running = True
+
+        while running:
+            try:
+                operations = [self._queue.get(timeout=self._wait_time())]
+            except queue.Empty:
+                operations = []
+
+            while True:
+                try:
+                    operations.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            self._max_queue_depth = max(self._max_queue_depth, len(operations))
+
+            start = time.perf_counter()
+            try:
+                running = self._execute(operations)
+                self._flush_if_due()
+            except Exception as e:
+                print(f"Failed to write log records: {e}")
+                running = all(
+                    operation[0] != _Operations.STOP for operation in operations
+                )
+            self._write_latency = time.perf_counter() - start
+            self._max_write_latency = max(self._max_write_latency, self._write_latency)
+
+        for name in list(self._files):
+            self._close_file(name)
+
+    def _wait_time(self) -> float | None:
+        """Get the time to wait for records before the next flush is due."""
+        if not self._unflushed or not self._flush_interval:
+            return None
+
+        return max(self._last_flush + self._flush_interval - time.perf_counter(), 0)
+
+    def _execute(self, operations: list[tuple[_Operations, str, object]]) -> bool:
+        """Execute a batch of operations, grouping consecutive records for each file into a single write."""
+        pending: dict[str, list[bytes]] = {}
+        marks: list[int] = []
+
+        for operation, name, payload in operations:
+            if operation == _Operations.WRITE:
+                pending.setdefault(name, []).append(payload)  # type: ignore[arg-type]
+                continue
+
+            if operation == _Operations.MARK:
+                marks.append(payload)  # type: ignore[arg-type]
+                continue
+
+            self._write_pending(pending)
+
+            if operation == _Operations.OPEN:
+                self._open_file(name, payload)  # type: ignore[arg-type]
+            elif operation == _Operations.CLOSE:
+                self._close_file(name)
+            elif operation == _Operations.CALL:
+                self._call(payload)  # type: ignore[arg-type]
+            elif operation == _Operations.STOP:
+                self._record_marks(marks)
+                return False
+
+        self._write_pending(pending)
+        self._record_marks(marks)
+        return True
+
+    @staticmethod
+    def _call(function: Callable[[], None]) -> None:
+        """Run a submitted function, reporting its errors."""
+        try:
+            function()
+        except Exception as e:
+            print(f"Failed to run log task: {e}")
+
+    def _record_marks(self, marks: list[int]) -> None:
+        """Record the latency of the "write" stage for the marks of a batch, once its records are written."""
+        for start in marks:
+            self._tracer.record("write", start)  # type: ignore[union-attr]
+
+    def _write_pending(self, pending: dict[str, list[bytes]]) -> None:
+        """Write the grouped records to their files."""
+        for name, records in pending.items():
+            log_file = self._files.get(name)
+            if log_file is None:
+                continue
+
+            data = b"".join(records)
+            if (
+                log_file.max_size
+                and log_file.size > len(log_file.header)
+                and log_file.size + len(data) > log_file.max_size
+            ):
+                self._rotate_file(log_file)
+
+            if log_file.file is not None:
+                try:
+                    log_file.file.write(data)
+                    log_file.size += len(data)
+                except (OSError, ValueError) as e:
+                    print(f"Failed to write to log file {log_file.file.name}: {e}")
+
+            self._records += len(records)
+            self._unflushed += len(records)
+
+        pending.clear()
+
+    def _flush_if_due(self) -> None:
+        """Flush all open files if the flush interval passed or enough records were written."""
+        if not self._unflushed:
+            return
+
+        now = time.perf_counter()
+        interval_due = (
+            self._flush_interval and now - self._last_flush >= self._flush_interval
+        )
+        records_due = self._flush_records and self._unflushed >= self._flush_records
+
+        if not interval_due and not records_due:
+            return
+
+        for log_file in self._files.values():
+            if log_file.file is None:
+                continue
+
+            try:
+                log_file.file.flush()
+            except (OSError, ValueError) as e:
+                print(f"Failed to flush log file {log_file.file.name}: {e}")
+
+        self._unflushed = 0
+        self._last_flush = now
+
+    def _open_file(self, name: str, log_file: _LogFile) -> None:
+        """Open the last part of a file in append mode under a name."""
+        self._close_file(name)
+
+        parts = log_part_indices(log_file.path)
+        log_file.part = parts[-1] if parts else 0
+
+        self._files[name] = log_file
+        self._open_part(log_file)
+
+    def _rotate_file(self, log_file: _LogFile) -> None:
+        """Continue a file in a new part, deleting the parts beyond the number kept."""
+        self._close_part(log_file)
+        log_file.part += 1
+        self._open_part(log_file)
+
+        if not log_file.max_files:
+            return
+
+        for part in log_part_indices(log_file.path):
+            if part > log_file.part - log_file.max_files:
+                break
+
+            path = log_part(log_file.path, part)
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"Failed to delete log file {path}: {e}")
+
+    def _open_part(self, log_file: _LogFile) -> None:
+        """Open the current part of a file in append mode, writing the header if the part is new."""
+        path = log_part(log_file.path, log_file.part)
+
+        try:
+            log_file.file = open(path, "ab")
+            log_file.size = log_file.file.tell()
+            if not log_file.size and log_file.header:
+                log_file.file.write(log_file.header)
+                log_file.size = len(log_file.header)
+        except OSError as e:
+            log_file.file = None
+            print(f"Failed to open log file {path}: {e}")
+
+    def _close_file(self, name: str) -> None:
+        """Close the file with the given name, syncing it to disk if enabled."""
+        log_file = self._files.pop(name, None)
+        if log_file is not None:
+            self._close_part(log_file)
+
+    def _close_part(self, log_file: _LogFile) -> None:
+        """Close the current part of a file, syncing it to disk if enabled."""
+        file, log_file.file = log_file.file, None
+        if file is None:
+            return
+
+        try:
+            file.flush()
+            if self._fsync:
+                os.fsync(file.fileno())
+            file.close()
+        except OSError as e:
+            print(f"Failed to close log file {file.name}: {e}")
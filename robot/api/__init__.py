@@ -1,3 +1,13 @@
+from .async_api import AsyncBluetoothApi
 from .main import BluetoothApi
+from .parser import Frame, FrameParser, FrameTypes
+from .ring_buffer import RingBuffer
 
-__all__ = ["BluetoothApi"]
+__all__ = [
+    "AsyncBluetoothApi",
+    "BluetoothApi",
+    "Frame",
+    "FrameParser",
+    "FrameTypes",
+    "RingBuffer",
+]
@@ -0,0 +1,181 @@
+import asyncio
+import io
+from functools import partial
+
+import serial
+
+from utils import SerialConfig
+
+from .parser import Frame, FrameParser
+
+
+class AsyncBluetoothApi:
+    """
+    ### AsyncBluetoothApi Class
+
+    Asyncio based communication with the robot. Uses the same frame parser as the `BluetoothApi`, so scripts
+    and tools can handle the serial link alongside timers, files and other connections in a single event loop.
+
+    On POSIX systems the serial port's file descriptor is registered with the event loop and read without
+    blocking. Ports without a file descriptor are read with blocking reads in a worker thread instead.
+
+    #### Properties:
+    - `connected (bool)`: Indicates if the serial connection is open.
+
+    #### Methods:
+    - `connect(port: str, baud_rate: int = SerialConfig.BAUD_RATE) -> None`: Opens the serial connection.
+    - `read_frames() -> list[Frame]`: Waits for and returns all complete frames received.
+    - `write(data: bytes) -> None`: Writes binary data to the robot.
+    - `close() -> None`: Closes the serial connection.
+    """
+
+    def __init__(self):
+        self._serial: serial.Serial | None = None
+        self._parser = FrameParser()
+        self._frames: list[Frame] = []
+        self._data_ready = asyncio.Event()
+        self._error: serial.SerialException | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._fd: int | None = None
+        self._reader_task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "AsyncBluetoothApi":
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def connected(self) -> bool:
+        """Check if the serial connection is open."""
+        return self._serial is not None and self._serial.is_open
+
+    async def connect(self, port: str, baud_rate: int = SerialConfig.BAUD_RATE) -> None:
+        """
+        Open the serial connection and start reading from it.
+
+        Args:
+            port (str): The serial port to connect to.
+            baud_rate (int, optional): The baud rate of the connection. Defaults to SerialConfig.BAUD_RATE.
+
+        Raises:
+            serial.SerialException: If the port could not be opened.
+        """
+        self.close()
+
+        self._loop = loop = asyncio.get_running_loop()
+        self._serial = await loop.run_in_executor(
+            None, partial(serial.Serial, port, baud_rate, timeout=0)
+        )
+
+        self._parser.reset()
+        self._frames = []
+        self._error = None
+        self._data_ready.clear()
+
+        try:
+            self._fd = self._serial.fileno()
+            loop.add_reader(self._fd, self._on_readable)
+        except (io.UnsupportedOperation, NotImplementedError):
+            self._fd = None
+            self._serial.timeout = SerialConfig.READ_TIMEOUT
+            self._reader_task = asyncio.create_task(self._poll_reader())
+
+    async def read_frames(self) -> list[Frame]:
+        """
+        Wait for data from the robot and return all complete frames received.
+
+        Returns:
+            list[Frame]: The complete frames in the order they were received.
+
+        Raises:
+            serial.SerialException: If the connection failed or is not open.
+        """
+        while not self._frames:
+            if self._error is not None:
+                raise self._error
+
+            if not self.connected:
+                raise serial.PortNotOpenError()
+
+            await self._data_ready.wait()
+            self._data_ready.clear()
+
+        frames, self._frames = self._frames, []
+        return frames
+
+    async def write(self, data: bytes) -> None:
+        """
+        Write binary data to the robot.
+
+        Args:
+            data (bytes): The binary data to write.
+
+        Raises:
+            serial.SerialException: If the write failed or the connection is not open.
+        """
+        if not self.connected:
+            raise serial.PortNotOpenError()
+
+        await asyncio.to_thread(self._serial.write, data)  # type: ignore[union-attr]
+
+    def close(self) -> None:
+        """Close the serial connection and wake up any pending readers."""
+        if self._fd is not None and self._loop is not None:
+            self._loop.remove_reader(self._fd)
+            self._fd = None
+
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+
+        if self._serial is not None:
+            self._serial.close()
+            self._serial = None
+
+        self._data_ready.set()
+
+    def _on_readable(self) -> None:
+        """Read all available data when the event loop reports the port as readable."""
+        try:
+            size = self._serial.in_waiting or 1  # type: ignore[union-attr]
+            data = self._serial.read(size)  # type: ignore[union-attr]
+        except serial.SerialException as e:
+            self._fail(e)
+            return
+
+        self._push(data)
+
+    async def _poll_reader(self) -> None:
+        """Read data with blocking reads in a worker thread for ports without a file descriptor."""
+        while self.connected:
+            try:
+                data = await asyncio.to_thread(self._read_blocking)
+            except serial.SerialException as e:
+                self._fail(e)
+                return
+
+            self._push(data)
+
+    def _read_blocking(self) -> bytes:
+        """Wait up to the read timeout for data and return everything available."""
+        data = self._serial.read(1)  # type: ignore[union-attr]
+        if not data:
+            return data
+
+        return data + self._serial.read(self._serial.in_waiting)  # type: ignore[union-attr]
+
+    def _push(self, data: bytes) -> None:
+        """Parse received data and wake up the readers if new frames are complete."""
+        frames = self._parser.feed(data)
+        if not frames:
+            return
+
+        self._frames.extend(frames)
+        self._data_ready.set()
+
+    def _fail(self, error: serial.SerialException) -> None:
+        """Store a connection error to be raised by the next read and close the connection."""
+        self._error = error
+        self._reader_task = None
+        self.close()
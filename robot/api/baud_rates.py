@@ -0,0 +1,172 @@
+import json
+import os
+import time
+
+import serial
+
+from utils import Files, Messages, SerialConfig, SerialInputs
+
+_LINE_END = b"\r\n"
+_PREFIXES = tuple(
+    message.value.encode("latin-1")
+    for message in SerialInputs
+    if isinstance(message.value, str)
+)
+
+
+class BaudRateProber:
+    """
+    ### BaudRateProber Class
+
+    Finds the fastest baud rate the robot answers on for each port. The open port is switched through the
+    candidate rates from the fastest to the slowest, listening at each of them, and the first rate that works is
+    kept. A rate works if a complete `SerialInputs` message is received before the probe timeout. A state request
+    is only sent at the expected rate, the one last found for the port or `SerialConfig.BAUD_RATE`, so the robot
+    never receives data at a rate it isn't using. Faster rates are therefore only found while the robot is sending
+    messages. The rate found for each port is saved to `Files.BAUD_RATES_FILE` and expected on the next
+    connection.
+
+    #### Parameters:
+    - `rates (tuple[int, ...])`: Candidate baud rates, tried from the fastest to the slowest.
+    - `timeout (float)`: Time in seconds to wait for an answer at each rate.
+
+    #### Methods:
+    - `remembered(port: str) -> int | None`: Gets the baud rate last found for a port.
+    - `expected(port: str) -> int`: Gets the baud rate the robot is expected to use on a port.
+    - `probe(bluetooth: serial.Serial, port: str) -> tuple[int, bytes]`: Switches an open port to the rate the
+    robot answers on.
+    """
+
+    def __init__(
+        self,
+        rates: tuple[int, ...] = SerialConfig.BAUD_RATES,
+        timeout: float = SerialConfig.PROBE_TIMEOUT,
+    ) -> None:
+        self._rates = tuple(rates)
+        self._timeout = timeout
+        self._known_rates = self._load()
+
+    def remembered(self, port: str) -> int | None:
+        """
+        Get the baud rate last found for a port.
+
+        Args:
+            port (str): The serial port.
+
+        Returns:
+            int | None: The baud rate, or None if the port was never probed successfully.
+        """
+        return self._known_rates.get(port)
+
+    def expected(self, port: str) -> int:
+        """
+        Get the baud rate the robot is expected to use on a port.
+
+        Args:
+            port (str): The serial port.
+
+        Returns:
+            int: The baud rate last found for the port, or `SerialConfig.BAUD_RATE` if it was never probed.
+        """
+        return self.remembered(port) or SerialConfig.BAUD_RATE
+
+    def probe(self, bluetooth: serial.Serial, port: str) -> tuple[int, bytes]:
+        """
+        Switch an open port to the fastest baud rate the robot answers on. The rates are tried from the fastest
+        to the slowest. The expected rate is listened on and then sent a state request, while the other rates
+        are only listened on, so they are only found while the robot is sending messages. If the robot isn't
+        heard at any rate, the port is left at the expected rate.
+
+        This blocks for up to the probe timeout per candidate rate, so it must not run in the GUI thread.
+
+        Args:
+            bluetooth (serial.Serial): The port, open at the expected rate.
+            port (str): The name of the port.
+
+        Raises:
+            serial.SerialException: If the port fails while probing.
+
+        Returns:
+            tuple[int, bytes]: The baud rate of the port and the data received at that rate.
+        """
+        expected = self.expected(port)
+        candidates = sorted({expected, *self._rates}, reverse=True)
+
+        timeout = bluetooth.timeout
+        bluetooth.timeout = SerialConfig.READ_TIMEOUT
+
+        for rate in candidates:
+            try:
+                bluetooth.baudrate = rate
+            except (ValueError, serial.SerialException):
+                # The driver doesn't support this rate
+                continue
+
+            data = self._listen(bluetooth)
+            if data is None and rate == expected:
+                data = self._listen(bluetooth, Messages.STATE_REQUEST)
+
+            if data is not None:
+                self._remember(port, rate)
+                break
+        else:
+            print(f"Robot did not answer on {port}, using {expected} baud.")
+            rate, data = expected, b""
+            bluetooth.baudrate = rate
+
+        bluetooth.timeout = timeout
+        return rate, data
+
+    def _listen(self, bluetooth: serial.Serial, request: bytes = b"") -> bytes | None:
+        """Send an optional request and get the data received from the first valid message onwards."""
+        bluetooth.reset_input_buffer()
+        if request:
+            bluetooth.write(request)
+
+        data = bytearray()
+        deadline = time.monotonic() + self._timeout
+
+        while time.monotonic() < deadline:
+            data += bluetooth.read(bluetooth.in_waiting or 1)
+            start = self._find_message(data)
+            if start >= 0:
+                return bytes(data[start:])
+
+        return None
+
+    @staticmethod
+    def _find_message(data: bytearray) -> int:
+        """Find the first complete message from the robot, made of a known prefix and a value byte."""
+        start = 0
+
+        while (end := data.find(_LINE_END, start)) >= 0:
+            line = data[start:end]
+            for prefix in _PREFIXES:
+                if len(line) == len(prefix) + 1 and line.startswith(prefix):
+                    return start
+            start = end + len(_LINE_END)
+
+        return -1
+
+    def _remember(self, port: str, rate: int) -> None:
+        """Save the baud rate found for a port."""
+        if self._known_rates.get(port) == rate:
+            return
+
+        self._known_rates[port] = rate
+
+        try:
+            os.makedirs(os.path.dirname(Files.BAUD_RATES_FILE), exist_ok=True)
+            with open(Files.BAUD_RATES_FILE, "w") as file:
+                json.dump(self._known_rates, file, indent=4)
+        except OSError as e:
+            print(f"Failed to save baud rates: {e}")
+
+    @staticmethod
+    def _load() -> dict[str, int]:
+        """Load the baud rates found in previous sessions."""
+        try:
+            with open(Files.BAUD_RATES_FILE) as file:
+                return {str(port): int(rate) for port, rate in json.load(file).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
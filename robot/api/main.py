@@ -1,10 +1,21 @@
 import atexit
+import io
+import os
+import select
+import threading
+import time
 
 import serial
 from PyQt6.QtCore import QObject, pyqtSignal
 from serial.tools import list_ports
 
-from utils import SerialConfig
+from utils import LatencyTracer, Messages, SerialConfig
+
+from . import protocol
+from .baud_rates import BaudRateProber
+from .parser import Frame, FrameParser, FrameTypes
+from .ports import PortRegistry
+from .transmitter import CommandQueue
 
 
 class BluetoothApi(QObject):
@@ -13,29 +24,76 @@ class BluetoothApi(QObject):
 
     Handles Bluetooth communication with the robot. Inherits from QObject to use signals and slots.
 
+    The port is opened at the rate last found for it, or `SerialConfig.BAUD_RATE`. If `SerialConfig.PROBE_BAUD_RATES`
+    is enabled, the candidate rates in `SerialConfig.BAUD_RATES` are then probed by the first `read_data` call, in
+    the thread that reads the port, to find the fastest one the robot answers on. Reconnections reuse the rate found.
+
+    On connection, the telemetry protocol in `SerialConfig.PROTOCOL_VERSION` is requested from the robot. If the
+    robot doesn't acknowledge it within `SerialConfig.PROTOCOL_TIMEOUT`, the legacy 2-byte stream is used.
+
+    When `supervised` is enabled, a connection that fails while reading or writing is reopened on the same
+    port with an increasing delay between attempts, keeping the parser's state. Once reconnected, a GAP frame
+    with the duration of the outage is returned by `read_frames` or `take_gaps` before any new data.
+
+    Data can be read already parsed with `read_frames`, or as raw bytes with `read_data` to be parsed by the
+    `parser` in another thread. In that case, `take_gaps` must be checked after each read and the parser's
+    buffer discarded when a gap is found, as done by `read_frames`.
+
+    While the `tracer` is enabled, the time each chunk of data is received is saved in `read_time`, as the
+    start stamp of the latency of the stages that handle it.
+
     #### Signals:
     - `connection_change`: Signal emitted when the Bluetooth connection changes.
+    - `ports_change`: Signal emitted when the list of available COM ports changes.
 
     #### Properties:
     - `port (str)`: Current COM port for the Bluetooth connection.
-    - `ports (list[str])`: List of available COM ports.
+    - `baud_rate (int)`: Baud rate of the current or last connection.
+    - `ports (list[str])`: Cached list of available COM ports.
     - `connected (bool)`: Indicates if the Bluetooth connection is open.
+    - `protocol (int)`: Version of the telemetry protocol acknowledged by the robot.
+    - `parser (FrameParser)`: Parser for the data received from the robot.
+    - `reconnecting (bool)`: Indicates if a lost connection is being reopened.
+    - `supervised (bool)`: Indicates if lost connections are reopened automatically.
+    - `tracer (LatencyTracer)`: Latency histograms of the stages of the telemetry pipeline.
+    - `read_time (int)`: Time from `time.perf_counter_ns` when the last data was received, if tracing.
 
     #### Methods:
     - `list_available_ports() -> list[str]`: Lists all available COM ports.
+    - `refresh_ports() -> None`: Enumerates the available COM ports and updates the cached list.
     - `set_com_port(com_port: str) -> bool`: Sets the COM port for the Bluetooth connection.
     - `connect_serial() -> bool`: Connects to the Bluetooth device using the specified COM port.
     - `disconnect_serial() -> None`: Disconnects from the Bluetooth device.
-    - `read_string() -> str | None`: Reads a string from the Bluetooth device.
-    - `read_binary() -> bytes | None`: Reads binary data from the Bluetooth device.
+    - `read_frames(wait: bool = False) -> list[Frame]`: Reads all complete frames from the Bluetooth device.
+    - `read_data(wait: bool = False) -> bytes`: Reads all available raw data from the Bluetooth device.
+    - `take_gaps() -> list[Frame]`: Gets the GAP frames of the reconnections since the last call.
     - `write_data(data: bytes) -> None`: Writes binary data to the Bluetooth device.
+    - `send_command(message: bytes) -> None`: Queues a command message to be sent from a background thread.
     """
 
     connection_change = pyqtSignal()
+    ports_change = pyqtSignal()
 
     def __init__(self):
         super().__init__()
         self._bluetooth: serial.Serial | None = None
+        self._supervised = SerialConfig.RECONNECT
+        self._lock = threading.Lock()
+        self._lost_time: float | None = None
+        self._reconnect_delay = SerialConfig.RECONNECT_MIN_DELAY
+        self._next_reconnect = 0.0
+        self._gaps: list[Frame] = []
+        self._pending_data = b""
+        self._baud_rate = SerialConfig.BAUD_RATE
+        self._baud_rate_prober = BaudRateProber()
+        self._probing = False
+        self._protocol_deadline: float | None = None
+        self._parser = FrameParser()
+        self._tracer = LatencyTracer()
+        self._read_time = 0
+        self._command_queue = CommandQueue(self.write_data)
+        self._port_registry = PortRegistry(self.list_available_ports)
+        self._port_registry.ports_change.connect(self.ports_change)
         self._com_port = self._get_initial_port()
 
         atexit.register(self._safe_disconnect)
@@ -48,28 +106,77 @@ class BluetoothApi(QObject):
 
         return self._com_port
 
+    @property
+    def baud_rate(self) -> int:
+        """Get the baud rate of the current or last connection."""
+        return self._baud_rate
+
     @property
     def ports(self) -> list[str]:
-        """Get the list of available COM ports."""
-        return self.list_available_ports()
+        """Get the cached list of available COM ports."""
+        return self._port_registry.ports
 
     @property
     def connected(self) -> bool:
         """Check if the Bluetooth connection is open."""
         return self._bluetooth is not None and self._bluetooth.is_open
 
+    @property
+    def protocol(self) -> int:
+        """Get the version of the telemetry protocol acknowledged by the robot."""
+        return self._parser.protocol
+
+    @property
+    def parser(self) -> FrameParser:
+        """Get the parser for the data received from the robot."""
+        return self._parser
+
+    @property
+    def reconnecting(self) -> bool:
+        """Check if a lost connection is being reopened."""
+        return self._lost_time is not None
+
+    @property
+    def supervised(self) -> bool:
+        """Check if lost connections are reopened automatically."""
+        return self._supervised
+
+    @supervised.setter
+    def supervised(self, supervised: bool) -> None:
+        """Enable or disable reopening lost connections automatically."""
+        self._supervised = supervised
+
+    @property
+    def tracer(self) -> LatencyTracer:
+        """Get the latency histograms of the stages of the telemetry pipeline."""
+        return self._tracer
+
+    @property
+    def read_time(self) -> int:
+        """Get the time from `time.perf_counter_ns` when the last data was received, 0 if not tracing."""
+        return self._read_time
+
     @staticmethod
     def list_available_ports() -> list[str]:
         """
-        List all available COM ports.
+        List all available COM ports, including existing ports listed in the `SerialConfig.PORTS_ENV`
+        environment variable, such as the pseudo-terminal of a virtual robot.
 
         Returns:
             list[str]: List of available COM ports.
         """
-        return [
-            port.device
-            for port in sorted(list_ports.comports(), key=lambda port: port.device)
-        ]
+        ports = {port.device for port in list_ports.comports()}
+
+        extra_ports = os.environ.get(SerialConfig.PORTS_ENV, "").split(os.pathsep)
+        ports.update(port for port in extra_ports if port and os.path.exists(port))
+
+        return sorted(ports)
+
+    def refresh_ports(self) -> None:
+        """
+        Enumerate the available COM ports and update the cached list, emitting `ports_change` if it changed.
+        """
+        self._port_registry.refresh()
 
     def set_com_port(self, com_port: str) -> bool:
         """
@@ -84,7 +191,7 @@ class BluetoothApi(QObject):
         if com_port == self._com_port:
             return False
 
-        if self.connected:
+        if self.connected or self.reconnecting:
             print("Disconnect before changing port.")
             return False
 
@@ -102,17 +209,25 @@ class BluetoothApi(QObject):
         Returns:
             bool: True if the connection was successful, False otherwise.
         """
+        if self.reconnecting:
+            # Keep the parser's state when the user reconnects a lost connection
+            self._lost_time = None
+        else:
+            self._parser.reset()
+
         try:
-            self._bluetooth = serial.Serial(
-                self._com_port,
-                SerialConfig.BAUD_RATE,
-                timeout=SerialConfig.TIMEOUT,
-            )
+            self._baud_rate = self._initial_baud_rate()
+            self._bluetooth = self._open_serial()
             self.connection_change.emit()
         except serial.SerialException as e:
             print(f"Failed to connect to Bluetooth device: {e}")
             self._bluetooth = None
+            return False
 
+        # The protocol is requested once the baud rate is known
+        self._probing = SerialConfig.PROBE_BAUD_RATES
+        if not self._probing:
+            self._request_protocol()
         return self.connected
 
     def disconnect_serial(self) -> None:
@@ -122,50 +237,89 @@ class BluetoothApi(QObject):
         if self.connected:
             self._bluetooth.close()  # type: ignore[union-attr]
         self._bluetooth = None
+        self._lost_time = None
+        self._probing = False
+        self._protocol_deadline = None
+        self._pending_data = b""
+        self._command_queue.clear()
 
         self.connection_change.emit()
 
-    def read_string(self) -> str | None:
+    def read_frames(self, wait: bool = False) -> list[Frame]:
         """
-        Read a string from the Bluetooth device.
+        Read all available data from the Bluetooth device in a single chunk and parse it into frames.
+
+        Args:
+            wait (bool, optional): Block until data is available or `SerialConfig.READ_TIMEOUT` expires
+                instead of returning immediately. Defaults to False.
 
         Returns:
-            str | None: The read string, or None if no data is available.
+            list[Frame]: The complete frames received, or an empty list if no data is available.
         """
-        if not self.connected:
-            return None
+        data = self.read_data(wait)
+        gaps = self.take_gaps()
 
-        try:
-            if self._bluetooth.in_waiting <= 0:  # type: ignore[union-attr]
-                return None
+        if gaps:
+            # Partial frames from before the connection was lost will never be completed
+            self._parser.discard()
 
-            data = self._bluetooth.read_until(b"\r\n")  # type: ignore[union-attr]
-            return data[:-2].decode("latin-1")
-        except serial.SerialException as e:
-            print(f"Failed to read data from Bluetooth device: {e}")
-            self.disconnect_serial()
-            return None
+        return gaps + self._parser.feed(data)
 
-    def read_binary(self) -> bytes | None:
+    def read_data(self, wait: bool = False) -> bytes:
         """
-        Read binary data from the Bluetooth device.
+        Read all available raw data from the Bluetooth device in a single chunk.
+
+        Args:
+            wait (bool, optional): Block until data is available or `SerialConfig.READ_TIMEOUT` expires
+                instead of returning immediately. Defaults to False.
 
         Returns:
-            bytes | None: The read binary data, or None if no data is available.
+            bytes: The data received, or empty bytes if no data is available.
         """
-        if not self.connected:
-            return None
+        if self._probing:
+            self._probe_baud_rate()
 
-        try:
-            if self._bluetooth.in_waiting <= 0:  # type: ignore[union-attr]
-                return None
+        if self._protocol_deadline is not None:
+            self._check_protocol()
 
-            data = self._bluetooth.read(2)  # type: ignore[union-attr]
+        if self._pending_data:
+            data, self._pending_data = self._pending_data, b""
+            self._read_time = 0
+            return data
+
+        if not self._data_available(wait):
+            return b""
+
+        try:
+            # Waiting may have read the first byte already
+            data, self._pending_data = self._pending_data, b""
+            size = self._bluetooth.in_waiting  # type: ignore[union-attr]
+            if size or not data:
+                data += self._bluetooth.read(size or 1)  # type: ignore[union-attr]
+            self._read_time = time.perf_counter_ns() if self._tracer.enabled else 0
             return data
         except serial.SerialException as e:
             print(f"Failed to read data from Bluetooth device: {e}")
-            self.disconnect_serial()
-            return None
+            self._connection_lost()
+        except (AttributeError, OSError, TypeError, ValueError):
+            # The port was closed from another thread while reading
+            pass
+
+        return b""
+
+    def take_gaps(self) -> list[Frame]:
+        """
+        Get the GAP frames of the reconnections since the last call. They belong after all data read before
+        the call.
+
+        Returns:
+            list[Frame]: The GAP frames, with the duration of each gap in milliseconds.
+        """
+        if not self._gaps:
+            return []
+
+        gaps, self._gaps = self._gaps, []
+        return gaps
 
     def write_data(self, data: bytes) -> None:
         """
@@ -182,7 +336,193 @@ class BluetoothApi(QObject):
             print(f"Sent: {data}")
         except serial.SerialException as e:
             print(f"Failed to write data to Bluetooth device: {e}")
+            self._connection_lost()
+
+    def send_command(self, message: bytes) -> None:
+        """
+        Queue a command message to be sent to the Bluetooth device from a background thread.
+
+        Pending messages are sent together in paced batches, and a pending message for the same command is
+        replaced by the newest one.
+
+        Args:
+            message (bytes): The command message, as created by `Messages.COMMAND`.
+        """
+        if not self.connected:
+            return
+
+        self._command_queue.put(message)
+
+    def _data_available(self, wait: bool) -> bool:
+        """Check if there is data to read, optionally waiting for it to arrive."""
+        if not self.connected:
+            if self.reconnecting:
+                self._reconnect(wait)
+            elif wait:
+                time.sleep(SerialConfig.READ_TIMEOUT)
+            return False
+
+        try:
+            if self._bluetooth.in_waiting > 0:  # type: ignore[union-attr]
+                return True
+
+            if not wait:
+                return False
+
+            return self._wait_readable(SerialConfig.READ_TIMEOUT)
+        except serial.SerialException as e:
+            print(f"Failed to read data from Bluetooth device: {e}")
+            self._connection_lost()
+            return False
+        except (AttributeError, OSError, TypeError, ValueError):
+            # The port was closed from another thread while waiting
+            return False
+
+    def _wait_readable(self, timeout: float) -> bool:
+        """
+        Block until the serial port is readable or the timeout expires. Ports without a file descriptor wait for
+        their own read timeout instead.
+        """
+        try:
+            fd = self._bluetooth.fileno()  # type: ignore[union-attr]
+        except io.UnsupportedOperation:
+            fd = None
+
+        if fd is not None:
+            readable, _, _ = select.select([fd], [], [], timeout)
+            return bool(readable)
+
+        # Ports without a file descriptor (Windows) block in a read instead, up to their read timeout. The byte
+        # read is kept as pending data and returned with the rest of the data available
+        data = self._bluetooth.read(1)  # type: ignore[union-attr]
+        if not data:
+            return False
+
+        self._pending_data += data
+        return True
+
+    def _open_serial(self) -> serial.Serial:
+        """Open the serial port for the current COM port at the current baud rate."""
+        return serial.Serial(
+            self._com_port,
+            self._baud_rate,
+            timeout=SerialConfig.READ_TIMEOUT,
+        )
+
+    def _initial_baud_rate(self) -> int:
+        """Get the baud rate to open the current COM port at."""
+        if not SerialConfig.PROBE_BAUD_RATES:
+            return SerialConfig.BAUD_RATE
+        return self._baud_rate_prober.expected(self._com_port)
+
+    def _probe_baud_rate(self) -> None:
+        """Switch the open port to the fastest baud rate the robot answers on, then request the protocol."""
+        self._probing = False
+
+        try:
+            self._baud_rate, data = self._baud_rate_prober.probe(
+                self._bluetooth, self._com_port  # type: ignore[arg-type]
+            )
+        except serial.SerialException as e:
+            print(f"Failed to probe the baud rate of the Bluetooth device: {e}")
+            self._connection_lost()
+            return
+        except (AttributeError, OSError, TypeError, ValueError):
+            # The port was closed from another thread while probing
+            return
+
+        print(f"Connected to {self._com_port} at {self._baud_rate} baud.")
+
+        # The answer to the probe is a regular message, so it is returned as the first data received
+        self._pending_data = data
+        self._request_protocol()
+
+    def _request_protocol(self) -> None:
+        """Request the configured telemetry protocol from the robot."""
+        if SerialConfig.PROTOCOL_VERSION <= protocol.LEGACY_VERSION:
+            return
+
+        self._protocol_deadline = time.monotonic() + SerialConfig.PROTOCOL_TIMEOUT
+        self.send_command(Messages.SET_PROTOCOL(SerialConfig.PROTOCOL_VERSION))
+
+    def _check_protocol(self) -> None:
+        """Check if the robot acknowledged the requested protocol, falling back to the legacy stream."""
+        if self._parser.protocol >= SerialConfig.PROTOCOL_VERSION:
+            print(f"Using telemetry protocol v{self._parser.protocol}.")
+        elif time.monotonic() >= self._protocol_deadline:  # type: ignore[operator]
+            print(
+                f"Robot did not acknowledge protocol v{SerialConfig.PROTOCOL_VERSION}, "
+                "using the legacy stream."
+            )
+        else:
+            return
+
+        self._protocol_deadline = None
+
+    def _connection_lost(self) -> None:
+        """Handle a failed connection, reopening it if supervised or disconnecting otherwise."""
+        if not self._supervised:
+            self.disconnect_serial()
+            return
+
+        with self._lock:
+            if self._bluetooth is None:
+                return
+
+            try:
+                self._bluetooth.close()
+            except serial.SerialException:
+                pass
+
+            self._bluetooth = None
+            self._lost_time = time.monotonic()
+            self._reconnect_delay = SerialConfig.RECONNECT_MIN_DELAY
+            self._next_reconnect = self._lost_time + self._reconnect_delay
+
+        print(f"Connection to {self._com_port} lost, reconnecting...")
+        self.connection_change.emit()
+
+    def _reconnect(self, wait: bool) -> None:
+        """Try to reopen a lost connection if the next attempt is due."""
+        now = time.monotonic()
+
+        if now < self._next_reconnect:
+            if wait:
+                time.sleep(min(SerialConfig.READ_TIMEOUT, self._next_reconnect - now))
+            return
+
+        lost_time = self._lost_time
+        if lost_time is None:
+            return
+
+        if now - lost_time > SerialConfig.RECONNECT_TIMEOUT:
+            print(f"Could not reconnect to {self._com_port}.")
             self.disconnect_serial()
+            return
+
+        try:
+            bluetooth = self._open_serial()
+        except serial.SerialException:
+            self._reconnect_delay = min(
+                self._reconnect_delay * 2, SerialConfig.RECONNECT_MAX_DELAY
+            )
+            self._next_reconnect = time.monotonic() + self._reconnect_delay
+            return
+
+        with self._lock:
+            if self._lost_time is None:
+                # Disconnected by the user while reopening the port
+                bluetooth.close()
+                return
+
+            self._bluetooth = bluetooth
+            self._lost_time = None
+
+        gap_ms = int((time.monotonic() - lost_time) * 1000)
+        self._gaps.append(Frame(FrameTypes.GAP, str(gap_ms).encode()))
+
+        print(f"Reconnected to {self._com_port} after {gap_ms} ms.")
+        self.connection_change.emit()
 
     def _get_initial_port(self) -> str:
         """Get the initial COM port for the Bluetooth connection."""
@@ -0,0 +1,275 @@
+from enum import Enum
+from typing import NamedTuple
+
+from utils import SerialInputs
+
+from . import protocol
+
+
+class FrameTypes(Enum):
+    """List of frame types that can be parsed from the robot's serial stream."""
+
+    TEXT = 0
+    START = 1
+    WORD = 2
+    STOP = 3
+    GAP = 4
+    LOST = 5
+    CORRUPT = 6
+
+
+class Frame(NamedTuple):
+    """
+    ### Frame Class
+
+    A complete unit of data received from the robot.
+
+    #### Attributes:
+    - `type (FrameTypes)`: The type of the frame.
+    - `data (bytes)`: The text line without its terminator, the 2-byte sensor word, the duration of a
+    connection gap in milliseconds as text or the number of lost telemetry frames as text. Empty for START,
+    STOP and CORRUPT.
+
+    #### Properties:
+    - `text (str)`: The frame data decoded as text.
+    """
+
+    type: FrameTypes
+    data: bytes = b""
+
+    @property
+    def text(self) -> str:
+        """The frame data decoded as text."""
+        return self.data.decode("latin-1")
+
+
+class FrameParser:
+    """
+    ### FrameParser Class
+
+    Incremental parser for the robot's serial stream. Data can be fed in chunks of any size and all complete
+    frames are returned, while incomplete ones are kept in an internal buffer until the rest arrives.
+
+    The robot sends `\\r\\n` terminated text lines until a `START` line is received. After that, sensor data is
+    sent until the `STOP` bytes are received. With the legacy protocol, each sample is a bare 2-byte word and
+    `STOP` is detected on a word boundary. Once the robot acknowledges the framed protocol with a `PROTOCOL`
+    line, samples are sent in checksummed frames with a sequence number (see `protocol.py`). Their samples
+    are returned as WORD frames, while skipped sequence numbers are reported as LOST frames and frames that
+    fail the checksum as CORRUPT frames. The sequence numbers of corrupt frames are left out of the next LOST
+    frame, so each missing frame is only counted once.
+
+    #### Properties:
+    - `binary (bool)`: Indicates if the parser is receiving binary sensor data.
+    - `protocol (int)`: Version of the telemetry protocol acknowledged by the robot.
+    - `lost_frames (int)`: Number of telemetry frames lost since the parser was reset.
+    - `corrupt_frames (int)`: Number of corrupt telemetry frames since the parser was reset.
+    - `buffered (int)`: Number of bytes waiting for the rest of their frame.
+
+    #### Methods:
+    - `feed(data: bytes) -> list[Frame]`: Adds data to the buffer and returns all complete frames.
+    - `discard() -> None`: Clears the buffer, keeping the current mode.
+    - `reset() -> None`: Clears the buffer and returns to text mode with the legacy protocol.
+    """
+
+    LINE_END = b"\r\n"
+    WORD_SIZE = 2
+
+    _START = SerialInputs.START_SIGNAL.value.encode("latin-1")
+    _STOP = SerialInputs.STOP_SIGNAL.value
+    _PROTOCOL = SerialInputs.PROTOCOL.value.encode("latin-1")
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._binary = False
+        self._protocol = protocol.LEGACY_VERSION
+        self._sequence: int | None = None
+        self._resyncing = False
+        # Corrupt frames since the last valid frame, whose sequence numbers are missing from the next one
+        self._unsequenced = 0
+        self._lost_frames = 0
+        self._corrupt_frames = 0
+
+    @property
+    def binary(self) -> bool:
+        """Indicates if the parser is receiving binary sensor data."""
+        return self._binary
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes waiting for the rest of their frame."""
+        return len(self._buffer)
+
+    @property
+    def protocol(self) -> int:
+        """Version of the telemetry protocol acknowledged by the robot."""
+        return self._protocol
+
+    @property
+    def lost_frames(self) -> int:
+        """Number of telemetry frames lost since the parser was reset."""
+        return self._lost_frames
+
+    @property
+    def corrupt_frames(self) -> int:
+        """Number of corrupt telemetry frames since the parser was reset."""
+        return self._corrupt_frames
+
+    def feed(self, data: bytes) -> list[Frame]:
+        """
+        Add data to the buffer and parse all complete frames.
+
+        Args:
+            data (bytes): The data received from the robot.
+
+        Returns:
+            list[Frame]: The complete frames in the order they were received.
+        """
+        buffer = self._buffer
+        buffer += data
+
+        frames: list[Frame] = []
+        position = 0
+        size = len(buffer)
+
+        while position < size:
+            if not self._binary:
+                end = buffer.find(self.LINE_END, position)
+                if end < 0:
+                    break
+
+                line = bytes(buffer[position:end])
+                position = end + len(self.LINE_END)
+
+                if line == self._START:
+                    self._binary = True
+                    self._sequence = None
+                    self._resyncing = False
+                    self._unsequenced = 0
+                    frames.append(Frame(FrameTypes.START))
+                    continue
+
+                if line.startswith(self._PROTOCOL) and len(line) > len(self._PROTOCOL):
+                    self._protocol = line[-1]
+                frames.append(Frame(FrameTypes.TEXT, line))
+                continue
+
+            if buffer.startswith(self._STOP, position):
+                self._binary = False
+                position += len(self._STOP)
+                frames.append(Frame(FrameTypes.STOP))
+                continue
+
+            available = size - position
+            if available < len(self._STOP) and self._STOP.startswith(buffer[position:]):
+                # Could be the start of the stop signal, wait for the rest
+                break
+
+            if self._protocol >= protocol.FRAMED_VERSION:
+                end = self._parse_frame(buffer, position, frames)
+                if end is None:
+                    break
+
+                position = end
+                continue
+
+            if available < self.WORD_SIZE:
+                break
+
+            end = position + self.WORD_SIZE
+            frames.append(Frame(FrameTypes.WORD, bytes(buffer[position:end])))
+            position = end
+
+        # Removing from the front of a bytearray only moves its start offset
+        del buffer[:position]
+        return frames
+
+    def discard(self) -> None:
+        """Clear the buffer, keeping the current mode."""
+        self._buffer.clear()
+
+    def reset(self) -> None:
+        """Clear the buffer and return to text mode with the legacy protocol."""
+        self._buffer.clear()
+        self._binary = False
+        self._protocol = protocol.LEGACY_VERSION
+        self._sequence = None
+        self._resyncing = False
+        self._unsequenced = 0
+        self._lost_frames = 0
+        self._corrupt_frames = 0
+
+    def _parse_frame(
+        self, buffer: bytearray, position: int, frames: list[Frame]
+    ) -> int | None:
+        """
+        Parse a telemetry frame of the framed protocol.
+
+        Returns:
+            int | None: The position after the frame or the skipped bytes, or None to wait for more data.
+        """
+        size = len(buffer)
+
+        if not buffer.startswith(protocol.SYNC, position):
+            if size - position < len(protocol.SYNC) and protocol.SYNC.startswith(
+                buffer[position:]
+            ):
+                return None
+
+            return self._resync(buffer, position + 1, frames)
+
+        if size - position < protocol.HEADER.size:
+            return None
+
+        _, sequence, samples = protocol.HEADER.unpack_from(buffer, position)
+        if samples > protocol.MAX_FRAME_SAMPLES:
+            # Waiting for a corrupted count of samples could hold back the frames and stop signal behind it
+            return self._resync(buffer, position + 1, frames)
+
+        end = position + protocol.frame_size(samples)
+        if size < end:
+            return None
+
+        body_start = position + len(protocol.SYNC)
+        crc_start = end - protocol.CRC.size
+        (crc,) = protocol.CRC.unpack_from(buffer, crc_start)
+
+        if protocol.crc16(memoryview(buffer)[body_start:crc_start]) != crc:
+            return self._resync(buffer, position + 1, frames)
+
+        if self._sequence is not None:
+            missing = (sequence - self._sequence - 1) % protocol.SEQUENCE_MODULO
+            lost = missing - self._unsequenced
+            if lost > 0:
+                self._lost_frames += lost
+                frames.append(Frame(FrameTypes.LOST, str(lost).encode()))
+        self._sequence = sequence
+        self._resyncing = False
+        self._unsequenced = 0
+
+        for start in range(position + protocol.HEADER.size, crc_start, self.WORD_SIZE):
+            frames.append(
+                Frame(FrameTypes.WORD, bytes(buffer[start : start + self.WORD_SIZE]))
+            )
+
+        return end
+
+    def _resync(self, buffer: bytearray, position: int, frames: list[Frame]) -> int:
+        """
+        Report a corrupt frame and get the position of the next possible frame or stop signal. Bytes skipped
+        until a valid frame is found are part of the same corrupt frame.
+        """
+        if not self._resyncing:
+            self._resyncing = True
+            self._corrupt_frames += 1
+            self._unsequenced += 1
+            frames.append(Frame(FrameTypes.CORRUPT))
+
+        candidates = [
+            index
+            for index in (
+                buffer.find(protocol.SYNC[:1], position),
+                buffer.find(self._STOP[:1], position),
+            )
+            if index >= 0
+        ]
+        return min(candidates, default=len(buffer))
@@ -0,0 +1,118 @@
+import os
+import sys
+from collections.abc import Callable
+
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QThreadPool, QTimer, pyqtSignal
+
+from utils import SerialConfig
+
+
+class PortRegistry(QObject):
+    """
+    ### PortRegistry Class
+
+    Keeps a cached list of the available serial ports, so it can be read without enumerating the system's
+    devices. The list is refreshed when device nodes are added or removed from `/dev` on Linux, or by
+    scanning periodically in a background thread on other systems. Inherits from QObject to use signals and slots.
+
+    #### Parameters:
+    - `scan (Callable[[], list[str]])`: Function that enumerates the available serial ports.
+
+    #### Signals:
+    - `ports_change`: Signal emitted when the list of available ports changes.
+
+    #### Properties:
+    - `ports (list[str])`: Cached list of available serial ports.
+
+    #### Methods:
+    - `refresh() -> bool`: Enumerates the available ports and updates the cached list.
+    """
+
+    ports_change = pyqtSignal()
+    _scanned = pyqtSignal(object)
+
+    DEVICES_DIR = "/dev"
+
+    def __init__(self, scan: Callable[[], list[str]]) -> None:
+        super().__init__()
+        self._scan = scan
+        self._ports = scan()
+        self._scanning = False
+        # Emitted from the thread pool, so the result is delivered to this thread through the event loop
+        self._scanned.connect(self._scan_finished)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(SerialConfig.PORT_REFRESH_DELAY)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+        if sys.platform.startswith("linux") and os.path.isdir(self.DEVICES_DIR):
+            self._watch_devices()
+        else:
+            self._scan_periodically()
+
+    @property
+    def ports(self) -> list[str]:
+        """Cached list of available serial ports."""
+        return list(self._ports)
+
+    def refresh(self) -> bool:
+        """
+        Enumerate the available ports and update the cached list.
+
+        Returns:
+            bool: True if the list of ports changed, False otherwise.
+        """
+        return self._update(self._scan())
+
+    def _update(self, ports: list[str] | None) -> bool:
+        """
+        Update the cached list of ports, emitting `ports_change` if it changed.
+
+        Args:
+            ports (list[str] | None): Available ports, or None if they couldn't be enumerated.
+
+        Returns:
+            bool: True if the list of ports changed, False otherwise.
+        """
+        if ports is None or ports == self._ports:
+            return False
+
+        self._ports = ports
+        self.ports_change.emit()
+        return True
+
+    def _watch_devices(self) -> None:
+        """Refresh the ports when the contents of the devices directory change."""
+        self._watcher = QFileSystemWatcher([self.DEVICES_DIR], self)
+        # Device nodes and their links are created in bursts, so refresh once after they settle
+        self._watcher.directoryChanged.connect(lambda _: self._refresh_timer.start())
+
+    def _scan_periodically(self) -> None:
+        """Refresh the ports at a fixed interval when device changes can't be watched."""
+        self._scan_timer = QTimer(self)
+        self._scan_timer.setInterval(SerialConfig.PORT_SCAN_INTERVAL)
+        self._scan_timer.timeout.connect(self._scan_in_background)
+        self._scan_timer.start()
+
+    def _scan_in_background(self) -> None:
+        """Enumerate the ports in the global thread pool, unless a previous scan is still running."""
+        if self._scanning:
+            return
+
+        self._scanning = True
+        QThreadPool.globalInstance().start(self._run_scan)
+
+    def _run_scan(self) -> None:
+        """Enumerate the ports in a pool thread and emit the result, or None if the scan failed."""
+        try:
+            ports = self._scan()
+        except Exception as e:
+            print(f"Error scanning serial ports: {e}")
+            ports = None
+        self._scanned.emit(ports)
+
+    def _scan_finished(self, ports: list[str] | None) -> None:
+        """Update the cached list with the result of a background scan."""
+        self._scanning = False
+        self._update(ports)
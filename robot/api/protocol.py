@@ -0,0 +1,68 @@
+import binascii
+import struct
+from collections.abc import Sequence
+
+LEGACY_VERSION = 1
+FRAMED_VERSION = 2
+
+SYNC = b"\xa5\x5a"
+# Sync bytes, sequence number and number of samples in the frame
+HEADER = struct.Struct(">2sHB")
+CRC = struct.Struct(">H")
+SAMPLE_SIZE = 2
+# Largest number of samples the robot sends in a frame, frames with a larger count are treated as corrupt
+MAX_FRAME_SAMPLES = 32
+SEQUENCE_MODULO = 1 << 16
+
+_CRC_INITIAL = 0xFFFF
+
+
+def crc16(data: bytes | bytearray | memoryview) -> int:
+    """
+    Compute the CRC-16/CCITT-FALSE checksum used by the framed telemetry protocol.
+
+    Args:
+        data (bytes | bytearray | memoryview): The data to checksum.
+
+    Returns:
+        int: The 16-bit checksum.
+    """
+    return binascii.crc_hqx(data, _CRC_INITIAL)
+
+
+def frame_size(samples: int) -> int:
+    """
+    Get the size in bytes of a telemetry frame.
+
+    Args:
+        samples (int): The number of samples in the frame.
+
+    Returns:
+        int: The size of the frame, including its header and checksum.
+    """
+    return HEADER.size + samples * SAMPLE_SIZE + CRC.size
+
+
+def encode_frame(sequence: int, words: Sequence[int]) -> bytes:
+    """
+    Encode sensor words into a telemetry frame of the framed protocol.
+
+    A frame is made of the `SYNC` bytes, a 16-bit sequence number, the number of samples, the samples as
+    big-endian 16-bit words and a CRC-16 of everything after the sync bytes. All fields are big-endian.
+
+    Args:
+        sequence (int): The sequence number of the frame, wrapped to 16 bits.
+        words (Sequence[int]): The 16-bit sensor words, at most `MAX_FRAME_SAMPLES`.
+
+    Raises:
+        ValueError: If there are more than `MAX_FRAME_SAMPLES` words.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    if len(words) > MAX_FRAME_SAMPLES:
+        raise ValueError(f"A frame can't have more than {MAX_FRAME_SAMPLES} samples.")
+
+    header = HEADER.pack(SYNC, sequence % SEQUENCE_MODULO, len(words))
+    body = header[len(SYNC) :] + struct.pack(f">{len(words)}H", *words)
+    return SYNC + body + CRC.pack(crc16(body))
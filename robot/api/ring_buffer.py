@@ -0,0 +1,141 @@
+import threading
+
+
+class RingBuffer:
+    """
+    ### RingBuffer Class
+
+    Preallocated byte ring for passing received data from a single producer thread to a single consumer
+    thread. The producer only moves the write position and the consumer only moves the read position, so
+    no lock is needed. When a chunk doesn't fit in the free space it is dropped whole and counted as an
+    overflow, so the producer never blocks or overwrites data the consumer has not read.
+
+    #### Parameters:
+    - `capacity (int)`: Size of the ring in bytes.
+
+    #### Properties:
+    - `capacity (int)`: Size of the ring in bytes.
+    - `fill (int)`: Number of bytes waiting to be read.
+    - `written (int)`: Total number of bytes written since the ring was created.
+    - `read_position (int)`: Total number of bytes read since the ring was created.
+    - `overflows (int)`: Number of chunks dropped because the ring was full.
+    - `dropped (int)`: Number of bytes dropped because the ring was full.
+
+    #### Methods:
+    - `write(data: bytes) -> bool`: Copies a chunk into the ring. Producer only.
+    - `read(size: int | None = None) -> bytes`: Takes up to `size` bytes from the ring. Consumer only.
+    - `wait(timeout: float) -> bool`: Blocks until there is data to read or the timeout expires. Consumer only.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._capacity = capacity
+
+        self._written = 0
+        self._read = 0
+        self._overflows = 0
+        self._dropped = 0
+        self._readable = threading.Event()
+
+    @property
+    def capacity(self) -> int:
+        """Size of the ring in bytes."""
+        return self._capacity
+
+    @property
+    def fill(self) -> int:
+        """Number of bytes waiting to be read."""
+        return self._written - self._read
+
+    @property
+    def written(self) -> int:
+        """Total number of bytes written since the ring was created."""
+        return self._written
+
+    @property
+    def read_position(self) -> int:
+        """Total number of bytes read since the ring was created."""
+        return self._read
+
+    @property
+    def overflows(self) -> int:
+        """Number of chunks dropped because the ring was full."""
+        return self._overflows
+
+    @property
+    def dropped(self) -> int:
+        """Number of bytes dropped because the ring was full."""
+        return self._dropped
+
+    def write(self, data: bytes) -> bool:
+        """
+        Copy a chunk into the ring. Must only be called from the producer thread.
+
+        Args:
+            data (bytes): The data to write.
+
+        Returns:
+            bool: True if the chunk was written, False if it was dropped because the ring was full.
+        """
+        size = len(data)
+        if size > self._capacity - self.fill:
+            self._overflows += 1
+            self._dropped += size
+            return False
+
+        start = self._written % self._capacity
+        first = min(size, self._capacity - start)
+        self._view[start : start + first] = data[:first]
+        self._view[: size - first] = data[first:]
+
+        # Publish the data only after it is copied
+        self._written += size
+        self._readable.set()
+        return True
+
+    def read(self, size: int | None = None) -> bytes:
+        """
+        Take data from the ring. Must only be called from the consumer thread.
+
+        Args:
+            size (int | None, optional): Maximum number of bytes to take. Defaults to all available bytes.
+
+        Returns:
+            bytes: The data taken, empty if the ring is empty.
+        """
+        available = self.fill
+        if size is not None:
+            available = min(available, size)
+        if available <= 0:
+            return b""
+
+        start = self._read % self._capacity
+        first = min(available, self._capacity - start)
+        data = bytes(self._view[start : start + first])
+        if first < available:
+            data += self._view[: available - first]
+
+        self._read += available
+        return data
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until there is data to read or the timeout expires. Must only be called from the consumer thread.
+
+        Args:
+            timeout (float): Maximum time to wait in seconds.
+
+        Returns:
+            bool: True if there is data to read, False otherwise.
+        """
+        if self.fill:
+            return True
+
+        self._readable.clear()
+        # Check again in case the producer wrote between the first check and clearing the event
+        if self.fill:
+            return True
+
+        self._readable.wait(timeout)
+        return self.fill > 0
@@ -0,0 +1,90 @@
+import threading
+import time
+from collections.abc import Callable
+
+from utils import SerialConfig
+
+
+class CommandQueue:
+    """
+    ### CommandQueue Class
+
+    Transmit queue for command messages. Messages are written from a background thread, batching all
+    pending commands into a single write and pacing the writes so the robot's receive buffer is not
+    overrun. A pending message is replaced when a new value for the same command is queued, moving it
+    to the end of the queue.
+
+    #### Parameters:
+    - `write (Callable[[bytes], None])`: Function used to write a batch of messages to the robot.
+    - `batch_size (int)`: Maximum number of messages written at once.
+    - `interval (float)`: Time in seconds to wait between writes.
+
+    #### Properties:
+    - `pending (int)`: Number of messages waiting to be sent.
+
+    #### Methods:
+    - `put(message: bytes) -> None`: Queues a command message to be sent.
+    - `clear() -> None`: Discards all pending messages.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[bytes], None],
+        batch_size: int = SerialConfig.TX_BATCH_SIZE,
+        interval: float = SerialConfig.TX_INTERVAL,
+    ) -> None:
+        self._write = write
+        self._batch_size = batch_size
+        self._interval = interval
+
+        self._pending: dict[bytes, bytes] = {}
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be sent."""
+        return len(self._pending)
+
+    def put(self, message: bytes) -> None:
+        """
+        Queue a command message to be sent, replacing any pending message for the same command.
+
+        Args:
+            message (bytes): The command message, as created by `Messages.COMMAND`.
+        """
+        command = message[:1]
+
+        with self._condition:
+            self._pending.pop(command, None)
+            self._pending[command] = message
+            self._start_thread()
+            self._condition.notify()
+
+    def clear(self) -> None:
+        """Discard all pending messages."""
+        with self._condition:
+            self._pending.clear()
+
+    def _start_thread(self) -> None:
+        """Start the transmit thread if it is not running."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, name="CommandQueue", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Write pending messages in batches until the program exits."""
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+
+                commands = list(self._pending)[: self._batch_size]
+                batch = b"".join(self._pending.pop(command) for command in commands)
+
+            self._write(batch)
+            time.sleep(self._interval)
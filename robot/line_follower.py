@@ -1,6 +1,8 @@
+from enum import Enum
+
 from PyQt6.QtCore import QObject, pyqtSignal
 
-from utils import RobotStates, RunningModes, SerialInputs, StopModes
+from utils import RobotStates, RunningModes, SerialInputs, StopModes, ValueHistory
 
 from .api import BluetoothApi
 
@@ -11,18 +13,45 @@ class StateChanger(QObject):
 
     Handles state changes and emit signals. Inherits from QObject to use signals and slots.
 
+    Each field of the `LineFollower` has its own signal, emitted with the new value and its text for display only
+    when an update actually changes it, so widgets can subscribe to the fields they show and repeated values cost
+    nothing.
+
     #### Signals:
-    - `state_change`: Signal emitted when the state changes.
+    - `battery_change (int, str)`: Signal emitted when the battery reading changes.
+    - `kp_change (int, str)`: Signal emitted when the proportional gain changes.
+    - `ki_change (int, str)`: Signal emitted when the integral gain changes.
+    - `kd_change (int, str)`: Signal emitted when the derivative gain changes.
+    - `kff_change (int, str)`: Signal emitted when the feedforward gain changes.
+    - `kb_change (int, str)`: Signal emitted when the brake gain changes.
+    - `base_pwm_change (int, str)`: Signal emitted when the base PWM value changes.
+    - `max_pwm_change (int, str)`: Signal emitted when the maximum PWM value changes.
+    - `state_change (RobotStates, str)`: Signal emitted when the state changes.
+    - `running_mode_change (RunningModes, str)`: Signal emitted when the running mode changes.
+    - `stop_mode_change (StopModes, str)`: Signal emitted when the stop mode changes.
+    - `laps_change (int, str)`: Signal emitted when the number of laps changes.
+    - `stop_time_change (int, str)`: Signal emitted when the stop time changes.
+    - `log_data_change (bool, str)`: Signal emitted when data logging is enabled or disabled.
     """
 
-    state_change = pyqtSignal()
+    battery_change = pyqtSignal(object, str)
+    kp_change = pyqtSignal(object, str)
+    ki_change = pyqtSignal(object, str)
+    kd_change = pyqtSignal(object, str)
+    kff_change = pyqtSignal(object, str)
+    kb_change = pyqtSignal(object, str)
+    base_pwm_change = pyqtSignal(object, str)
+    max_pwm_change = pyqtSignal(object, str)
+    state_change = pyqtSignal(object, str)
+    running_mode_change = pyqtSignal(object, str)
+    stop_mode_change = pyqtSignal(object, str)
+    laps_change = pyqtSignal(object, str)
+    stop_time_change = pyqtSignal(object, str)
+    log_data_change = pyqtSignal(object, str)
 
     def __init__(self):
         super().__init__()
 
-    def signal_state_change(self) -> None:
-        self.state_change.emit()
-
 
 class LineFollower:
     """
@@ -31,13 +60,18 @@ class LineFollower:
     Singleton class that manages the state of the line follower robot. It handles configuration updates and
     communicates with the robot via Bluetooth. Should be updated with the latest configuration values.
 
+    The configuration is an observable store: each update is compared with the current value, and the field's
+    signal in `state_changer` is only emitted when the value actually changes. Every field starts as None until
+    the robot sends it, so its first update always counts as a change. Every update is also recorded with its
+    time in a fixed-size `ValueHistory` per field, to look up past values without the log files.
+
     #### Attributes:
     - `BATTERY_CELLS (int)`: Number of battery cells.
     - `CELL_MAX_VOLTAGE (float)`: Maximum voltage of a single battery cell.
 
     #### Properties:
     - `is_running (bool)`: Indicates if the robot is currently running.
-    - `state_changer (StateChanger)`: Instance of StateChanger for handling state changes.
+    - `state_changer (StateChanger)`: Instance of StateChanger with the change signal of each field.
     - `bluetooth (BluetoothApi)`: Instance of BluetoothApi for Bluetooth communication.
     - `battery (float | None)`: Current battery voltage.
     - `kp (int | None)`: Proportional gain for PID controller.
@@ -50,15 +84,40 @@ class LineFollower:
     - `state (RobotStates | None)`: Current state of the robot.
     - `running_mode (RunningModes | None)`: Current running mode of the robot.
     - `stop_mode (StopModes | None)`: Current stop mode of the robot.
-    - `laps (int)`: Number of laps completed.
-    - `stop_time (int)`: Time to stop the robot.
-    - `log_data (bool)`: Indicates if data logging is enabled.
+    - `laps (int | None)`: Number of laps completed.
+    - `stop_time (int | None)`: Time to stop the robot.
+    - `log_data (bool | None)`: Indicates if data logging is enabled.
 
     #### Methods:
     - `get_battery_voltage(byte: int) -> float`: Converts a byte value to battery voltage.
-    - `update_config(command: SerialInputs, value: int) -> None`: Updates the configuration of the robot based on the command received.
+    - `update_config(command: SerialInputs, value: int, timestamp: int | None = None, display: str = "") -> bool`: Updates the configuration of the robot based on the command received.
+    - `history(command: SerialInputs) -> ValueHistory | None`: Gets the recorded updates of a configuration field.
+    - `config_snapshot() -> dict`: Gets the current configuration of the robot.
     """
 
+    __slots__ = (
+        "_initialized",
+        "_state_changer",
+        "_bluetooth",
+        "_battery",
+        "_kp",
+        "_ki",
+        "_kd",
+        "_kff",
+        "_kb",
+        "_base_pwm",
+        "_max_pwm",
+        "_state",
+        "_running_mode",
+        "_stop_mode",
+        "_laps",
+        "_stop_time",
+        "_log_data",
+        "_config_map",
+        "_signals",
+        "_histories",
+    )
+
     _instance = None
 
     BATTERY_CELLS = 2
@@ -72,7 +131,6 @@ class LineFollower:
     def __init__(self):
         if not hasattr(self, "_initialized"):
             self._state_changer = StateChanger()
-            self._is_running = False
 
             self._battery = None
             self._kp = None
@@ -85,31 +143,58 @@ class LineFollower:
             self._state = None
             self._running_mode = None
             self._stop_mode = None
-            self._laps = 0
-            self._stop_time = 0
-            self._log_data = False
+            self._laps = None
+            self._stop_time = None
+            self._log_data = None
 
             self._bluetooth = BluetoothApi()
             self._initialized = True
 
+            # Field and conversion from the received byte of each configuration command
             self._config_map = {
-                SerialInputs.BATTERY: self._update_battery,
-                SerialInputs.KP: self._update_kp,
-                SerialInputs.KI: self._update_ki,
-                SerialInputs.KD: self._update_kd,
-                SerialInputs.BASE_PWM: self._update_base_pwm,
-                SerialInputs.MAX_PWM: self._update_max_pwm,
-                SerialInputs.STATE: self._update_state,
-                SerialInputs.RUNNING_MODE: self._update_running_mode,
-                SerialInputs.STOP_MODE: self._update_stop_mode,
-                SerialInputs.LAPS: self._update_laps,
-                SerialInputs.STOP_TIME: self._update_stop_time,
+                SerialInputs.BATTERY: ("_battery", int),
+                SerialInputs.KP: ("_kp", int),
+                SerialInputs.KI: ("_ki", int),
+                SerialInputs.KD: ("_kd", int),
+                SerialInputs.KFF: ("_kff", int),
+                SerialInputs.KB: ("_kb", int),
+                SerialInputs.BASE_PWM: ("_base_pwm", int),
+                SerialInputs.MAX_PWM: ("_max_pwm", int),
+                SerialInputs.STATE: ("_state", RobotStates),
+                SerialInputs.RUNNING_MODE: ("_running_mode", RunningModes),
+                SerialInputs.STOP_MODE: ("_stop_mode", StopModes),
+                SerialInputs.LAPS: ("_laps", int),
+                SerialInputs.STOP_TIME: ("_stop_time", int),
+                SerialInputs.LOG_DATA: ("_log_data", lambda value: value == 1),
+            }
+
+            changer = self._state_changer
+            self._signals = {
+                "_battery": changer.battery_change,
+                "_kp": changer.kp_change,
+                "_ki": changer.ki_change,
+                "_kd": changer.kd_change,
+                "_kff": changer.kff_change,
+                "_kb": changer.kb_change,
+                "_base_pwm": changer.base_pwm_change,
+                "_max_pwm": changer.max_pwm_change,
+                "_state": changer.state_change,
+                "_running_mode": changer.running_mode_change,
+                "_stop_mode": changer.stop_mode_change,
+                "_laps": changer.laps_change,
+                "_stop_time": changer.stop_time_change,
+                "_log_data": changer.log_data_change,
+            }
+
+            self._histories = {
+                command: ValueHistory(convert=convert)
+                for command, (_, convert) in self._config_map.items()
             }
 
     @property
     def is_running(self) -> bool:
         """Indicates if the robot is currently running."""
-        return self._is_running
+        return self._state == RobotStates.RUNNING
 
     @property
     def state_changer(self) -> StateChanger:
@@ -177,17 +262,17 @@ class LineFollower:
         return self._stop_mode
 
     @property
-    def laps(self) -> int:
+    def laps(self) -> int | None:
         """Number of laps completed."""
         return self._laps
 
     @property
-    def stop_time(self) -> int:
+    def stop_time(self) -> int | None:
         """Time to stop the robot."""
         return self._stop_time
 
     @property
-    def log_data(self) -> bool:
+    def log_data(self) -> bool | None:
         """Indicates if data logging is enabled."""
         return self._log_data
 
@@ -210,65 +295,81 @@ class LineFollower:
         )
         return round(voltage, 2)
 
-    def update_config(self, command: SerialInputs, value: int) -> None:
+    def config_snapshot(self) -> dict:
         """
-        Updates the configuration of the robot based on the command received.
+        Get the current configuration of the robot, with enum values by name.
 
-        Args:
-            command (SerialInputs): The command to be executed.
-            value (int): The value associated with the command.
+        Returns:
+            dict: The value of each configuration field, or None if it is unknown.
         """
-        if command not in self._config_map:
-            return
-
-        self._config_map[command](value)
-
-    def _update_battery(self, battery: int) -> None:
-        """Updates the battery voltage."""
-        self._battery = battery
-
-    def _update_kp(self, kp: int) -> None:
-        """Updates the proportional gain for PID controller."""
-        self._kp = kp
-
-    def _update_ki(self, ki: int) -> None:
-        """Updates the integral gain for PID controller."""
-        self._ki = ki
-
-    def _update_kd(self, kd: int) -> None:
-        """Updates the derivative gain for PID controller."""
-        self._kd = kd
-
-    def _update_base_pwm(self, base_pwm: int) -> None:
-        """Updates the base PWM value for motor control."""
-        self._base_pwm = base_pwm
-
-    def _update_max_pwm(self, max_pwm: int) -> None:
-        """Updates the maximum PWM value for motor control."""
-        self._max_pwm = max_pwm
-
-    def _update_state(self, state: int) -> None:
-        """Updates the state of the robot."""
-        self._state = RobotStates(state)
-        self._is_running = state == RobotStates.RUNNING
-        self._state_changer.signal_state_change()
-
-    def _update_running_mode(self, mode: int) -> None:
-        """Updates the running mode of the robot."""
-        self._running_mode = RunningModes(mode)
+        snapshot = {
+            "battery": self._battery,
+            "kp": self._kp,
+            "ki": self._ki,
+            "kd": self._kd,
+            "kff": self._kff,
+            "kb": self._kb,
+            "base_pwm": self._base_pwm,
+            "max_pwm": self._max_pwm,
+            "state": self._state,
+            "running_mode": self._running_mode,
+            "stop_mode": self._stop_mode,
+            "laps": self._laps,
+            "stop_time": self._stop_time,
+            "log_data": self._log_data,
+        }
+
+        return {
+            field: value.name if isinstance(value, Enum) else value
+            for field, value in snapshot.items()
+        }
+
+    def history(self, command: SerialInputs) -> ValueHistory | None:
+        """
+        Gets the recorded updates of a configuration field.
 
-    def _update_stop_mode(self, mode: int) -> None:
-        """Updates the stop mode of the robot."""
-        self._stop_mode = StopModes(mode)
+        Args:
+            command (SerialInputs): The command that updates the field.
 
-    def _update_laps(self, laps: int) -> None:
-        """Updates the number of laps completed."""
-        self._laps = laps
+        Returns:
+            ValueHistory | None: The history of the field, or None if the command doesn't update one.
+        """
+        return self._histories.get(command)
+
+    def update_config(
+        self,
+        command: SerialInputs,
+        value: int,
+        timestamp: int | None = None,
+        display: str = "",
+    ) -> bool:
+        """
+        Updates the configuration of the robot based on the command received, recording the update in the
+        field's history and emitting its change signal if its value changed.
 
-    def _update_stop_time(self, stop_time: int) -> None:
-        """Updates the time to stop the robot."""
-        self._stop_time = stop_time
+        Args:
+            command (SerialInputs): The command to be executed.
+            value (int): The value associated with the command.
+            timestamp (int | None): The time of the update from `time.monotonic_ns`, now if None.
+            display (str): The value formatted for display, emitted with the change signal. Defaults to the
+                converted value, by name for enums.
 
-    def _set_log_data(self, log_data: int) -> None:
-        """Sets the log data flag."""
-        self._log_data = log_data == 1
+        Returns:
+            bool: True if the value of the field changed, False otherwise.
+        """
+        entry = self._config_map.get(command)
+        if entry is None:
+            return False
+
+        self._histories[command].append(value, timestamp)
+
+        field, convert = entry
+        value = convert(value)
+        if getattr(self, field) == value:
+            return False
+
+        setattr(self, field, value)
+        if not display:
+            display = value.name if isinstance(value, Enum) else str(value)
+        self._signals[field].emit(value, display)
+        return True
@@ -0,0 +1,313 @@
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import tempfile
+import time
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+from virtual_robot import VirtualRobot, sensor_word
+
+from gui.ui.widgets.home.listener.listener import ListenerWidget
+from gui.workers import SensorSample, TelemetryEvent
+from robot import LineFollower
+from utils import (
+    Booleans,
+    Files,
+    Messages,
+    RobotStates,
+    SerialConfig,
+    SerialOutputs,
+    read_session,
+)
+
+DEFAULT_RATES = [250, 500, 1000, 2000, 4000, 8000, 16000, 32000]
+# Time in seconds given to the robot to echo the setup commands
+SETUP_TIME = 0.5
+# Interval in milliseconds between checks for the end of a session
+CHECK_INTERVAL = 10
+
+
+def run_robot(rate: float, samples: int, connection: Connection) -> None:
+    """Run a virtual robot in a separate process so it doesn't share CPU time with the app."""
+    robot = VirtualRobot(rate, samples)
+    connection.send(robot.port)
+    robot.start()
+
+    connection.recv()
+    connection.send(
+        {"sent": robot.sent_samples, "dropped": robot.dropped_samples},
+    )
+    robot.stop()
+
+
+class TelemetryBenchmark:
+    """
+    ### TelemetryBenchmark Class
+
+    Drives the full acquisition path of the app, from the `BluetoothApi` through the listener worker and the
+    log files to the `ListenerWidget` display, with a virtual robot streaming sensor data at a given rate.
+
+    #### Parameters:
+    - `app (QApplication)`: The application whose event loop delivers the worker's signals.
+    - `trace (bool)`: Record the latency of each stage of the pipeline and add it to the results.
+
+    #### Methods:
+    - `run(rate: float, duration: float) -> dict`: Runs one logging session and returns its results.
+    """
+
+    def __init__(self, app: QApplication, trace: bool = False) -> None:
+        self._app = app
+        self._line_follower = LineFollower()
+        self._listener = ListenerWidget()
+        self._trace = trace
+        self._line_follower.bluetooth.tracer.enabled = trace
+
+        self._displayed = 0
+        self._batches = 0
+        self._states: list[RobotStates | None] = []
+
+        self._listener.worker.output.connect(self._count_output)
+        self._line_follower.state_changer.state_change.connect(
+            lambda: self._states.append(self._line_follower.state)
+        )
+
+    def run(self, rate: float, duration: float) -> dict:
+        """
+        Run a logging session at the given rate and measure the acquisition path.
+
+        Args:
+            rate (float): Number of sensor samples sent per second.
+            duration (float): Duration of the session in seconds.
+
+        Returns:
+            dict: The results of the session.
+        """
+        samples = int(rate * duration)
+        context = multiprocessing.get_context("spawn")
+        connection, robot_connection = context.Pipe()
+        robot = context.Process(
+            target=run_robot, args=(rate, samples, robot_connection)
+        )
+        robot.start()
+
+        self._connect(connection.recv())
+        self._setup_logging()
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+
+        finished = self._run_session(timeout=duration * 3 + 5)
+        log_writer = self._listener.worker.log_writer
+        self._pump(1, lambda: log_writer.queue_depth == 0)
+
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+        # The high-water mark of the whole process, which includes the GUI and the earlier runs
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        connection.send(None)
+        robot_stats = connection.recv()
+        robot.join()
+        self._line_follower.bluetooth.disconnect_serial()
+
+        logged, aligned = self._check_log(robot_stats["sent"])
+        received = max(robot_stats["sent"], 1)
+
+        results = {
+            "rate": rate,
+            "samples": samples,
+            "sent": robot_stats["sent"],
+            "dropped_by_robot": robot_stats["dropped"],
+            "logged": logged,
+            "displayed": self._displayed,
+            "output_batches": self._batches,
+            "output_batch_rate": round(self._batches / wall_time, 1),
+            "aligned": aligned,
+            "finished": finished,
+            "wall_time_s": round(wall_time, 3),
+            "cpu_percent": round(100 * cpu_time / wall_time, 1),
+            "cpu_us_per_sample": round(1e6 * cpu_time / received, 2),
+            "peak_rss_kb": peak_rss,
+            "log_max_queue_depth": log_writer.max_queue_depth,
+            "log_max_write_latency_ms": round(log_writer.max_write_latency * 1000, 2),
+        }
+        if self._trace:
+            results["latency_ms"] = self._line_follower.bluetooth.tracer.stats()
+        results["passed"] = (
+            finished
+            and aligned
+            and robot_stats["dropped"] == 0
+            and logged == samples
+            and self._displayed == samples
+        )
+        return results
+
+    def _connect(self, port: str) -> None:
+        """Connect to the virtual robot's port."""
+        os.environ[SerialConfig.PORTS_ENV] = port
+        bluetooth = self._line_follower.bluetooth
+        bluetooth.refresh_ports()
+
+        if not bluetooth.set_com_port(port) and bluetooth.port != port:
+            raise RuntimeError(f"Could not select port {port}")
+        if not bluetooth.connect_serial():
+            raise RuntimeError(f"Could not connect to port {port}")
+
+    def _setup_logging(self) -> None:
+        """Clear the log files and enable logging on the robot."""
+        open(Files.TEXT_FILE, "w").close()
+
+        self._line_follower.bluetooth.send_command(
+            Messages.COMMAND(SerialOutputs.SET_LOG_DATA, bytes([Booleans.ON.value]))
+        )
+        self._pump(SETUP_TIME)
+
+    def _run_session(self, timeout: float) -> bool:
+        """Start the robot and process events until it reports it is idle again."""
+        self._displayed = 0
+        self._batches = 0
+        self._states.clear()
+        self._line_follower.bluetooth.tracer.reset()
+        self._line_follower.bluetooth.send_command(Messages.START_SIGNAL)
+
+        return self._pump(timeout, self._session_finished)
+
+    def _session_finished(self) -> bool:
+        """Check if the robot went back to idle after running."""
+        if RobotStates.RUNNING not in self._states:
+            return False
+
+        running = self._states.index(RobotStates.RUNNING)
+        return RobotStates.IDLE in self._states[running:]
+
+    def _pump(
+        self, timeout: float, condition: Callable[[], bool] = lambda: False
+    ) -> bool:
+        """Run the event loop until the condition is met or the timeout expires."""
+        loop = QEventLoop()
+        deadline = time.perf_counter() + timeout
+
+        def check() -> None:
+            if condition() or time.perf_counter() >= deadline:
+                loop.quit()
+
+        timer = QTimer()
+        timer.setInterval(CHECK_INTERVAL)
+        timer.timeout.connect(check)
+        timer.start()
+        loop.exec()
+        timer.stop()
+
+        return condition()
+
+    def _count_output(self, batch: list[TelemetryEvent], _: int) -> None:
+        """Count the sensor samples delivered to the GUI thread."""
+        self._displayed += sum(type(event) is SensorSample for event in batch)
+        self._batches += 1
+
+    def _check_log(self, sent: int) -> tuple[int, bool]:
+        """Get the number of logged samples and check they match the samples sent by the robot."""
+        _, records = read_session(self._listener.worker.session_dir)
+        data = records["word"].astype(">u2").tobytes()
+
+        expected = b"".join(sensor_word(i).to_bytes(2, "big") for i in range(sent))
+        return len(data) // 2, data == expected
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the telemetry acquisition path with a virtual robot."
+    )
+    parser.add_argument(
+        "--rates",
+        type=float,
+        nargs="+",
+        default=DEFAULT_RATES,
+        help="Sample rates to test, in samples per second.",
+    )
+    parser.add_argument(
+        "--duration", type=float, default=3, help="Duration of each session in seconds."
+    )
+    parser.add_argument(
+        "--output",
+        default=Files.BENCHMARK_FILE,
+        help="Path of the JSON file to save the results to.",
+    )
+    parser.add_argument(
+        "--keep-going",
+        action="store_true",
+        help="Keep testing higher rates after a rate fails.",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Record the latency of each stage of the telemetry pipeline.",
+    )
+    args = parser.parse_args()
+
+    output = Path(args.output).resolve()
+    app = QApplication([])
+
+    # Run in a temporary directory so existing logs are not overwritten
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        os.makedirs(Path(Files.BINARY_FILE).parent, exist_ok=True)
+
+        benchmark = TelemetryBenchmark(app, args.trace)
+        sessions = []
+
+        for rate in sorted(args.rates):
+            results = benchmark.run(rate, args.duration)
+            sessions.append(results)
+
+            status = "ok" if results["passed"] else "FAILED"
+            print(
+                f"{rate:>8g} samples/s: {status:<6}  "
+                f"logged {results['logged']}/{results['samples']}  "
+                f"displayed {results['displayed']}  "
+                f"{results['cpu_us_per_sample']} us/sample  "
+                f"{results['cpu_percent']}% CPU"
+            )
+
+            for stage, latency in results.get("latency_ms", {}).items():
+                print(
+                    f"{'':>10}{stage:<8} p50 {latency['p50']:.3f} ms  "
+                    f"p99 {latency['p99']:.3f} ms  max {latency['max']:.3f} ms"
+                )
+
+            if not results["passed"] and not args.keep_going:
+                break
+
+    passed = [session["rate"] for session in sessions if session["passed"]]
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "duration_s": args.duration,
+        "max_sustained_rate": max(passed, default=0),
+        "sessions": sessions,
+    }
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=4))
+
+    print(f"Maximum sustained rate: {report['max_sustained_rate']:g} samples/s")
+    print(f"Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,100 +4,147 @@ from pathlib import Path
 # Add the project root to sys.path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
+import asyncio
 import time
 
 import serial
 
-from utils import Files, SerialConfig, SerialInputs
+from robot.api import AsyncBluetoothApi, FrameTypes
+from utils import (
+    SESSION_RECORD,
+    Files,
+    Messages,
+    RobotStates,
+    RunningModes,
+    SerialConfig,
+    SerialInputs,
+    StopModes,
+    decode_word,
+    encode_session_header,
+    new_session_dir,
+    prune_sessions,
+    session_file,
+)
+
+# Field and conversion of each configuration value, as saved in the session header by the app
+CONFIG_FIELDS = {
+    SerialInputs.BATTERY: ("battery", int),
+    SerialInputs.KP: ("kp", int),
+    SerialInputs.KI: ("ki", int),
+    # The maximum byte stands for a KD of 1000
+    SerialInputs.KD: ("kd", lambda value: 1000 if value == 255 else value),
+    SerialInputs.KFF: ("kff", int),
+    SerialInputs.KB: ("kb", int),
+    SerialInputs.BASE_PWM: ("base_pwm", int),
+    SerialInputs.MAX_PWM: ("max_pwm", int),
+    SerialInputs.STATE: ("state", lambda value: RobotStates(value).name),
+    SerialInputs.RUNNING_MODE: ("running_mode", lambda value: RunningModes(value).name),
+    SerialInputs.STOP_MODE: ("stop_mode", lambda value: StopModes(value).name),
+    SerialInputs.LAPS: ("laps", int),
+    SerialInputs.STOP_TIME: ("stop_time", int),
+    SerialInputs.LOG_DATA: ("log_data", lambda value: value == 1),
+}
+CONFIG_PREFIXES = {command.value: command for command in CONFIG_FIELDS}
 
 
 def clear_files() -> None:
-    with open(Files.BINARY_FILE, "wb"), open(Files.TEXT_FILE, "w"), open(
-        Files.TIMESTAMP_FILE, "w"
-    ):
+    with open(Files.TEXT_FILE, "w"):
         pass
 
 
-def read_string_from_bluetooth(bluetooth: serial.Serial) -> None:
-    with open(Files.TEXT_FILE, "a") as f:
-        while True:
-            if bluetooth.in_waiting <= 0:
-                continue
-
-            data = bluetooth.readline().decode("utf-8")
-            print(f"Received: {data}")
-
-            if data == SerialInputs.START_SIGNAL.value:
-                print("Start signal received. Recording binary data...")
-                return
-
-            f.write(f"{data}\n")
-            f.flush()
-
-
-def check_buffer(buffer: bytes) -> bool:
-    return not buffer == SerialInputs.STOP_SIGNAL.value[: len(buffer)]
+def update_config(config: dict, text: str) -> None:
+    """Save a configuration value received from the robot in the configuration of the next session."""
+    prefix, separator, value = text.partition(":")
+    command = CONFIG_PREFIXES.get(prefix + separator)
+    if command is None or len(value) != 1:
+        return
 
+    field, convert = CONFIG_FIELDS[command]
+    try:
+        config[field] = convert(ord(value))
+    except ValueError:
+        # Not a valid value of the enum
+        pass
 
-def read_binary_from_bluetooth(bluetooth: serial.Serial) -> None:
-    buffer = b""
 
+async def read_from_bluetooth(bluetooth: AsyncBluetoothApi) -> None:
     start_time = time.time()
+    sensors_file = None
+    config: dict = {field: None for field, _ in CONFIG_FIELDS.values()}
 
-    with open(Files.BINARY_FILE, "ab") as binary_file, open(
-        Files.TIMESTAMP_FILE, "a"
-    ) as timestamp_file:
+    with open(Files.TEXT_FILE, "a") as text_file:
         while True:
-            if bluetooth.in_waiting <= 0:
-                continue
-
-            data = bluetooth.read(2)
-            print(f"Received: {data}")
-
-            buffer += data
-
-            if buffer == SerialInputs.STOP_SIGNAL.value:
-                print("Stop signal received. Stopping binary data recording...")
-                return
-
-            if not check_buffer(buffer):
-                continue
-
-            elapsed_time_ms = int((time.time() - start_time) * 1000)
-            timestamp_file.write(f"{elapsed_time_ms}\n")
-            timestamp_file.flush()
+            for frame in await bluetooth.read_frames():
+                if frame.type == FrameTypes.TEXT:
+                    print(f"Received: {frame.text}")
+                    text_file.write(f"{frame.text}\n")
+                    update_config(config, frame.text)
+
+                elif frame.type == FrameTypes.START:
+                    print("Start signal received. Recording binary data...")
+                    start_time = time.time()
+                    if sensors_file is not None:
+                        sensors_file.close()
+
+                    session_dir = new_session_dir(start_time)
+                    sensors_file = open(session_file(session_dir), "wb")
+                    sensors_file.write(encode_session_header(start_time, config))
+                    print(f"Saving to {session_dir}")
+                    prune_sessions(keep=session_dir)
+
+                elif frame.type == FrameTypes.STOP:
+                    print("Stop signal received. Stopping binary data recording...")
+                    if sensors_file is not None:
+                        sensors_file.close()
+                        sensors_file = None
+
+                elif frame.type == FrameTypes.LOST:
+                    print(f"Lost {frame.text} telemetry frames")
+
+                elif frame.type == FrameTypes.CORRUPT:
+                    print("Discarded a corrupt telemetry frame")
+
+                elif frame.type == FrameTypes.WORD:
+                    elapsed_time_ms = int((time.time() - start_time) * 1000)
+                    if sensors_file is not None:
+                        sensors_file.write(
+                            SESSION_RECORD.pack(elapsed_time_ms, frame.data)
+                        )
+
+                    bits = "".join(
+                        map(str, decode_word(int.from_bytes(frame.data, "big")))
+                    )
+                    print(f"{elapsed_time_ms} ms: {frame.data.hex()} - {bits}")
+
+            text_file.flush()
+            if sensors_file is not None:
+                sensors_file.flush()
+
+
+async def listen() -> None:
+    print(f"Connecting to {SerialConfig.PORT} at {SerialConfig.BAUD_RATE} baud...")
 
-            binary_file.write(buffer)
-            binary_file.flush()
+    async with AsyncBluetoothApi() as bluetooth:
+        await bluetooth.connect(SerialConfig.PORT)
+        await asyncio.sleep(2)  # Wait for the connection to initialize
+        # Robots without the framed protocol ignore the request and keep sending the legacy stream
+        await bluetooth.write(Messages.SET_PROTOCOL(SerialConfig.PROTOCOL_VERSION))
 
-            bits = " ".join(f"{byte:08b}" for byte in buffer)
-            print(f"{elapsed_time_ms} ms: {buffer.hex()} - {bits}")
-            buffer = b""
+        print("Connected. Listening for data...")
+        await read_from_bluetooth(bluetooth)
 
 
 def main() -> None:
     clear_files()
 
-    print(f"Connecting to {SerialConfig.PORT} at {SerialConfig.BAUD_RATE} baud...")
-    bluetooth = serial.Serial(
-        SerialConfig.PORT, SerialConfig.BAUD_RATE, timeout=SerialConfig.TIMEOUT
-    )
-    time.sleep(2)  # Wait for the connection to initialize
-
-    print(f"Connected. Listening for data... Saving to {Files.BINARY_FILE}")
     try:
-        while True:
-            read_string_from_bluetooth(bluetooth)
-            read_binary_from_bluetooth(bluetooth)
-
+        asyncio.run(listen())
     except serial.SerialException as e:
         print(f"Error: {e}")
     except KeyboardInterrupt:
         print("\nExiting...")
     finally:
-        if "bluetooth" in locals() and bluetooth.is_open:
-            bluetooth.close()
-            print("Bluetooth connection closed.")
+        print("Bluetooth connection closed.")
 
 
 if __name__ == "__main__":
@@ -8,16 +8,15 @@ import pandas as pd
 # Add the project root to sys.path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
-from utils import Files
+from utils import CENTRAL_SENSORS, Files, TrackConfig
 
-TOTAL_CENTRAL_SENSORS = 9
+TOTAL_CENTRAL_SENSORS = len(CENTRAL_SENSORS)
 AVG_ERROR = (TOTAL_CENTRAL_SENSORS - 1) / 2
 
-# TODO: Calibrate values on actual track and adjust for different speeds
-DELTA_DISTANCE = 1
-SENSOR_ANGLE = np.pi / TOTAL_CENTRAL_SENSORS / 40
+DELTA_DISTANCE = TrackConfig.DELTA_DISTANCE
+SENSOR_ANGLE = TrackConfig.SENSOR_ANGLE
 
-MARKER_OFFSET = 40
+MARKER_OFFSET = TrackConfig.MARKER_OFFSET
 
 
 def get_dataframe() -> pd.DataFrame:
@@ -5,50 +5,150 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 
+import argparse
 import csv
+import glob
+import os
+
+from utils import (
+    BIT_POSITIONS,
+    SESSION_RECORD,
+    Files,
+    decode_words,
+    encode_session_header,
+    new_session_dir,
+    prune_sessions,
+    read_session,
+    session_file,
+)
+
+
+def latest_session() -> str | None:
+    """Get the directory of the most recent logging session."""
+    paths = glob.glob(os.path.join(Files.SESSIONS_DIR, "*", Files.SESSION_FILE))
+    # Session directories are named with their start time
+    return os.path.dirname(max(paths)) if paths else None
+
+
+def read_session_file(session_path: str, output_path: str) -> None:
+    try:
+        header, records = read_session(session_path, memmap=True)
+        # The words are decoded with the sensor layout they were recorded with
+        positions = header.bit_positions
+        if positions != BIT_POSITIONS:
+            print(
+                f"Session recorded with bit positions {positions}, decoding with them."
+            )
+        sensors = decode_words(records["word"].astype(">u2").tobytes(), positions)
+
+        with open(output_path, "w", newline="") as csv_file:
+            csv_writer = csv.writer(csv_file)
+            columns = ["index", "timestamp"] + [
+                f"IR{i}" for i in range(1, len(positions) + 1)
+            ]
+            csv_writer.writerow(columns)
+
+            csv_writer.writerows(
+                (index, timestamp, *bits)
+                for index, (timestamp, bits) in enumerate(
+                    zip(records["timestamp"].tolist(), sensors.tolist())
+                )
+            )
+
+        print(f"Bit values written to {output_path} successfully.")
+
+    except FileNotFoundError:
+        print(f"File not found: {session_path}.")
+    except Exception as e:
+        print(f"An error occurred: {e}")
 
-from utils import BIT_POSITIONS, Files
 
+def convert_legacy_files(
+    data_path: str, timestamps_path: str, session_dir: str | None = None
+) -> str | None:
+    """
+    Convert the legacy binary and timestamp files to a session, in a new session directory named with the
+    time the data was written unless a directory is given. Old sessions are pruned like the app's.
 
-def read_binary_file(data_path: str, timestamps_path: str, output_path: str) -> None:
+    Returns:
+        str | None: The session directory, or None if the files couldn't be converted.
+    """
     try:
-        with open(data_path, "rb") as binary_file, open(
-            timestamps_path, "r"
-        ) as timestamps_file, open(output_path, "w", newline="") as csv_file:
-            csv_writer = csv.writer(csv_file)
-            header = ["index", "timestamp"] + [f"IR{i}" for i in range(1, 13)]
-            csv_writer.writerow(header)
+        with open(data_path, "rb") as binary_file:
+            data = binary_file.read()
 
-            byte_pair_index = 0
+        with open(timestamps_path, "r") as timestamps_file:
+            timestamps = [line.strip() for line in timestamps_file]
 
-            while True:
-                data = binary_file.read(2)
-                if not data:
-                    break
+        if len(data) % 2:
+            raise ValueError("Incomplete byte pair read.")
 
-                if len(data) < 2:
-                    raise ValueError("Incomplete byte pair read.")
+        words = [data[i : i + 2] for i in range(0, len(data), 2)]
+        if len(timestamps) < len(words) or not all(timestamps[: len(words)]):
+            raise ValueError("No more timestamps available.")
 
-                timestamp = timestamps_file.readline().strip()
-                if not timestamp:
-                    raise ValueError("No more timestamps available.")
+        # The legacy files don't record when the session started or the robot configuration
+        start_time = os.path.getmtime(data_path)
 
-                word = (data[0] << 8) | data[1]
-                bits = ((word & (1 << i)) >> i for i in BIT_POSITIONS)
+        if session_dir is None:
+            session_dir = new_session_dir(start_time)
+            prune_sessions(keep=session_dir)
+        else:
+            os.makedirs(session_dir, exist_ok=True)
 
-                csv_writer.writerow((byte_pair_index, timestamp, *bits))
-                byte_pair_index += 1
+        with open(session_file(session_dir), "wb") as file:
+            file.write(encode_session_header(start_time, {}))
+            file.write(
+                b"".join(
+                    SESSION_RECORD.pack(int(timestamp), word)
+                    for timestamp, word in zip(timestamps, words)
+                )
+            )
 
-        print(f"Bit values written to {output} successfully.")
+        print(f"{len(words)} samples converted to {session_dir} successfully.")
+        return session_dir
 
     except FileNotFoundError:
         print(f"File not found: {data_path} or {timestamps_path}.")
     except Exception as e:
         print(f"An error occurred: {e}")
 
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Extract the sensor data of a logging session to a CSV file."
+    )
+    parser.add_argument(
+        "session",
+        nargs="?",
+        help="Session directory or file. Defaults to the most recent session.",
+    )
+    parser.add_argument(
+        "--output", default=Files.SENSOR_DATA, help="Path of the CSV file."
+    )
+    parser.add_argument(
+        "--legacy",
+        action="store_true",
+        help="Convert the legacy binary and timestamp files to a session first.",
+    )
+    args = parser.parse_args()
+
+    session = args.session
+    if args.legacy:
+        session = convert_legacy_files(Files.BINARY_FILE, Files.TIMESTAMP_FILE, session)
+        if session is None:
+            return
+    elif session is None:
+        session = latest_session()
+
+    if session is None:
+        print("No sessions found.")
+        return
+
+    read_session_file(session, args.output)
+
 
 if __name__ == "__main__":
-    data = Files.BINARY_FILE
-    timestamps = Files.TIMESTAMP_FILE
-    output = Files.SENSOR_DATA
-    read_binary_file(data, timestamps, output)
+    main()
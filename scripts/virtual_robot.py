@@ -0,0 +1,403 @@
+import sys
+from pathlib import Path
+
+# Add the project root to sys.path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import argparse
+import math
+import os
+import select
+import threading
+import time
+import tty
+
+from robot.api import protocol
+from utils import (
+    BIT_POSITIONS,
+    CENTRAL_SENSORS,
+    LEFT_MARKER,
+    RIGHT_MARKER,
+    Booleans,
+    RobotStates,
+    SerialConfig,
+    SerialInputs,
+    SerialOutputs,
+    StopModes,
+)
+
+# Echo sent back by the robot for each configuration command
+COMMAND_ECHOES = {
+    SerialOutputs.SET_KP: SerialInputs.KP,
+    SerialOutputs.SET_KI: SerialInputs.KI,
+    SerialOutputs.SET_KD: SerialInputs.KD,
+    SerialOutputs.SET_KFF: SerialInputs.KFF,
+    SerialOutputs.SET_KB: SerialInputs.KB,
+    SerialOutputs.SET_BASE_PWM: SerialInputs.BASE_PWM,
+    SerialOutputs.SET_MAX_PWM: SerialInputs.MAX_PWM,
+    SerialOutputs.SET_RUNNING_MODE: SerialInputs.RUNNING_MODE,
+    SerialOutputs.SET_STOP_MODE: SerialInputs.STOP_MODE,
+    SerialOutputs.SET_LAPS: SerialInputs.LAPS,
+    SerialOutputs.SET_STOP_TIME: SerialInputs.STOP_TIME,
+    SerialOutputs.SET_LOG_DATA: SerialInputs.LOG_DATA,
+}
+COMMANDS = {command.value: command for command in SerialOutputs}
+
+TOTAL_CENTRAL_SENSORS = len(CENTRAL_SENSORS)
+
+# Samples sent in each frame of the framed telemetry protocol
+FRAME_SAMPLES = 16
+# Maximum time in seconds a sample waits for its frame to fill up
+FRAME_INTERVAL = 0.01
+# Samples in one lap of the simulated track
+LAP_SAMPLES = 2000
+# Time in seconds between status messages while idle
+HEARTBEAT_INTERVAL = 1.0
+# Maximum bytes waiting to be read by the host before dropping samples
+MAX_BACKLOG = 64 * 1024
+
+
+def sensor_word(index: int) -> int:
+    """
+    Get the simulated sensor word for a sample, following the `BIT_POSITIONS` layout.
+
+    The line drifts across the central sensors along the lap, with a left marker on each curve and a right
+    marker at the start of each lap.
+
+    Args:
+        index (int): The index of the sample since logging started.
+
+    Returns:
+        int: The 16-bit sensor word.
+    """
+    phase = (index % LAP_SAMPLES) / LAP_SAMPLES
+    center = (TOTAL_CENTRAL_SENSORS - 1) / 2
+    line = center + center * math.sin(2 * math.pi * 3 * phase)
+
+    bits = [0] * len(BIT_POSITIONS)
+    for sensor in (math.floor(line), math.ceil(line)):
+        bits[CENTRAL_SENSORS[sensor]] = 1
+
+    if index % (LAP_SAMPLES // 3) < 10:
+        bits[LEFT_MARKER] = 1
+    if index % LAP_SAMPLES < 10:
+        bits[RIGHT_MARKER] = 1
+
+    return sum(bit << position for bit, position in zip(bits, BIT_POSITIONS))
+
+
+class VirtualRobot:
+    """
+    ### VirtualRobot Class
+
+    Emulates the line follower robot on a pseudo-terminal using the protocol in `utils/messages.py`, so the
+    app and scripts can be tested without hardware. Configuration commands are echoed back, the state and
+    battery are reported periodically while idle, and sensor words are streamed at the given rate while
+    running with `LOG_DATA` enabled.
+
+    Sensor words are sent as bare 2-byte words until the host requests the framed telemetry protocol, after
+    which they are sent in frames of up to `FRAME_SAMPLES` samples. A robot created with the legacy protocol
+    ignores the request, like firmware that predates the framed protocol.
+
+    #### Parameters:
+    - `rate (float)`: Number of sensor samples sent per second while running.
+    - `max_samples (int | None)`: Number of samples after which the robot stops by itself.
+    - `max_protocol (int)`: Latest telemetry protocol version supported by the robot.
+
+    #### Properties:
+    - `port (str)`: Path of the pseudo-terminal to connect to.
+    - `sent_samples (int)`: Number of samples sent in the current or last run.
+    - `dropped_samples (int)`: Number of samples dropped because the host was not reading fast enough.
+
+    #### Methods:
+    - `start() -> None`: Runs the robot in a background thread.
+    - `run() -> None`: Runs the robot in the current thread until stopped.
+    - `stop() -> None`: Stops the robot and closes the pseudo-terminal.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1000,
+        max_samples: int | None = None,
+        max_protocol: int = protocol.FRAMED_VERSION,
+    ) -> None:
+        self._rate = rate
+        self._max_samples = max_samples
+        self._max_protocol = max_protocol
+
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self._port = os.ttyname(self._slave)
+
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self._commands = bytearray()
+        self._output = bytearray()
+
+        self._config = {echo: 0 for echo in COMMAND_ECHOES.values()}
+        self._state = RobotStates.IDLE
+        self._battery = 200
+        self._last_heartbeat = 0.0
+
+        self._streaming = False
+        self._start_time = 0.0
+        self._sent_samples = 0
+        self._dropped_samples = 0
+
+        self._protocol = protocol.LEGACY_VERSION
+        self._sequence = 0
+        self._frame_words: list[int] = []
+        self._frame_time = 0.0
+
+    @property
+    def port(self) -> str:
+        """Path of the pseudo-terminal to connect to."""
+        return self._port
+
+    @property
+    def sent_samples(self) -> int:
+        """Number of samples sent in the current or last run."""
+        return self._sent_samples
+
+    @property
+    def dropped_samples(self) -> int:
+        """Number of samples dropped because the host was not reading fast enough."""
+        return self._dropped_samples
+
+    def start(self) -> None:
+        """Run the robot in a background thread."""
+        self._thread = threading.Thread(target=self.run, name="VirtualRobot")
+        self._thread.start()
+
+    def run(self) -> None:
+        """Run the robot in the current thread until stopped."""
+        self._running = True
+
+        while self._running:
+            readable, _, _ = select.select([self._master], [], [], self._next_wait())
+
+            if readable:
+                self._read_commands()
+
+            if self._streaming:
+                self._stream_samples()
+            elif time.monotonic() - self._last_heartbeat >= HEARTBEAT_INTERVAL:
+                self._send_status()
+
+            self._flush_output()
+
+    def stop(self) -> None:
+        """Stop the robot and close the pseudo-terminal."""
+        self._running = False
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        os.close(self._master)
+        os.close(self._slave)
+
+    def _next_wait(self) -> float:
+        """Get the time to wait for commands before the next samples are due."""
+        if self._streaming or self._output:
+            return min(0.001, 1 / self._rate)
+        return SerialConfig.READ_TIMEOUT
+
+    def _read_commands(self) -> None:
+        """Read and execute all complete 2-byte commands received from the host."""
+        try:
+            self._commands += os.read(self._master, 1024)
+        except (BlockingIOError, OSError):
+            return
+
+        while len(self._commands) >= 2:
+            command, value = self._commands[:1], self._commands[1]
+            del self._commands[:2]
+            self._execute(bytes(command), value)
+
+    def _execute(self, command: bytes, value: int) -> None:
+        """Execute a command received from the host."""
+        serial_output = COMMANDS.get(command)
+
+        if serial_output == SerialOutputs.START:
+            self._start_run()
+        elif serial_output == SerialOutputs.STOP:
+            self._stop_run()
+        elif serial_output == SerialOutputs.GET_STATE:
+            self._send_line(SerialInputs.STATE, self._state.value)
+        elif serial_output == SerialOutputs.SET_PROTOCOL:
+            self._set_protocol(value)
+        elif serial_output in COMMAND_ECHOES:
+            echo = COMMAND_ECHOES[serial_output]
+            self._config[echo] = value
+            self._send_line(echo, value)
+
+    def _set_protocol(self, version: int) -> None:
+        """Switch to the requested telemetry protocol if supported, acknowledging it."""
+        if self._max_protocol <= protocol.LEGACY_VERSION:
+            # Firmware without the framed protocol ignores the request
+            return
+
+        if protocol.LEGACY_VERSION <= version <= self._max_protocol:
+            self._protocol = version
+        self._send_line(SerialInputs.PROTOCOL, self._protocol)
+
+    def _start_run(self) -> None:
+        """Start running, streaming sensor data if logging is enabled."""
+        if self._state != RobotStates.IDLE:
+            return
+
+        self._set_state(RobotStates.RUNNING)
+        self._start_time = time.perf_counter()
+        self._sent_samples = 0
+        self._dropped_samples = 0
+        self._sequence = 0
+        self._frame_words.clear()
+
+        if self._config[SerialInputs.LOG_DATA] == Booleans.ON.value:
+            self._output += SerialInputs.START_SIGNAL.value.encode() + b"\r\n"
+            self._streaming = True
+
+    def _stop_run(self) -> None:
+        """Stop running, ending the sensor data stream."""
+        if self._state != RobotStates.RUNNING:
+            return
+
+        if self._streaming:
+            self._send_frame()
+            self._output += SerialInputs.STOP_SIGNAL.value
+            self._streaming = False
+
+        self._set_state(RobotStates.IDLE)
+
+    def _stream_samples(self) -> None:
+        """Send all sensor samples due since the start of the run."""
+        elapsed = time.perf_counter() - self._start_time
+        due = int(elapsed * self._rate)
+
+        if self._max_samples is not None:
+            due = min(due, self._max_samples)
+
+        if self._protocol >= protocol.FRAMED_VERSION:
+            self._stream_frames(due)
+        else:
+            self._stream_words(due)
+
+        if self._should_stop(elapsed, due):
+            self._stop_run()
+
+    def _stream_words(self, due: int) -> None:
+        """Send the due samples as bare 2-byte words."""
+        while self._sent_samples + self._dropped_samples < due:
+            index = self._sent_samples + self._dropped_samples
+            if len(self._output) >= MAX_BACKLOG:
+                self._dropped_samples += 1
+                continue
+
+            self._output += sensor_word(index).to_bytes(2, "big")
+            self._sent_samples += 1
+
+    def _stream_frames(self, due: int) -> None:
+        """Collect the due samples into frames, sending each frame when full or after `FRAME_INTERVAL`."""
+        while self._sent_samples + self._dropped_samples + len(self._frame_words) < due:
+            if not self._frame_words:
+                self._frame_time = time.perf_counter()
+
+            index = self._sent_samples + self._dropped_samples + len(self._frame_words)
+            self._frame_words.append(sensor_word(index))
+
+            if len(self._frame_words) >= FRAME_SAMPLES:
+                self._send_frame()
+
+        if (
+            self._frame_words
+            and time.perf_counter() - self._frame_time >= FRAME_INTERVAL
+        ):
+            self._send_frame()
+
+    def _send_frame(self) -> None:
+        """Send the collected samples in a frame, dropping it if the host is not reading fast enough."""
+        if not self._frame_words:
+            return
+
+        if len(self._output) >= MAX_BACKLOG:
+            self._dropped_samples += len(self._frame_words)
+        else:
+            self._output += protocol.encode_frame(self._sequence, self._frame_words)
+            self._sent_samples += len(self._frame_words)
+
+        self._sequence += 1
+        self._frame_words.clear()
+
+    def _should_stop(self, elapsed: float, samples: int) -> bool:
+        """Check if the run reached its configured end."""
+        stop_mode = self._config[SerialInputs.STOP_MODE]
+
+        if self._max_samples is not None and samples >= self._max_samples:
+            return True
+        if stop_mode == StopModes.TIME.value:
+            return elapsed >= self._config[SerialInputs.STOP_TIME]
+        if stop_mode == StopModes.LAPS.value:
+            return samples >= self._config[SerialInputs.LAPS] * LAP_SAMPLES
+
+        return False
+
+    def _send_status(self) -> None:
+        """Send the current state and battery level."""
+        self._last_heartbeat = time.monotonic()
+        self._send_line(SerialInputs.STATE, self._state.value)
+        self._send_line(SerialInputs.BATTERY, self._battery)
+
+    def _set_state(self, state: RobotStates) -> None:
+        """Change the state of the robot and report it."""
+        self._state = state
+        self._send_line(SerialInputs.STATE, state.value)
+
+    def _send_line(self, message: SerialInputs, value: int) -> None:
+        """Queue a text message with its single byte value."""
+        self._output += message.value.encode("latin-1") + bytes([value]) + b"\r\n"
+
+    def _flush_output(self) -> None:
+        """Write as much of the pending output as the host can take."""
+        if not self._output:
+            return
+
+        try:
+            written = os.write(self._master, self._output)
+        except (BlockingIOError, OSError):
+            return
+
+        del self._output[:written]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Emulate the line follower robot.")
+    parser.add_argument(
+        "--rate", type=float, default=1000, help="Sensor samples per second."
+    )
+    parser.add_argument(
+        "--samples", type=int, default=None, help="Stop each run after N samples."
+    )
+    parser.add_argument(
+        "--protocol",
+        type=int,
+        default=protocol.FRAMED_VERSION,
+        help="Latest telemetry protocol supported, 1 to emulate firmware without framing.",
+    )
+    args = parser.parse_args()
+
+    robot = VirtualRobot(args.rate, args.samples, args.protocol)
+    print(f"Virtual robot listening on {robot.port} at {args.rate:g} samples/s")
+    print(f"Run the app with {SerialConfig.PORTS_ENV}={robot.port} to connect to it")
+
+    try:
+        robot.run()
+    except KeyboardInterrupt:
+        print("\nExiting...")
+    finally:
+        robot.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 from .constants import *
+from .decoder import *
+from .history import *
 from .messages import *
 from .robot_configs import *
+from .session import *
 from .styles import *
+from .tracing import *
+from .track import *
@@ -1,3 +1,4 @@
+import math
 from enum import Enum
 
 
@@ -8,6 +9,16 @@ class Files:
     TIMESTAMP_FILE = "data/timestamps.txt"
     TEXT_FILE = "data/serial_data_log.txt"
     SENSOR_DATA = "data/sensors.csv"
+    # Directory holding a directory for each logging session
+    SESSIONS_DIR = "data/sessions"
+    # Directory of each logging session, named with the time it started in strftime format
+    SESSION_DIR = "data/sessions/%Y%m%d_%H%M%S"
+    # Sensor data and text messages received during a logging session, inside its directory
+    SESSION_FILE = "sensors.lfs"
+    SESSION_TEXT_FILE = "messages.txt"
+    BENCHMARK_FILE = "data/telemetry_benchmark.json"
+    BAUD_RATES_FILE = "data/baud_rates.json"
+    LATENCY_FILE = "data/latency_trace.json"
 
 
 class SerialConfig:
@@ -15,14 +26,129 @@ class SerialConfig:
 
     PORT = "COM3"
     BAUD_RATE = 74880
-    TIMEOUT = 1
+    # Probe the candidate baud rates after connecting, using the fastest one the robot answers on. Disabled by
+    # default, as it delays the first data by up to PROBE_TIMEOUT per candidate rate
+    PROBE_BAUD_RATES = False
+    BAUD_RATES = (921600, 460800, 230400, 115200, 74880, 57600, 38400, 19200, 9600)
+    # Time in seconds to wait for the robot to answer at each candidate baud rate
+    PROBE_TIMEOUT = 0.3
+    # Maximum time in seconds a waiting read blocks before returning, also the read timeout of the port
+    READ_TIMEOUT = 0.05
+    # Size in bytes of the buffer between the serial reader and the data processing
+    RX_BUFFER_SIZE = 1 << 20
+    # Maximum number of command messages sent in a single write
+    TX_BATCH_SIZE = 16
+    # Time in seconds between command writes
+    TX_INTERVAL = 0.02
+    # Delay in milliseconds before refreshing ports after a device change
+    PORT_REFRESH_DELAY = 200
+    # Interval in milliseconds between port scans without device notifications
+    PORT_SCAN_INTERVAL = 2000
+    # Environment variable with extra ports to list, separated by os.pathsep
+    PORTS_ENV = "LINE_FOLLOWER_PORTS"
+    # Reopen lost connections automatically
+    RECONNECT = True
+    # Delays in seconds between reconnection attempts, doubling from the minimum to the maximum
+    RECONNECT_MIN_DELAY = 0.1
+    RECONNECT_MAX_DELAY = 2.0
+    # Time in seconds after which a lost connection is given up
+    RECONNECT_TIMEOUT = 30
+    # Telemetry protocol requested on connection, robots that don't acknowledge it use the legacy stream
+    PROTOCOL_VERSION = 2
+    # Time in seconds to wait for the robot to acknowledge the requested protocol
+    PROTOCOL_TIMEOUT = 1.0
+
+
+class LogConfig:
+    """Log file writing configuration."""
+
+    # Maximum time in milliseconds between flushes of the log files, 0 to disable
+    FLUSH_INTERVAL = 200
+    # Maximum number of records written between flushes of the log files, 0 to disable
+    FLUSH_RECORDS = 10000
+    # Sync the log files to disk when a logging session stops
+    FSYNC_ON_CLOSE = True
+    # Size in bytes at which log files continue in a new part, 0 to disable
+    MAX_FILE_SIZE = 64 << 20
+    # Number of parts of the text log kept, 0 to keep all
+    MAX_TEXT_FILES = 10
+    # Number of logging sessions kept, 0 to keep all
+    MAX_SESSIONS = 200
+    # Age in days after which logging sessions are deleted, 0 to keep all
+    MAX_SESSION_AGE = 30
+    # Total size in bytes of the logging sessions kept, 0 for no limit
+    MAX_SESSIONS_SIZE = 4 << 30
+
+
+class TraceConfig:
+    """Latency tracing configuration."""
+
+    # Record the latency of each stage of the telemetry pipeline from the start, instead of only in debug mode
+    ENABLED = False
+    # Stages of the telemetry pipeline, measured from the moment the data is received
+    STAGES = ("decode", "write", "slot", "display")
+    # Duration in seconds of each latency histogram window
+    WINDOW = 10
+    # Number of bits of each latency kept by the histograms, for a relative error below 1/64
+    SIGNIFICANT_BITS = 7
+    # Largest latency in nanoseconds tracked by the histograms
+    MAX_LATENCY = 60_000_000_000
+    # Interval in milliseconds between updates of the latency display
+    DISPLAY_INTERVAL = 500
+
+
+class HistoryConfig:
+    """In-memory history of the robot configuration."""
+
+    # Number of updates of each configuration field kept in memory
+    CAPACITY = 4096
 
 
 class UIConstants:
     """UI constants for the program."""
 
-    MAX_DISPLAY_LINES = 70
+    # Number of lines kept in the scrollback of the text display
+    MAX_DISPLAY_LINES = 1_000_000
+    # Maximum number of lines of the text display scanned by a search before returning to the event loop
+    FIND_ROWS = 10_000
     ROW_HEIGHT = 40
+    # Maximum number of output batches sent to the UI per second by the listener worker
+    OUTPUT_RATE = 30
+
+
+class WaterfallConfig:
+    """Live sensor waterfall configuration."""
+
+    # Number of samples shown by the waterfall, one row of pixels each
+    ROWS = 256
+    # Width in pixels of the column of each sensor
+    COLUMN_WIDTH = 8
+    # Colors as 0xAARRGGBB of the marker, central and other sensors when they detect the line
+    MARKER_COLOR = 0xFFFF9800
+    CENTRAL_COLOR = 0xFF4CAF50
+    OTHER_COLOR = 0xFF9E9E9E
+    # Color as 0xAARRGGBB of the sensors that don't detect the line
+    OFF_COLOR = 0xFF202020
+    # Color as 0xAARRGGBB of the line drawn after the newest sample
+    CURSOR_COLOR = 0xFFFFFFFF
+
+
+class TrackConfig:
+    """Live track reconstruction configuration, with the same model as `scripts/line_drawing.py`."""
+
+    # TODO: Calibrate values on actual track and adjust for different speeds
+    # Distance travelled by the robot between two sensor samples
+    DELTA_DISTANCE = 1
+    # Change of heading in radians per sample for each sensor of line error, over the 9 central sensors
+    SENSOR_ANGLE = math.pi / 9 / 40
+    # Distance of the marker sensors from the center of the robot
+    MARKER_OFFSET = 40
+    # Number of samples between the points of the track sent to the GUI
+    POINT_INTERVAL = 4
+    # Minimum width and height in pixels of the track display
+    VIEW_SIZE = 200
+    # Radius in pixels of the markers drawn on the track display
+    MARKER_RADIUS = 3
 
 
 class Booleans(Enum):
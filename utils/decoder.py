@@ -0,0 +1,102 @@
+from . import robot_configs
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to decode buffers in batches
+    np = None
+
+__all__ = ["SENSOR_COUNT", "WORD_SIZE", "decode_word", "decode_words", "sensor_table"]
+
+SENSOR_COUNT = len(robot_configs.BIT_POSITIONS)
+WORD_SIZE = 2
+
+_positions: tuple[int, ...] | None = None
+_table: tuple[bytes, ...] = ()
+_array = None
+
+
+def sensor_table() -> tuple[bytes, ...]:
+    """
+    Get the lookup table from every 16-bit sensor word to its sensor values, in `BIT_POSITIONS` order. The
+    table is rebuilt if `BIT_POSITIONS` changed since it was last built.
+
+    Returns:
+        tuple[bytes, ...]: The 65536 entries of the table, each with one byte per sensor set to 0 or 1.
+    """
+    global _positions, _table, _array
+
+    positions = robot_configs.BIT_POSITIONS
+    if positions == _positions:
+        return _table
+
+    if np is not None:
+        words = np.arange(1 << 16, dtype=np.uint16)[:, None]
+        _array = ((words >> np.array(positions, dtype=np.uint16)) & 1).astype(np.uint8)
+        data = _array.tobytes()
+        size = len(positions)
+        _table = tuple(
+            data[start : start + size] for start in range(0, len(data), size)
+        )
+    else:
+        _table = tuple(
+            bytes((word >> position) & 1 for position in positions)
+            for word in range(1 << 16)
+        )
+        _array = None
+
+    _positions = positions
+    return _table
+
+
+def decode_word(word: int) -> bytes:
+    """
+    Decode a sensor word into its sensor values.
+
+    Args:
+        word (int): The 16-bit sensor word.
+
+    Returns:
+        bytes: One byte per sensor, in `BIT_POSITIONS` order, set to 0 or 1.
+    """
+    return sensor_table()[word]
+
+
+def decode_words(
+    data: bytes | bytearray | memoryview,
+    positions: tuple[int, ...] | None = None,
+) -> "np.ndarray":
+    """
+    Decode a buffer of big-endian sensor words into a matrix of sensor values in a single call.
+
+    Args:
+        data (bytes | bytearray | memoryview): The sensor words as received from the robot.
+        positions (tuple[int, ...] | None, optional): Bit of the sensor word holding each sensor, such as the
+            layout recorded in a session header. Defaults to `BIT_POSITIONS`.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        ValueError: If the buffer doesn't hold a whole number of words.
+
+    Returns:
+        np.ndarray: A (N, S) uint8 matrix with one row per word and one column per sensor, in `positions`
+            order.
+    """
+    if np is None:
+        raise ImportError("NumPy is required to decode sensor words in batches.")
+
+    if len(data) % WORD_SIZE:
+        raise ValueError("Incomplete byte pair read.")
+
+    words = np.frombuffer(data, dtype=">u2")
+    if positions is None or tuple(positions) == robot_configs.BIT_POSITIONS:
+        return _sensor_array()[words]
+
+    # Other layouts are decoded with shifts instead of building a table for them
+    shifts = np.array(positions, dtype=np.uint16)
+    return ((words.astype(np.uint16)[:, None] >> shifts) & 1).astype(np.uint8)
+
+
+def _sensor_array() -> "np.ndarray":
+    """Get the lookup table as a (65536, 12) uint8 matrix."""
+    sensor_table()
+    return _array
@@ -0,0 +1,159 @@
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable
+from typing import Any
+
+from .constants import HistoryConfig
+
+__all__ = ["ValueHistory"]
+
+
+class ValueHistory:
+    """
+    ### ValueHistory Class
+
+    Fixed-size history of the values of a field, each with the `time.monotonic_ns` timestamp of its update. The
+    timestamps and values are kept in two preallocated arrays used as a ring, so appending is O(1) and the
+    memory doesn't grow: once full, each update replaces the oldest one. Timestamps must be appended in
+    increasing order, which lets queries find a time with a binary search.
+
+    Values are stored as integers and converted back with `convert` when they are read.
+
+    #### Parameters:
+    - `capacity (int)`: Number of updates kept.
+    - `convert (Callable[[int], Any])`: Conversion from the stored integer to the value returned by queries.
+
+    #### Properties:
+    - `capacity (int)`: Number of updates kept.
+    - `count (int)`: Number of updates currently kept.
+
+    #### Methods:
+    - `append(value: int, timestamp: int | None = None) -> None`: Records an update of the field.
+    - `value_at(timestamp: int) -> Any | None`: Gets the value of the field at a time.
+    - `updates(start: int, end: int) -> list[tuple[int, Any]]`: Gets the updates between two times.
+    - `changes(start: int, end: int) -> list[tuple[int, Any]]`: Gets the updates that changed the value between two times.
+    - `clear() -> None`: Discards all updates.
+    """
+
+    def __init__(
+        self,
+        capacity: int = HistoryConfig.CAPACITY,
+        convert: Callable[[int], Any] = int,
+    ) -> None:
+        self._capacity = max(capacity, 1)
+        self._convert = convert
+        self._timestamps = array("q", bytes(8 * self._capacity))
+        self._values = array("q", bytes(8 * self._capacity))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Number of updates kept."""
+        return self._capacity
+
+    @property
+    def count(self) -> int:
+        """Number of updates currently kept."""
+        return self._count
+
+    def append(self, value: int, timestamp: int | None = None) -> None:
+        """
+        Record an update of the field, replacing the oldest one if the history is full.
+
+        Args:
+            value (int): The value of the update.
+            timestamp (int | None): The time of the update from `time.monotonic_ns`, now if None.
+        """
+        if timestamp is None:
+            timestamp = time.monotonic_ns()
+
+        index = (self._start + self._count) % self._capacity
+        self._timestamps[index] = timestamp
+        self._values[index] = int(value)
+
+        if self._count < self._capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self._capacity
+
+    def value_at(self, timestamp: int) -> Any | None:
+        """
+        Get the value of the field at a time, set by the last update at or before it.
+
+        Args:
+            timestamp (int): The time from `time.monotonic_ns`.
+
+        Returns:
+            Any | None: The value, or None if the time is before the oldest update kept.
+        """
+        position = bisect_right(range(self._count), timestamp, key=self._timestamp)
+        if not position:
+            return None
+
+        return self._convert(self._values[self._index(position - 1)])
+
+    def updates(self, start: int, end: int) -> list[tuple[int, Any]]:
+        """
+        Get the updates between two times, both included.
+
+        Args:
+            start (int): The start time from `time.monotonic_ns`.
+            end (int): The end time from `time.monotonic_ns`.
+
+        Returns:
+            list[tuple[int, Any]]: The timestamp and value of each update, oldest first.
+        """
+        first, last = self._window(start, end)
+        return [
+            (self._timestamps[index], self._convert(self._values[index]))
+            for index in map(self._index, range(first, last))
+        ]
+
+    def changes(self, start: int, end: int) -> list[tuple[int, Any]]:
+        """
+        Get the updates between two times, both included, that changed the value of the field. The first
+        update kept always counts as a change.
+
+        Args:
+            start (int): The start time from `time.monotonic_ns`.
+            end (int): The end time from `time.monotonic_ns`.
+
+        Returns:
+            list[tuple[int, Any]]: The timestamp and new value of each change, oldest first.
+        """
+        first, last = self._window(start, end)
+        previous = self._values[self._index(first - 1)] if first else None
+
+        changes = []
+        for index in map(self._index, range(first, last)):
+            value = self._values[index]
+            if value != previous:
+                changes.append((self._timestamps[index], self._convert(value)))
+                previous = value
+
+        return changes
+
+    def clear(self) -> None:
+        """Discard all updates."""
+        self._start = 0
+        self._count = 0
+
+    def _index(self, position: int) -> int:
+        """Get the index in the arrays of an update by its position from the oldest one."""
+        return (self._start + position) % self._capacity
+
+    def _timestamp(self, position: int) -> int:
+        """Get the timestamp of an update by its position from the oldest one."""
+        return self._timestamps[(self._start + position) % self._capacity]
+
+    def _window(self, start: int, end: int) -> tuple[int, int]:
+        """Get the range of positions of the updates between two times, both included."""
+        positions = range(self._count)
+        first = bisect_left(positions, start, key=self._timestamp)
+        last = bisect_right(positions, end, key=self._timestamp)
+        return first, max(first, last)
@@ -22,6 +22,7 @@ class SerialInputs(Enum):
     LAPS = "LAPS:"
     STOP_TIME = "S_TIME:"
     LOG_DATA = "L_DATA:"
+    PROTOCOL = "PROTO:"
 
 
 class SerialOutputs(Enum):
@@ -41,6 +42,8 @@ class SerialOutputs(Enum):
     SET_LAPS = b"L"
     SET_STOP_TIME = b"T"
     SET_LOG_DATA = b"G"
+    SET_PROTOCOL = b"V"
+    GET_STATE = b"?"
 
 
 class Messages:
@@ -68,6 +71,7 @@ class Messages:
 
     START_SIGNAL = COMMAND(SerialOutputs.START)
     STOP_SIGNAL = COMMAND(SerialOutputs.STOP)
+    STATE_REQUEST = COMMAND(SerialOutputs.GET_STATE)
 
     @staticmethod
     def SET_KP(kp: bytes) -> bytes:
@@ -116,3 +120,7 @@ class Messages:
     @staticmethod
     def SET_LOG_DATA(log_data: bool) -> bytes:
         return Messages.COMMAND(SerialOutputs.SET_LOG_DATA, log_data.to_bytes())
+
+    @staticmethod
+    def SET_PROTOCOL(version: int) -> bytes:
+        return Messages.COMMAND(SerialOutputs.SET_PROTOCOL, bytes([version]))
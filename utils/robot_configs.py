@@ -3,6 +3,13 @@ from enum import Enum
 # Bit arrangement for sensor data when receiving binary data from the robot
 BIT_POSITIONS = (0, 8, 9, 10, 11, 1, 2, 12, 13, 14, 15, 3)
 
+# Sensors on the left and right sides of the robot that detect the track markers, in BIT_POSITIONS order
+LEFT_MARKER = 0
+RIGHT_MARKER = 11
+
+# Sensors used to follow the line, from left to right, in BIT_POSITIONS order
+CENTRAL_SENSORS = (1, 2, 3, 4, 5, 7, 8, 9, 10)
+
 
 class RobotStates(Enum):
     """List of robot states used in the program."""
@@ -0,0 +1,395 @@
+import json
+import os
+import re
+import shutil
+import struct
+import time
+from typing import BinaryIO, NamedTuple
+
+from . import robot_configs
+from .constants import Files, LogConfig
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to read the records as arrays
+    np = None
+
+__all__ = [
+    "SESSION_MAGIC",
+    "SESSION_VERSION",
+    "SESSION_RECORD",
+    "SESSION_RECORD_FORMAT",
+    "SessionHeader",
+    "encode_session_header",
+    "encode_session_record",
+    "read_session_header",
+    "read_session",
+    "log_part",
+    "log_parts",
+    "log_part_indices",
+    "session_file",
+    "new_session_dir",
+    "prune_sessions",
+]
+
+SESSION_MAGIC = b"LFSESSN\0"
+SESSION_VERSION = 1
+# Record with the time in milliseconds since the session started and the sensor word as received
+SESSION_RECORD = struct.Struct("<I2s")
+# Record layout as NumPy dtype fields, saved in the header
+SESSION_RECORD_FORMAT = [["timestamp", "<u4"], ["word", ">u2"]]
+
+_HEADER_SIZE = struct.Struct("<I")
+# Records start on a multiple of this size from the start of the file
+_HEADER_ALIGNMENT = 16
+
+
+class SessionHeader(NamedTuple):
+    """
+    ### SessionHeader Class
+
+    Metadata saved at the start of a session file.
+
+    #### Attributes:
+    - `version (int)`: Version of the session format.
+    - `bit_positions (tuple[int, ...])`: Bit of the sensor word holding each sensor, as `BIT_POSITIONS`.
+    - `start_time (float)`: Time the session started, in seconds since the epoch.
+    - `start_ns (int | None)`: Time the session started, from `time.monotonic_ns` in the process that recorded
+    it, or None if not recorded. The record timestamps count from it, so they can be compared with other
+    times from the same clock, such as the configuration history of the `LineFollower`.
+    - `config (dict)`: Configuration of the robot when the session started.
+    - `record_format (list[list[str]])`: Names and NumPy types of the fields of each record.
+    - `size (int)`: Size of the header in bytes, where the records start.
+    """
+
+    version: int
+    bit_positions: tuple[int, ...]
+    start_time: float
+    start_ns: int | None
+    config: dict
+    record_format: list[list[str]]
+    size: int
+
+
+def encode_session_header(
+    start_time: float,
+    config: dict,
+    bit_positions: tuple[int, ...] | None = None,
+    start_ns: int | None = None,
+) -> bytes:
+    """
+    Encode the header of a session file.
+
+    The header is made of `SESSION_MAGIC`, the size of the metadata as a little-endian 32-bit integer and the
+    metadata as JSON, padded with spaces so the fixed-size records that follow are aligned.
+
+    Args:
+        start_time (float): Time the session started, in seconds since the epoch.
+        config (dict): Configuration of the robot when the session started.
+        bit_positions (tuple[int, ...] | None, optional): Bit of the sensor word holding each sensor. Defaults
+            to `BIT_POSITIONS`.
+        start_ns (int | None, optional): Time the session started, from `time.monotonic_ns`. Defaults to not
+            recording it.
+
+    Returns:
+        bytes: The encoded header.
+    """
+    metadata = json.dumps(
+        {
+            "version": SESSION_VERSION,
+            "bit_positions": list(bit_positions or robot_configs.BIT_POSITIONS),
+            "start_time": start_time,
+            "start_ns": start_ns,
+            "config": config,
+            "record_format": SESSION_RECORD_FORMAT,
+        }
+    ).encode()
+
+    size = len(SESSION_MAGIC) + _HEADER_SIZE.size + len(metadata)
+    metadata += b" " * (-size % _HEADER_ALIGNMENT)
+
+    return SESSION_MAGIC + _HEADER_SIZE.pack(len(metadata)) + metadata
+
+
+def encode_session_record(timestamp: int, word: bytes) -> bytes:
+    """
+    Encode a sensor sample as a session record.
+
+    Args:
+        timestamp (int): Time in milliseconds since the session started.
+        word (bytes): The 2-byte sensor word as received from the robot.
+
+    Returns:
+        bytes: The encoded record.
+    """
+    return SESSION_RECORD.pack(timestamp, word)
+
+
+def read_session_header(file: BinaryIO) -> SessionHeader:
+    """
+    Read the header of a session file.
+
+    Args:
+        file (BinaryIO): The session file, positioned at its start.
+
+    Raises:
+        ValueError: If the file is not a session file or its version is not supported.
+
+    Returns:
+        SessionHeader: The metadata of the session.
+    """
+    magic = file.read(len(SESSION_MAGIC))
+    if magic != SESSION_MAGIC:
+        raise ValueError("Not a session file.")
+
+    (metadata_size,) = _HEADER_SIZE.unpack(file.read(_HEADER_SIZE.size))
+    metadata = json.loads(file.read(metadata_size))
+
+    if metadata["version"] > SESSION_VERSION:
+        raise ValueError(f"Unsupported session version {metadata['version']}.")
+
+    return SessionHeader(
+        version=metadata["version"],
+        bit_positions=tuple(metadata["bit_positions"]),
+        start_time=metadata["start_time"],
+        start_ns=metadata.get("start_ns"),
+        config=metadata["config"],
+        record_format=metadata["record_format"],
+        size=len(SESSION_MAGIC) + _HEADER_SIZE.size + metadata_size,
+    )
+
+
+def read_session(path: str, memmap: bool = False) -> tuple[SessionHeader, "np.ndarray"]:
+    """
+    Read a session, with its records as a NumPy structured array.
+
+    Args:
+        path (str): The path of the session file, or of the session directory to read all its parts.
+        memmap (bool, optional): Map the records from the file instead of reading them into memory. Sessions
+            with several parts are always read into memory. Defaults to False.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+        FileNotFoundError: If the session directory has no session file.
+        ValueError: If the file is not a session file or its version is not supported.
+
+    Returns:
+        tuple[SessionHeader, np.ndarray]: The metadata of the session and its records, with `timestamp` and
+            `word` fields.
+    """
+    if np is None:
+        raise ImportError("NumPy is required to read session records.")
+
+    if not os.path.isdir(path):
+        return _read_session_part(path, memmap)
+
+    parts = log_parts(session_file(path))
+    if not parts:
+        raise FileNotFoundError(f"No session file in {path}.")
+
+    if len(parts) == 1:
+        return _read_session_part(parts[0], memmap)
+
+    header, records = _read_session_part(parts[0])
+    records = np.concatenate(
+        [records] + [_read_session_part(part)[1] for part in parts[1:]]
+    )
+    return header, records
+
+
+def session_file(directory: str) -> str:
+    """
+    Get the path of the first part of the session file in a session directory.
+
+    Args:
+        directory (str): The session directory.
+
+    Returns:
+        str: The path of the session file.
+    """
+    return os.path.join(directory, Files.SESSION_FILE)
+
+
+def new_session_dir(start_time: float) -> str:
+    """
+    Create an unused directory for a logging session, named with its start time by `Files.SESSION_DIR`. Sessions
+    started in the same second get a numbered suffix, so they never share a directory.
+
+    Args:
+        start_time (float): Time the session started, in seconds since the epoch.
+
+    Returns:
+        str: The path of the new directory.
+    """
+    path = time.strftime(Files.SESSION_DIR, time.localtime(start_time))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    candidate = path
+    index = 1
+    while True:
+        try:
+            os.mkdir(candidate)
+            return candidate
+        except FileExistsError:
+            candidate = f"{path}_{index}"
+            index += 1
+
+
+def log_part(path: str, index: int) -> str:
+    """
+    Get the path of a part of a log file that continues in new parts when it grows too large.
+
+    Args:
+        path (str): The path of the log file, used as is for its first part.
+        index (int): The index of the part.
+
+    Returns:
+        str: The path of the part, with `_<index>` before the extension after the first part.
+    """
+    if not index:
+        return path
+
+    base, extension = os.path.splitext(path)
+    return f"{base}_{index}{extension}"
+
+
+def log_parts(path: str) -> list[str]:
+    """
+    Get the existing parts of a log file, in the order they were written.
+
+    Args:
+        path (str): The path of the log file.
+
+    Returns:
+        list[str]: The paths of the parts, oldest first.
+    """
+    return [log_part(path, index) for index in log_part_indices(path)]
+
+
+def log_part_indices(path: str) -> list[int]:
+    """
+    Get the indices of the existing parts of a log file.
+
+    Args:
+        path (str): The path of the log file.
+
+    Returns:
+        list[int]: The indices of the parts, in increasing order.
+    """
+    directory, name = os.path.split(path)
+    base, extension = os.path.splitext(name)
+    pattern = re.compile(rf"{re.escape(base)}(?:_([1-9]\d*))?{re.escape(extension)}")
+
+    try:
+        names = os.listdir(directory or ".")
+    except OSError:
+        return []
+
+    matches = (pattern.fullmatch(entry) for entry in names)
+    return sorted(int(match.group(1) or 0) for match in matches if match)
+
+
+def prune_sessions(
+    directory: str = Files.SESSIONS_DIR,
+    max_sessions: int = LogConfig.MAX_SESSIONS,
+    max_age: float = LogConfig.MAX_SESSION_AGE,
+    max_size: int = LogConfig.MAX_SESSIONS_SIZE,
+    keep: str = "",
+) -> None:
+    """
+    Delete the oldest session directories until the sessions left are within the retention limits. Each limit
+    can be disabled by setting it to 0.
+
+    Args:
+        directory (str, optional): The directory holding the session directories. Defaults to
+            `Files.SESSIONS_DIR`.
+        max_sessions (int, optional): Maximum number of sessions kept. Defaults to `LogConfig.MAX_SESSIONS`.
+        max_age (float, optional): Maximum age in days of the sessions kept. Defaults to
+            `LogConfig.MAX_SESSION_AGE`.
+        max_size (int, optional): Maximum total size in bytes of the sessions kept. Defaults to
+            `LogConfig.MAX_SESSIONS_SIZE`.
+        keep (str, optional): A session directory that is never deleted, such as the current session.
+    """
+    try:
+        sessions = [
+            entry
+            for entry in os.scandir(directory)
+            if entry.is_dir() and entry.path != keep
+        ]
+    except OSError:
+        return
+
+    # Session directories are named with their start time, so they sort from oldest to newest
+    sessions.sort(key=lambda entry: entry.name)
+
+    # Sessions deleted by something else meanwhile are skipped
+    stats = []
+    for session in sessions:
+        try:
+            stats.append(
+                (session.path, session.stat().st_mtime, _directory_size(session.path))
+            )
+        except OSError:
+            continue
+
+    total_size = sum(size for _, _, size in stats) + (
+        _directory_size(keep) if keep else 0
+    )
+    count = len(stats) + bool(keep)
+    oldest = time.time() - max_age * 86400
+
+    for path, modified, size in stats:
+        if not (
+            (max_sessions and count > max_sessions)
+            or (max_size and total_size > max_size)
+            or (max_age and modified < oldest)
+        ):
+            break
+
+        try:
+            shutil.rmtree(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Failed to delete session {path}: {e}")
+            continue
+
+        count -= 1
+        total_size -= size
+
+
+def _read_session_part(
+    path: str, memmap: bool = False
+) -> tuple[SessionHeader, "np.ndarray"]:
+    """Read a single session file."""
+    with open(path, "rb") as file:
+        header = read_session_header(file)
+        file.seek(0, os.SEEK_END)
+        size = file.tell() - header.size
+
+    dtype = np.dtype([tuple(field) for field in header.record_format])
+    # A record being written when the session was interrupted is left out
+    count = size // dtype.itemsize
+
+    # Empty files can't be mapped
+    if memmap and count:
+        records = np.memmap(
+            path, dtype=dtype, mode="r", offset=header.size, shape=(count,)
+        )
+    else:
+        records = np.fromfile(path, dtype=dtype, count=count, offset=header.size)
+
+    return header, records
+
+
+def _directory_size(path: str) -> int:
+    """Get the total size in bytes of the files in a directory."""
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+
+    return size
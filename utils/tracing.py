@@ -0,0 +1,282 @@
+import json
+import os
+import time
+
+from .constants import TraceConfig
+
+__all__ = ["LatencyHistogram", "LatencyTracer"]
+
+
+class LatencyHistogram:
+    """
+    ### LatencyHistogram Class
+
+    HDR-style histogram of latencies in nanoseconds. Values are counted in log-linear buckets: each power of two
+    is split into the same number of sub-buckets, so the relative error of a reported value is bounded by
+    `2 ** -(significant_bits - 1)` over the whole range while recording stays a couple of integer operations.
+    Values above `max_value` are counted in the last bucket.
+
+    #### Parameters:
+    - `significant_bits (int)`: Number of bits of each value that are kept.
+    - `max_value (int)`: Largest value tracked exactly, in nanoseconds.
+
+    #### Properties:
+    - `count (int)`: Number of values recorded.
+    - `max (int)`: Largest value recorded.
+
+    #### Methods:
+    - `record(value: int) -> None`: Counts a value.
+    - `merge(other: LatencyHistogram) -> None`: Adds the counts of another histogram with the same layout.
+    - `percentile(percent: float) -> int`: Gets the value below which the given percent of values fall.
+    - `buckets() -> dict[int, int]`: Gets the count of each non-empty bucket by its highest value.
+    - `reset() -> None`: Discards all recorded values.
+    """
+
+    def __init__(
+        self,
+        significant_bits: int = TraceConfig.SIGNIFICANT_BITS,
+        max_value: int = TraceConfig.MAX_LATENCY,
+    ) -> None:
+        self._significant_bits = significant_bits
+        self._half = 1 << (significant_bits - 1)
+        self._last = self._index(max_value)
+        self._counts = [0] * (self._last + 1)
+        self._count = 0
+        self._max = 0
+
+    @property
+    def count(self) -> int:
+        """Number of values recorded."""
+        return self._count
+
+    @property
+    def max(self) -> int:
+        """Largest value recorded."""
+        return self._max
+
+    def record(self, value: int) -> None:
+        """
+        Count a value.
+
+        Args:
+            value (int): The latency in nanoseconds.
+        """
+        value = max(value, 0)
+        self._counts[min(self._index(value), self._last)] += 1
+        self._count += 1
+        if value > self._max:
+            self._max = value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add the counts of another histogram with the same layout.
+
+        Args:
+            other (LatencyHistogram): The histogram to add.
+        """
+        for index, count in enumerate(other._counts):
+            self._counts[index] += count
+        self._count += other._count
+        self._max = max(self._max, other._max)
+
+    def percentile(self, percent: float) -> int:
+        """
+        Get the value below which the given percent of the recorded values fall.
+
+        Args:
+            percent (float): The percentile, from 0 to 100.
+
+        Returns:
+            int: The highest value of the bucket holding the percentile, or 0 if nothing was recorded.
+        """
+        if not self._count:
+            return 0
+
+        target = max(1, round(self._count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                return min(self._highest_value(index), self._max)
+
+        return self._max
+
+    def buckets(self) -> dict[int, int]:
+        """
+        Get the count of each non-empty bucket.
+
+        Returns:
+            dict[int, int]: The counts by the highest value of their bucket, in nanoseconds.
+        """
+        return {
+            self._highest_value(index): count
+            for index, count in enumerate(self._counts)
+            if count
+        }
+
+    def reset(self) -> None:
+        """Discard all recorded values."""
+        self._counts = [0] * (self._last + 1)
+        self._count = 0
+        self._max = 0
+
+    def _index(self, value: int) -> int:
+        """Get the bucket of a value."""
+        exponent = max(value.bit_length() - self._significant_bits, 0)
+        return exponent * self._half + (value >> exponent)
+
+    def _highest_value(self, index: int) -> int:
+        """Get the highest value counted in a bucket."""
+        exponent = max(index // self._half - 1, 0)
+        return ((index - exponent * self._half + 1) << exponent) - 1
+
+
+class LatencyTracer:
+    """
+    ### LatencyTracer Class
+
+    Keeps rolling latency histograms for the stages of the telemetry pipeline. Each stage records the time
+    from a start stamp taken with `time.perf_counter_ns` to the moment the stage is reached. The statistics
+    cover the current window and the previous one, so they follow changes in the load within about
+    `TraceConfig.WINDOW` seconds without emptying at each rotation.
+
+    Tracing is disabled by default, in which case `record` returns right away. Each stage must only be recorded
+    from a single thread.
+
+    #### Parameters:
+    - `stages (tuple[str, ...])`: Names of the stages, in pipeline order.
+    - `window (float)`: Duration in seconds of each histogram window.
+
+    #### Properties:
+    - `enabled (bool)`: Indicates if latencies are recorded.
+    - `stages (tuple[str, ...])`: Names of the stages, in pipeline order.
+
+    #### Methods:
+    - `record(stage: str, start: int) -> None`: Records the latency of a stage from a start stamp.
+    - `stats() -> dict[str, dict[str, float]]`: Gets the count, p50, p99 and max latency of each stage.
+    - `dump(path: str) -> None`: Saves the statistics and histograms of each stage to a JSON file.
+    - `reset() -> None`: Discards all recorded latencies.
+    """
+
+    def __init__(
+        self,
+        stages: tuple[str, ...] = TraceConfig.STAGES,
+        window: float = TraceConfig.WINDOW,
+    ) -> None:
+        self._stages = stages
+        self._window = int(window * 1e9)
+        self._enabled = TraceConfig.ENABLED
+        self._histograms = {stage: LatencyHistogram() for stage in stages}
+        self._previous = {stage: LatencyHistogram() for stage in stages}
+        self._window_start = {stage: time.perf_counter_ns() for stage in stages}
+
+    @property
+    def enabled(self) -> bool:
+        """Check if latencies are recorded."""
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        """Enable or disable recording latencies."""
+        self._enabled = enabled
+
+    @property
+    def stages(self) -> tuple[str, ...]:
+        """Get the names of the stages, in pipeline order."""
+        return self._stages
+
+    def record(self, stage: str, start: int) -> None:
+        """
+        Record the latency of a stage from a start stamp.
+
+        Args:
+            stage (str): The name of the stage.
+            start (int): The start stamp, from `time.perf_counter_ns`.
+        """
+        if not self._enabled or not start:
+            return
+
+        now = time.perf_counter_ns()
+        if now - self._window_start[stage] >= self._window:
+            self._rotate(stage, now)
+
+        self._histograms[stage].record(now - start)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Get the statistics of each stage over the current and previous windows.
+
+        Returns:
+            dict[str, dict[str, float]]: The number of samples and the p50, p99 and max latencies in
+                milliseconds of each stage.
+        """
+        return {
+            stage: {
+                "count": histogram.count,
+                "p50": histogram.percentile(50) / 1e6,
+                "p99": histogram.percentile(99) / 1e6,
+                "max": histogram.max / 1e6,
+            }
+            for stage, histogram in self._combined().items()
+        }
+
+    def dump(self, path: str) -> None:
+        """
+        Save the statistics and histograms of each stage to a JSON file.
+
+        Args:
+            path (str): The path of the file.
+        """
+        histograms = self._combined()
+        stats = self.stats()
+
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "w") as file:
+                json.dump(
+                    {
+                        stage: {
+                            **stats[stage],
+                            "buckets_ns": histograms[stage].buckets(),
+                        }
+                        for stage in self._stages
+                    },
+                    file,
+                    indent=2,
+                )
+            print(f"Latency trace saved to {path}")
+        except OSError as e:
+            print(f"Failed to save latency trace to {path}: {e}")
+
+    def reset(self) -> None:
+        """Discard all recorded latencies."""
+        now = time.perf_counter_ns()
+        for stage in self._stages:
+            self._histograms[stage].reset()
+            self._previous[stage].reset()
+            self._window_start[stage] = now
+
+    def _rotate(self, stage: str, now: int) -> None:
+        """Start a new window for a stage, keeping the current one as the previous window."""
+        previous = self._previous[stage]
+        previous.reset()
+        self._previous[stage] = self._histograms[stage]
+        self._histograms[stage] = previous
+        self._window_start[stage] = now
+
+    def _combined(self) -> dict[str, LatencyHistogram]:
+        """Get the histogram of each stage over the current and previous windows."""
+        now = time.perf_counter_ns()
+        combined = {}
+
+        for stage in self._stages:
+            histogram = LatencyHistogram()
+            # Windows of stages that stopped recording are left out once they are over
+            age = now - self._window_start[stage]
+            if age < self._window:
+                histogram.merge(self._previous[stage])
+            if age < 2 * self._window:
+                histogram.merge(self._histograms[stage])
+            combined[stage] = histogram
+
+        return combined
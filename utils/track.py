@@ -0,0 +1,146 @@
+import math
+
+from . import robot_configs
+from .constants import TrackConfig
+from .decoder import sensor_table
+
+__all__ = ["TrackReconstructor"]
+
+Point = tuple[float, float]
+WordEntry = tuple[float | None, bool, bool]
+
+_layout: tuple | None = None
+_table: tuple[WordEntry, ...] = ()
+
+
+class TrackReconstructor:
+    """
+    ### TrackReconstructor Class
+
+    Reconstructs the track followed by the robot from its sensor words as they are received, with the
+    dead-reckoning model of `scripts/line_drawing.py`: the line error over the central sensors turns the heading
+    by `TrackConfig.SENSOR_ANGLE` per sensor, and the robot moves `TrackConfig.DELTA_DISTANCE` along its heading
+    at each sample. Markers seen by the side sensors are placed `TrackConfig.MARKER_OFFSET` away from the robot.
+
+    The error and markers of every sensor word are looked up in a table built once, so each sample costs a few
+    arithmetic operations. Only one point every `TrackConfig.POINT_INTERVAL` samples is kept for drawing, with
+    the markers seen since the previous point, until they are taken with `take`.
+
+    #### Properties:
+    - `position (tuple[float, float])`: Current position of the robot.
+    - `heading (float)`: Current heading of the robot, in radians.
+
+    #### Methods:
+    - `add_word(word: int) -> None`: Moves the robot by one sensor sample.
+    - `take() -> tuple[list[Point], list[Point], list[Point]]`: Takes the points and markers kept since the last call.
+    - `reset() -> None`: Starts a new track at the origin.
+    """
+
+    def __init__(self, point_interval: int = TrackConfig.POINT_INTERVAL) -> None:
+        self._point_interval = max(point_interval, 1)
+        self._angle = TrackConfig.SENSOR_ANGLE
+        self._distance = TrackConfig.DELTA_DISTANCE
+        self._table = _word_table()
+        self.reset()
+
+    @property
+    def position(self) -> Point:
+        """Get the current position of the robot."""
+        return self._x, self._y
+
+    @property
+    def heading(self) -> float:
+        """Get the current heading of the robot, in radians."""
+        return self._heading
+
+    def add_word(self, word: int) -> None:
+        """
+        Move the robot by one sensor sample.
+
+        Args:
+            word (int): The 16-bit sensor word.
+        """
+        error, left, right = self._table[word]
+        if error is None:
+            error = self._last_error
+        self._last_error = error
+
+        heading = self._heading + error * self._angle
+        self._heading = heading
+        cos = math.cos(heading)
+        sin = math.sin(heading)
+        self._x += self._distance * cos
+        self._y += self._distance * sin
+
+        if left:
+            self._left = True
+        if right:
+            self._right = True
+
+        self._samples += 1
+        if self._samples < self._point_interval:
+            return
+
+        self._samples = 0
+        self._points.append((self._x, self._y))
+
+        offset = TrackConfig.MARKER_OFFSET
+        if self._left:
+            self._left_markers.append((self._x - offset * sin, self._y + offset * cos))
+        if self._right:
+            self._right_markers.append((self._x + offset * sin, self._y - offset * cos))
+        self._left = self._right = False
+
+    def take(self) -> tuple[list[Point], list[Point], list[Point]]:
+        """
+        Take the points of the track and the markers kept since the last call.
+
+        Returns:
+            tuple[list[Point], list[Point], list[Point]]: The points of the track and the positions of the left and
+                right markers, oldest first.
+        """
+        taken = self._points, self._left_markers, self._right_markers
+        self._points = []
+        self._left_markers = []
+        self._right_markers = []
+        return taken
+
+    def reset(self) -> None:
+        """Start a new track at the origin, discarding the points not taken."""
+        self._x = 0.0
+        self._y = 0.0
+        self._heading = 0.0
+        self._last_error = 0.0
+        self._samples = 0
+        self._left = False
+        self._right = False
+
+        self._points: list[Point] = [(0.0, 0.0)]
+        self._left_markers: list[Point] = []
+        self._right_markers: list[Point] = []
+
+
+def _word_table() -> tuple[WordEntry, ...]:
+    """
+    Get the line error, or None without line, and the left and right markers of every sensor word. The table is
+    rebuilt if the sensor layout changed since it was last built.
+    """
+    global _layout, _table
+
+    central = robot_configs.CENTRAL_SENSORS
+    left = robot_configs.LEFT_MARKER
+    right = robot_configs.RIGHT_MARKER
+    layout = (robot_configs.BIT_POSITIONS, central, left, right)
+    if layout == _layout:
+        return _table
+
+    center = (len(central) - 1) / 2
+    table = []
+    for sensors in sensor_table():
+        active = [index for index, sensor in enumerate(central) if sensors[sensor]]
+        error = -(sum(active) / len(active) - center) if active else None
+        table.append((error, bool(sensors[left]), bool(sensors[right])))
+
+    _layout = layout
+    _table = tuple(table)
+    return _table